@@ -1,7 +1,53 @@
+import sys
+
+
 class Ansi:
     """
     A class to handle ANSI escape codes for terminal text formatting.
+
+    Between begin_frame() and end_frame() all output is collected and written
+    to the terminal in a single write, and color changes that would not
+    change the current color are left out. Frames can be nested, the
+    outermost end_frame() writes.
+
+    Attributes:
+    - _frame: Output collected in the open frame, None if no frame is open.
+    - _depth: Number of open frames.
+    - _foreground: Foreground code in effect in the frame (0 after a reset), None if unknown.
+    - _background: Background code in effect in the frame (0 after a reset), None if unknown.
     """
+    _frame = None
+    _depth = 0
+    _foreground = None
+    _background = None
+
+    def begin_frame() -> None:
+        """Start collecting the output, see end_frame()."""
+        if Ansi._depth == 0:
+            Ansi._frame = []
+            # the terminal's colors are unknown until the frame sets them
+            Ansi._foreground = Ansi._background = None
+        Ansi._depth += 1
+
+    def end_frame() -> None:
+        """Write the output collected since the matching begin_frame()."""
+        Ansi._depth -= 1
+        if Ansi._depth == 0:
+            frame, Ansi._frame = Ansi._frame, None
+            sys.stdout.write(''.join(frame))
+            sys.stdout.flush()
+
+    def write(text: str) -> None:
+        """
+        Write text at the cursor position, into the frame if one is open.
+
+        Parameters:
+        - text: The text, may contain escape codes.
+        """
+        if Ansi._frame is None:
+            print(text, end='', flush=True)
+        else:
+            Ansi._frame.append(text)
 
     def set_foreground(color: int, intensity: bool) -> None:
         """
@@ -11,10 +57,12 @@ class Ansi:
         - color: The color code (0-7 for standard colors).
         - intensity: Boolean indicating if the color should be bright (True) or normal (False).
         """
-        if intensity:
-            print(f"\033[{color + 90}m", end='')
-        else:
-            print(f"\033[{color + 30}m", end='')
+        code = color + 90 if intensity else color + 30
+        if Ansi._frame is not None:
+            if code == Ansi._foreground:
+                return
+            Ansi._foreground = code
+        Ansi.write(f"\033[{code}m")
 
     def set_background(color: int, intensity: bool) -> None:
         """
@@ -24,22 +72,28 @@ class Ansi:
         - color: The color code (0-7 for standard colors).
         - intensity: Boolean indicating if the color should be bright (True) or normal (False).
         """
-        if intensity:
-            print(f"\033[{color + 100}m", end='')
-        else:
-            print(f"\033[{color + 40}m", end='')
+        code = color + 100 if intensity else color + 40
+        if Ansi._frame is not None:
+            if code == Ansi._background:
+                return
+            Ansi._background = code
+        Ansi.write(f"\033[{code}m")
 
     def reset() -> None:
         """Reset all text formatting to default settings."""
-        print(f"\033[0m", end='')
+        if Ansi._frame is not None:
+            if Ansi._foreground == 0 and Ansi._background == 0:
+                return
+            Ansi._foreground = Ansi._background = 0
+        Ansi.write(f"\033[0m")
 
     def clear_line() -> None:
         """Clear the current line in the terminal."""
-        print(f"\033[2K", end='')
+        Ansi.write(f"\033[2K")
 
     def clear_screen() -> None:
         """Clear the entire screen in the terminal."""
-        print(f"\033[2J", end='')
+        Ansi.write(f"\033[2J")
 
     def gotoXY(x: int, y: int) -> None:
         """
@@ -49,5 +103,5 @@ class Ansi:
         - x: The horizontal position (column).
         - y: The vertical position (row).
         """
-        print(f"\033[{y};{x}H", end='')
+        Ansi.write(f"\033[{y};{x}H")
 
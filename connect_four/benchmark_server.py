@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+"""
+Load benchmark for the game servers
+
+Compares game_logic_server.py (Flask) and game_logic_server_asgi.py (asyncio)
+on the same API. Every server URL given on the command line runs through two
+phases:
+- polling: many clients request /api/state and /api/board as fast as they can
+- waiters: many clients hold a long poll on a new game, then one drop has to
+  wake all of them up
+
+The client side is a minimal HTTP/1.1 client on asyncio streams (one
+connection per request), so the benchmark itself does not need threads and
+can open thousands of connections.
+
+Usage:
+    1. python3 game_logic_server.py                          (Flask, port 5000)
+    2. python3 game_logic_server_asgi.py --port 5001         (asyncio)
+    3. python3 benchmark_server.py http://127.0.0.1:5000 http://127.0.0.1:5001
+"""
+
+CLIENTS = 50          # concurrent clients in the polling phase
+REQUESTS = 20         # requests per client in the polling phase
+WAITERS = 500         # idle long polls in the waiters phase
+WAIT_TIMEOUT = 30.0   # long poll timeout of the waiters
+
+
+async def http_request(host: str, port: int, method: str, path: str, payload: dict = None) -> tuple:
+    """
+    Send a single request on a new connection.
+
+    Returns:
+        tuple: (status code, decoded JSON body or None)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        body = b'' if payload is None else json.dumps(payload).encode()
+        head = f"{method} {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n"
+        if payload is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        writer.write(head.encode() + b"\r\n" + body)
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    header, _, content = response.partition(b"\r\n\r\n")
+    status = int(header.split(b" ", 2)[1])
+    if b"transfer-encoding: chunked" in header.lower():
+        content = dechunk(content)
+    return status, json.loads(content) if content else None
+
+
+def dechunk(content: bytes) -> bytes:
+    """
+    Decode a chunked transfer encoded body.
+    """
+    body = b''
+    while content:
+        size, _, content = content.partition(b"\r\n")
+        size = int(size, 16)
+        if size == 0:
+            break
+        body += content[:size]
+        content = content[size + 2:]
+    return body
+
+
+def percentile(values: list, share: float) -> float:
+    """
+    Returns the value below which the given share of values lie.
+    """
+    values = sorted(values)
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+async def polling_phase(host: str, port: int, clients: int, requests: int) -> dict:
+    """
+    Many clients alternately requesting state and board.
+    """
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for index in range(requests):
+            path = "/api/state" if index % 2 == 0 else "/api/board"
+            start = time.perf_counter()
+            try:
+                status, _ = await http_request(host, port, "GET", path)
+                if status != 200:
+                    errors += 1
+            except OSError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    duration = time.perf_counter() - start
+    return {
+        "requests/s": len(latencies) / duration,
+        "p50 ms": statistics.median(latencies) * 1000 if latencies else float('nan'),
+        "p99 ms": percentile(latencies, 0.99) * 1000 if latencies else float('nan'),
+        "polling errors": errors,
+    }
+
+
+async def waiters_phase(host: str, port: int, waiters: int) -> dict:
+    """
+    Many long polls on one game, woken up by a single drop.
+    """
+    _, created = await http_request(host, port, "POST", "/api/games")
+    game = f"/api/games/{created['game_id']}"
+    _, state = await http_request(host, port, "GET", f"{game}/state")
+    version = state["version"]
+
+    woken = []
+    errors = 0
+
+    async def waiter():
+        nonlocal errors
+        try:
+            status, _ = await http_request(host, port, "GET", f"{game}/state?after={version}&timeout={WAIT_TIMEOUT}")
+            if status != 200:
+                errors += 1
+                return
+        except OSError:
+            errors += 1
+            return
+        woken.append(time.perf_counter())
+
+    tasks = [asyncio.ensure_future(waiter()) for _ in range(waiters)]
+    await asyncio.sleep(1.0) # let the waiters connect
+
+    # a request while the waiters are parked
+    start = time.perf_counter()
+    await http_request(host, port, "GET", f"{game}/board")
+    busy_latency = time.perf_counter() - start
+
+    player = "X" if state["game_state"] == 0 else "0"
+    start = time.perf_counter()
+    await http_request(host, port, "POST", f"{game}/drop", {"player_id": player, "column": 3})
+    await asyncio.gather(*tasks)
+    return {
+        "board ms (busy)": busy_latency * 1000,
+        "wake-up all ms": (max(woken) - start) * 1000 if woken else float('nan'),
+        "woken": len(woken),
+        "waiter errors": errors,
+    }
+
+
+async def benchmark(url: str, clients: int, requests: int, waiters: int) -> dict:
+    """
+    Run both phases against one server.
+    """
+    address = urlsplit(url)
+    host, port = address.hostname, address.port or 80
+    results = await polling_phase(host, port, clients, requests)
+    results.update(await waiters_phase(host, port, waiters))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare the throughput of game servers")
+    parser.add_argument('urls', nargs='+', help="base URLs of the servers, e.g. http://127.0.0.1:5000")
+    parser.add_argument('--clients', type=int, default=CLIENTS, help="concurrent polling clients")
+    parser.add_argument('--requests', type=int, default=REQUESTS, help="requests per polling client")
+    parser.add_argument('--waiters', type=int, default=WAITERS, help="idle long polls")
+    args = parser.parse_args()
+
+    for url in args.urls:
+        results = asyncio.run(benchmark(url, args.clients, args.requests, args.waiters))
+        print(url)
+        for name, value in results.items():
+            print(f"    {name:<18} {value:10.1f}" if isinstance(value, float) else f"    {name:<18} {value:10d}")
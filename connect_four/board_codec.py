@@ -0,0 +1,96 @@
+from game_token import GameToken
+from game_state import GameState
+from game_logic_bitboard import ROWS, COLS, HEIGHT, board_to_bitboards
+import struct
+
+"""
+Compact binary encoding of boards for the game server API
+
+Instead of a 6x7 JSON array of one-character strings, a board is sent as the
+two bitboards of the players (see game_logic_bitboard for the bit layout)
+plus the number of tokens, little-endian:
+
+    board:    red (uint64) | yellow (uint64) | moves (uint8)                       17 bytes
+    snapshot: board | game_state (uint8) | version (uint32)                         22 bytes
+
+Clients ask for it with `Accept: application/vnd.connect-four+binary`; servers
+answer with JSON to everyone else, so the encoding is strictly optional.
+
+Functions:
+    encode_board / decode_board: Board <-> bytes
+    encode_snapshot / decode_snapshot: (board, state, version) <-> bytes
+"""
+
+BINARY_MEDIA_TYPE = 'application/vnd.connect-four+binary'
+BOARD_FORMAT = struct.Struct('<QQB')
+SNAPSHOT_FORMAT = struct.Struct('<QQBBI')
+
+
+def encode_board(board: list) -> bytes:
+    """
+    Encode a 6x7 board.
+
+    Args:
+        board (List[List[GameToken]]): Board as returned by GameLogicBase.get_board()
+
+    Returns:
+        bytes: BOARD_FORMAT.size bytes
+    """
+    red, yellow, _ = board_to_bitboards(board)
+    return BOARD_FORMAT.pack(red, yellow, (red | yellow).bit_count())
+
+
+def _bitboards_to_board(red: int, yellow: int) -> list:
+    board = [[GameToken.EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+    for col in range(COLS):
+        for row in range(ROWS):
+            bit = 1 << (col * HEIGHT + row)
+            if red & bit:
+                board[ROWS - 1 - row][col] = GameToken.RED
+            elif yellow & bit:
+                board[ROWS - 1 - row][col] = GameToken.YELLOW
+    return board
+
+
+def decode_board(data: bytes) -> list:
+    """
+    Decode a board encoded by encode_board().
+
+    Returns:
+        List[List[GameToken]]: The 6x7 board
+    """
+    red, yellow, _ = BOARD_FORMAT.unpack(data)
+    return _bitboards_to_board(red, yellow)
+
+
+def encode_snapshot(board: list, state: GameState, version: int) -> bytes:
+    """
+    Encode board, state and version of a game.
+
+    Returns:
+        bytes: SNAPSHOT_FORMAT.size bytes
+    """
+    red, yellow, _ = board_to_bitboards(board)
+    return SNAPSHOT_FORMAT.pack(red, yellow, (red | yellow).bit_count(), state.value, version)
+
+
+def decode_snapshot(data: bytes) -> tuple:
+    """
+    Decode a snapshot encoded by encode_snapshot().
+
+    Returns:
+        tuple: (board, state, version)
+    """
+    red, yellow, _, state, version = SNAPSHOT_FORMAT.unpack(data)
+    return _bitboards_to_board(red, yellow), GameState(state), version
+
+
+if __name__ == '__main__':
+    import json
+    board = [[GameToken.EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+    board[5][3] = GameToken.RED
+    board[5][4] = GameToken.YELLOW
+    board[4][3] = GameToken.RED
+    data = encode_snapshot(board, GameState.TURN_YELLOW, 3)
+    print(f"JSON: {len(json.dumps({'board': board}))} bytes, binary: {len(data)} bytes")
+    print(decode_snapshot(data) == (board, GameState.TURN_YELLOW, 3))
@@ -0,0 +1,109 @@
+from game_token import GameToken
+from functools import lru_cache
+import numpy as np
+
+"""
+Vectorized board evaluation for the Connect Four bot
+
+A board is scored by looking at every window of four cells that could hold a
+line of four (69 windows on a 6x7 board). A window containing tokens of only
+one player scores WINDOW_WEIGHTS[number of tokens] for that player; windows
+with tokens of both players can never become a line and score nothing.
+
+Boards are flat int8 arrays in row-major order (index = row * cols + col):
+    +1: token of the evaluating player
+    -1: token of the opponent
+     0: empty cell
+
+Functions:
+    window_table: Cell indices of all windows for a board size
+    board_cells: Convert a list-of-lists board into a cell array
+    evaluate: Score one board
+    evaluate_batch: Score many boards in one pass
+"""
+
+# score of a window by number of tokens of a single player (0..4)
+WINDOW_WEIGHTS = np.array([0, 1, 4, 32, 512], dtype=np.int64)
+
+
+@lru_cache(maxsize=None)
+def window_table(rows: int = 6, cols: int = 7) -> np.ndarray:
+    """
+    Returns the cell indices of all windows of four cells.
+
+    Args:
+        rows (int): Number of rows of the board
+        cols (int): Number of columns of the board
+
+    Returns:
+        np.ndarray: Array of shape (windows, 4)
+    """
+    windows = []
+    for row in range(rows):
+        for col in range(cols):
+            # horizontal, vertical, diagonal (down-right), diagonal (up-right)
+            for d_row, d_col in [(0, 1), (1, 0), (1, 1), (-1, 1)]:
+                end_row = row + 3 * d_row
+                end_col = col + 3 * d_col
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    windows.append([(row + i * d_row) * cols + col + i * d_col for i in range(4)])
+    table = np.array(windows, dtype=np.intp)
+    table.flags.writeable = False
+    return table
+
+
+def board_cells(board: list, player_token: GameToken) -> np.ndarray:
+    """
+    Convert a list-of-lists board into a flat cell array.
+
+    Args:
+        board (List[List[GameToken]]): The game board as a 2D list
+        player_token (GameToken): The evaluating player, stored as +1
+
+    Returns:
+        np.ndarray: int8 array of rows * cols cells
+    """
+    return np.array([0 if token == GameToken.EMPTY else (1 if token == player_token else -1)
+                     for row in board for token in row], dtype=np.int8)
+
+
+def evaluate_batch(cells: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """
+    Score many boards at once.
+
+    Args:
+        cells (np.ndarray): Boards of shape (boards, rows * cols)
+        windows (np.ndarray): Window table of the board size, see window_table()
+
+    Returns:
+        np.ndarray: int64 scores of shape (boards,), from the view of the +1 player
+    """
+    values = cells[:, windows]          # (boards, windows, 4)
+    own = (values == 1).sum(axis=2)
+    opponent = (values == -1).sum(axis=2)
+    score = np.where(opponent == 0, WINDOW_WEIGHTS[own], 0) - np.where(own == 0, WINDOW_WEIGHTS[opponent], 0)
+    return score.sum(axis=1)
+
+
+def evaluate(cells: np.ndarray, windows: np.ndarray) -> int:
+    """
+    Score a single board.
+
+    Args:
+        cells (np.ndarray): Board of shape (rows * cols,)
+        windows (np.ndarray): Window table of the board size, see window_table()
+
+    Returns:
+        int: The score from the view of the +1 player
+    """
+    return int(evaluate_batch(cells[np.newaxis, :], windows)[0])
+
+
+if __name__ == '__main__':
+    board = [[GameToken.EMPTY for _ in range(7)] for _ in range(6)]
+    board[5][3] = GameToken.RED
+    board[5][4] = GameToken.RED
+    board[5][2] = GameToken.YELLOW
+    windows = window_table(6, 7)
+    cells = board_cells(board, GameToken.RED)
+    print(f"Windows: {len(windows)}, Score RED: {evaluate(cells, windows)}, Score YELLOW: {evaluate(-cells, windows)}")
@@ -30,6 +30,28 @@ class DisplayBase:
         """
         raise NotImplementedError("Subclasses must implement this method.")
 
+    def begin_frame(self) -> None:
+        """
+        Start a frame: the following drawing calls may be collected and
+        shown together by end_frame().
+
+        Displays without buffering don't need to override this method.
+        """
+
+    def end_frame(self) -> None:
+        """
+        End the frame started by begin_frame() and show its drawing calls.
+
+        Displays without buffering don't need to override this method.
+        """
+
+    def screen(self):
+        """
+        Identifies the physical screen the display draws on; displays on the
+        same screen are drawn by one player at a time (see game_coordinator).
+        """
+        return self
+
     def get_x_grid(self):
         """
         Returns the Last grid x size
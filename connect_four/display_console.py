@@ -7,6 +7,10 @@ class DisplayConsole(DisplayBase):
     """
     Console-based display implementation.
 
+    In frame-buffer mode (the default) every drawing call, or every group of
+    calls between begin_frame() and end_frame(), reaches the terminal as a
+    single write (see Ansi.begin_frame).
+
     Attributes:
         __STARTPOSITION_X (int): Starting X coordinate for the grid
         __STARTPOSITION_Y (int): Starting Y coordinate for the grid
@@ -17,13 +21,37 @@ class DisplayConsole(DisplayBase):
     __STARTPOSITION_Y = 1 
     __SPACING_X = 2
     __SPACING_Y = 1
-    def __init__(self):
+    def __init__(self, buffered: bool = True):
         """
         Initializes a new console display instance.
+
+        Args:
+            buffered (bool): Collect the output of a frame and write it at once
         """
         super().__init__()
         self.__grid_x = 0
         self.__grid_y = 0
+        self.__buffered = buffered
+
+    def begin_frame(self) -> None:
+        """
+        Collects the output of the following drawing calls until end_frame().
+        """
+        if self.__buffered:
+            Ansi.begin_frame()
+
+    def end_frame(self) -> None:
+        """
+        Writes the output collected since begin_frame() to the terminal.
+        """
+        if self.__buffered:
+            Ansi.end_frame()
+
+    def screen(self):
+        """
+        All console displays draw on the same terminal.
+        """
+        return 'console'
 
     def __draw_selector(self, x:int) -> None:
         """
@@ -33,7 +61,7 @@ class DisplayConsole(DisplayBase):
             x (int): The horizontal position (column) for the selector (0-based)
         """
         Ansi.gotoXY(x*(self.__SPACING_X+1)+2, 1)
-        print("█"*self.__SPACING_X)
+        Ansi.write("█"*self.__SPACING_X)
 
     def __clear_selector(self, x:int) -> None:
         """
@@ -43,7 +71,7 @@ class DisplayConsole(DisplayBase):
             x (int): The horizontal position (column) to clear (0-based)
         """
         Ansi.gotoXY(x*(self.__SPACING_X+1)+2, 1)
-        print("─"*self.__SPACING_X)
+        Ansi.write("─"*self.__SPACING_X)
 
     def get_x_grid(self):
         """
@@ -69,18 +97,20 @@ class DisplayConsole(DisplayBase):
         self.__grid_y = y
         if(x<=3 and y <= 3):
             raise ValueError("Grid too small")
+        self.begin_frame()
         Ansi.clear_screen()
         Ansi.reset()
         Ansi.gotoXY(self.__STARTPOSITION_X,self.__STARTPOSITION_Y)
-        print("┌"+("─"*self.__SPACING_X+"┬") * (self.__grid_x-1)+"─"*self.__SPACING_X+"┐")
+        Ansi.write("┌"+("─"*self.__SPACING_X+"┬") * (self.__grid_x-1)+"─"*self.__SPACING_X+"┐\n")
         for temp_index in range(self.__SPACING_Y):
-            print("│"+(" "*self.__SPACING_X+"│") * (self.__grid_x-1)+" "*self.__SPACING_X+"│")
+            Ansi.write("│"+(" "*self.__SPACING_X+"│") * (self.__grid_x-1)+" "*self.__SPACING_X+"│\n")
         for temp_index in range(self.__grid_y-1):
-            print("├"+("─"*self.__SPACING_X+"┼") * (self.__grid_x-1)+"─"*self.__SPACING_X+"┤")
+            Ansi.write("├"+("─"*self.__SPACING_X+"┼") * (self.__grid_x-1)+"─"*self.__SPACING_X+"┤\n")
             for temp_index in range(self.__SPACING_Y):
-                print("│"+(" "*self.__SPACING_X+"│") * (self.__grid_x-1)+" "*self.__SPACING_X+"│")
-        print("└"+("─"*self.__SPACING_X+"┴") * (self.__grid_x-1)+"─"*self.__SPACING_X+"┘")
+                Ansi.write("│"+(" "*self.__SPACING_X+"│") * (self.__grid_x-1)+" "*self.__SPACING_X+"│\n")
+        Ansi.write("└"+("─"*self.__SPACING_X+"┴") * (self.__grid_x-1)+"─"*self.__SPACING_X+"┘\n")
         Ansi.reset()
+        self.end_frame()
 
     def draw_token(self, x: int, y: int, token) -> None:
         """
@@ -96,6 +126,11 @@ class DisplayConsole(DisplayBase):
             ValueError: If the token type is not recognized
             ValueError: If the position is outside the grid boundaries
         """
+        if(y != -1 and (x>=self.__grid_x or y >= self.__grid_y or x <= -1 or y <= -2)):
+            raise ValueError("Outbound of Grid")
+        if token not in (GameToken.RED, GameToken.YELLOW, GameToken.EMPTY):
+            raise ValueError("Unknown token")
+        self.begin_frame()
         Ansi.reset()
         if(y == -1):
             if(token == GameToken.RED):
@@ -106,25 +141,19 @@ class DisplayConsole(DisplayBase):
                 self.__draw_selector(x)
             elif(token == GameToken.EMPTY):
                 self.__clear_selector(x)
-            else:
-                raise ValueError("Unknown token")
         else:
-            if(x>=self.__grid_x or y >= self.__grid_y or x <= -1 or y <= -2):
-                raise ValueError("Outbound of Grid")
             for tempIndex in range(self.__SPACING_Y):
                 Ansi.gotoXY(((x)*(self.__SPACING_X+1)+2),((y)*(self.__SPACING_Y+1)+2+tempIndex))
                 if(token == GameToken.RED):
                     Ansi.set_foreground(1,False)
-                    print("█"*self.__SPACING_X)
+                    Ansi.write("█"*self.__SPACING_X)
                 elif(token == GameToken.YELLOW):
                     Ansi.set_foreground(3,False)
-                    print("█"*self.__SPACING_X)
+                    Ansi.write("█"*self.__SPACING_X)
                 elif(token == GameToken.EMPTY):
-                    print(" "*self.__SPACING_X)
-                else:
-                    raise ValueError("Unknown token")
-                    break
+                    Ansi.write(" "*self.__SPACING_X)
         Ansi.reset()
+        self.end_frame()
 
     def draw_winner(self, token:GameToken) -> None:
         """
@@ -133,6 +162,7 @@ class DisplayConsole(DisplayBase):
         Args:
             token (GameToken): The winning player's token (RED or YELLOW)
         """
+        self.begin_frame()
         Ansi.reset()
         for x in range(0,self.__grid_x):
             if(token == GameToken.RED):
@@ -142,6 +172,7 @@ class DisplayConsole(DisplayBase):
                 Ansi.set_foreground(3,True)
                 self.__draw_selector(x)
         Ansi.reset()
+        self.end_frame()
 
 
 """
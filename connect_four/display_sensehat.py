@@ -17,6 +17,13 @@ Attributes:
     __YELLOW (tuple): RGB color for player 2 tokens (255,255,0)
     __X_MAX_LENGTH (int): Maximum horizontal grid size (8)
     __Y_MAX_LENGTH (int): Maximum vertical grid size (8)
+    __pixels (list): The 64 colors of the LED matrix, row by row, as they are to be shown
+    __dirty (bool): True if __pixels differ from what the LED matrix shows
+    __frame_depth (int): Number of open frames, the matrix is updated when the last one ends
+
+Every drawing call only changes __pixels; the LED matrix is updated with a
+single set_pixels() call when the call, or the frame it is part of (see
+begin_frame), ends and the pixels changed.
 
 Raises:
     ValueError: If grid dimensions are too small (< 3x3)
@@ -41,6 +48,50 @@ Raises:
         self.__grid_x = 0
         self.__grid_y = 0
         self.sense = p_sense
+        self.__pixels = [self.__CLEAR] * (self.__X_MAX_LENGHT * self.__Y_MAX_LENGHT)
+        self.__dirty = True
+        self.__frame_depth = 0
+
+    def begin_frame(self) -> None:
+        """
+        Collects the pixels of the following drawing calls until end_frame().
+        """
+        self.__frame_depth += 1
+
+    def end_frame(self) -> None:
+        """
+        Shows the pixels drawn since begin_frame() with one update of the LED matrix.
+        """
+        self.__frame_depth -= 1
+        self.__commit()
+
+    def screen(self):
+        """
+        Displays of the same Sense HAT draw on the same LED matrix.
+        """
+        return self.sense
+
+    def __commit(self) -> None:
+        """
+        Writes the frame buffer to the LED matrix if it changed and no frame is open.
+        """
+        if self.__frame_depth == 0 and self.__dirty:
+            self.sense.set_pixels(self.__pixels)
+            self.__dirty = False
+
+    def __set_pixel(self, x:int, y:int, p_color) -> None:
+        """
+        Sets a pixel in the frame buffer.
+
+        Args:
+            x (int): The horizontal position on the LED matrix (0-7)
+            y (int): The vertical position on the LED matrix (0-7)
+            p_color (tuple): RGB color tuple of the pixel
+        """
+        index = y * self.__X_MAX_LENGHT + x
+        if self.__pixels[index] != p_color:
+            self.__pixels[index] = p_color
+            self.__dirty = True
 
     def __draw_selector(self, x:int, p_color) -> None:
         """
@@ -50,7 +101,7 @@ Raises:
             x (int): The horizontal position (column) for the selector (0-based)
             p_color (tuple): RGB color tuple for the selector
         """
-        self.sense.set_pixel(x,(self.__Y_MAX_LENGHT-self.__grid_y)-1,p_color)
+        self.__set_pixel(x,(self.__Y_MAX_LENGHT-self.__grid_y)-1,p_color)
 
     def __clear_selector(self, x:int) -> None:
         """
@@ -59,7 +110,7 @@ Raises:
         Args:
             x (int): The horizontal position (column) to clear (0-based)
         """
-        self.sense.set_pixel(x,(self.__Y_MAX_LENGHT-self.__grid_y)-1,self.__CLEAR)
+        self.__set_pixel(x,(self.__Y_MAX_LENGHT-self.__grid_y)-1,self.__CLEAR)
 
     def get_x_grid(self):
         """
@@ -88,10 +139,13 @@ Raises:
             raise ValueError("Grid too small")
         if(x>self.__X_MAX_LENGHT or y>self.__Y_MAX_LENGHT-1):
             raise ValueError("Grid too big")
-        self.sense.clear()
+        self.begin_frame()
+        for index in range(len(self.__pixels)):
+            self.__set_pixel(index % self.__X_MAX_LENGHT, index // self.__X_MAX_LENGHT, self.__CLEAR)
         for y_index in range(self.__Y_MAX_LENGHT-self.__grid_y,self.__Y_MAX_LENGHT):
             for x_index in range(0,self.__grid_x):
-                self.sense.set_pixel(x_index,y_index,self.__GRAY)
+                self.__set_pixel(x_index,y_index,self.__GRAY)
+        self.end_frame()
 
 
     def draw_token(self, x: int, y: int, token) -> None:
@@ -121,13 +175,14 @@ Raises:
             if(x>=self.__grid_x or y >= self.__grid_y or x <= -1 or y <= -2):
                 raise ValueError("Outbound of Grid")
             if(token == GameToken.RED):
-                self.sense.set_pixel(x,y+(self.__Y_MAX_LENGHT-self.__grid_y),self.__RED)
+                self.__set_pixel(x,y+(self.__Y_MAX_LENGHT-self.__grid_y),self.__RED)
             elif(token == GameToken.YELLOW):
-                self.sense.set_pixel(x,y+(self.__Y_MAX_LENGHT-self.__grid_y),self.__YELLOW)
+                self.__set_pixel(x,y+(self.__Y_MAX_LENGHT-self.__grid_y),self.__YELLOW)
             elif(token == GameToken.EMPTY):
-                self.sense.set_pixel(x,y+(self.__Y_MAX_LENGHT-self.__grid_y),self.__GRAY)
+                self.__set_pixel(x,y+(self.__Y_MAX_LENGHT-self.__grid_y),self.__GRAY)
             else:
                 raise ValueError("Unknown token")
+        self.__commit()
 
     def draw_winner(self, token:GameToken) -> None:
         """
@@ -141,6 +196,7 @@ Raises:
                 self.__draw_selector(x,self.__RED)
             elif(token == GameToken.YELLOW):
                 self.__draw_selector(x,self.__YELLOW)
+        self.__commit()
 
 if __name__ == '__main__':
     sense = SenseHat()
@@ -0,0 +1,404 @@
+from game_token import GameToken
+from game_state import GameState
+from drop_state import DropState
+from game_logic_base import GameLogicBase
+from player_base import PlayerBase
+from input_base import Keys
+from input_events import KeyEvents
+import argparse
+import asyncio
+import functools
+import os
+import random
+
+"""
+Coordinator engine for local and networked games
+
+One loop drives every kind of game. The seats of a game are taken by
+participants:
+- HumanPlayer: a person choosing columns on the console or the Sense HAT
+- BotPlayer: a function choosing the columns (see player_bot for the search bot)
+- RemotePlayer: someone playing on another machine; the coordinator waits
+  for their move with the game's wait_for_change() (a long poll on the server)
+
+Every loop iteration reads board and state once, with get_snapshot(), which
+is a single (conditional) request for a GameLogicClient. The displays of the
+participants are only redrawn when something changed, and PlayerBase only
+sends the changed cells to the display. Views sharing a screen (two local
+players on one terminal or one Sense HAT) take turns: only the view of the
+player whose turn it is draws there, and the winner is shown once per screen.
+
+run_async() plays the same loop on an asyncio event loop: humans choose their
+columns with PlayerBase.play_turn_async() from a KeyEvents queue, requests to
+the game and bot moves run in worker threads. The keys of the local humans are
+read the whole game, so ESC ends it also while a remote opponent or a bot moves.
+
+Usage:
+    python3 game_coordinator.py                                       # two humans on this machine
+    python3 game_coordinator.py --host virtualsquash.ch:5000 --color yellow
+    python3 game_coordinator.py --host virtualsquash.ch:5000 --bot    # the search bot plays
+
+Classes:
+    ParticipantBase: Interface of a participant
+    HumanPlayer, BotPlayer, RemotePlayer: The participants
+    GameCoordinator: Plays games with a set of participants
+"""
+
+FINISHED = [GameState.WON_RED, GameState.WON_YELLOW, GameState.DRAW]
+COLOR = 'red'                    # color of the local player in networked games
+HOST = 'virtualsquash.ch:5000'   # game server of networked games
+WAIT_TIMEOUT = 5.0               # longest long poll of run_async(), also the longest delay of ending a game with ESC
+
+
+def turn_token(state: GameState):
+    """
+    Returns:
+        GameToken | None: The token whose turn it is, None if the game is finished
+    """
+    if state == GameState.TURN_RED:
+        return GameToken.RED
+    if state == GameState.TURN_YELLOW:
+        return GameToken.YELLOW
+    return None
+
+
+def winner_token(state: GameState):
+    """
+    Returns:
+        GameToken | None: The token of the winner, None if the game isn't won
+    """
+    if state == GameState.WON_RED:
+        return GameToken.RED
+    if state == GameState.WON_YELLOW:
+        return GameToken.YELLOW
+    return None
+
+
+def create_player(token: GameToken, display: str = 'auto') -> PlayerBase:
+    """
+    Create a player with a display and an input.
+
+    Args:
+        token (GameToken): The token of the player
+        display (str): 'console', 'sensehat' or 'auto' (Sense HAT except on Windows)
+    """
+    if display == 'auto':
+        display = 'console' if os.name == 'nt' else 'sensehat'
+    if display == 'sensehat':
+        from player_sensehat import PlayerSenseHat # initializes the Sense HAT on import
+        return PlayerSenseHat(token)
+    from player_console import PlayerConsole
+    return PlayerConsole(token)
+
+
+class ParticipantBase:
+    """
+    A participant taking one seat of a game.
+
+    Attributes:
+        _token (GameToken): The token of the participant
+        _view (PlayerBase | None): The player whose display shows the game, None for no display
+    """
+    remote = False # True if the moves are made somewhere else
+
+    def __init__(self, token: GameToken, view: PlayerBase = None):
+        self._token = token
+        self._view = view
+
+    @property
+    def token(self) -> GameToken:
+        return self._token
+
+    @property
+    def view(self):
+        return self._view
+
+    def new_game(self) -> None:
+        """
+        Called before a game starts.
+        """
+
+    def end_game(self) -> None:
+        """
+        Called when a game ended, also if it was aborted.
+        """
+
+    def choose_column(self, board: list) -> int:
+        """
+        Choose the column of the next move.
+
+        Args:
+            board (list[list[GameToken]]): The current game board
+
+        Raises:
+            NotImplementedError: This method must be implemented by local participants.
+        """
+        raise NotImplementedError()
+
+    async def choose_column_async(self, board: list):
+        """
+        Choose the column of the next move without blocking the event loop;
+        choose_column() runs in a worker thread.
+
+        Returns:
+            int | None: The column, None if the participant gave up the game
+        """
+        return await asyncio.to_thread(self.choose_column, board)
+
+
+class HumanPlayer(ParticipantBase):
+    """
+    A person choosing the columns with the input of their player.
+
+    Attributes:
+        keys (KeyEvents | None): Keys of the player's input while run_async() plays a game
+    """
+    def __init__(self, player: PlayerBase):
+        """
+        Args:
+            player (PlayerBase): The player, its display shows the game
+        """
+        super().__init__(player.player_id, player)
+        self.keys = None
+
+    def choose_column(self, board: list) -> int:
+        return self._view.play_turn()
+
+    async def choose_column_async(self, board: list):
+        """
+        Returns the column chosen with the keys, None if the player pressed ESC.
+        """
+        if self.keys is None:
+            return await super().choose_column_async(board)
+        return await self._view.play_turn_async(self.keys)
+
+
+class BotPlayer(ParticipantBase):
+    """
+    A bot choosing the columns with a function.
+
+    Attributes:
+        _choose (callable): choose(board, token) -> column
+    """
+    def __init__(self, token: GameToken, choose, view: PlayerBase = None):
+        """
+        Args:
+            token (GameToken): The token of the bot
+            choose (callable): choose(board, token) -> column
+            view (PlayerBase): Player whose display shows the game, None for no display
+        """
+        super().__init__(token, view)
+        self._choose = choose
+
+    def choose_column(self, board: list) -> int:
+        """
+        Returns the bot's column, or a random free column if the bot's isn't possible.
+        """
+        free = [col for col in range(len(board[0])) if board[0][col] == GameToken.EMPTY]
+        column = self._choose(board, self._token)
+        return column if column in free else random.choice(free)
+
+
+class RemotePlayer(ParticipantBase):
+    """
+    An opponent playing on another machine.
+    """
+    remote = True
+
+
+class GameCoordinator:
+    """
+    Plays games with a set of participants.
+
+    Attributes:
+        _participants (dict): GameToken -> ParticipantBase of each local or remote seat
+        _views (list[PlayerBase]): The players whose displays show the game
+        _screens (list[list[PlayerBase]]): The views grouped by the screen they draw on
+        _events (dict): Input device -> KeyEvents of the humans, kept for all games of run_async()
+    """
+    def __init__(self, participants: list):
+        """
+        Args:
+            participants (list[ParticipantBase]): One participant per token
+        """
+        self._participants = {participant.token: participant for participant in participants}
+        self._views = [participant.view for participant in participants if participant.view is not None]
+        screens = {}
+        for view in self._views:
+            screens.setdefault(view.display.screen(), []).append(view)
+        self._screens = list(screens.values())
+        # humans on the same device share one queue, they take turns reading it
+        self._events = {}
+        for participant in participants:
+            if isinstance(participant, HumanPlayer):
+                source = participant.view.input.event_source()
+                if source not in self._events:
+                    self._events[source] = KeyEvents(participant.view.input)
+
+    def _screen_view(self, views: list, token) -> PlayerBase:
+        """
+        Returns the view of the participant with the token if it is one of the views of a screen, else the first.
+        """
+        participant = self._participants.get(token)
+        if participant is not None and participant.view in views:
+            return participant.view
+        return views[0]
+
+    def _draw(self, board: list, state: GameState) -> None:
+        """
+        Draw the board once per screen, with the view of the player whose turn it is (or who won).
+        """
+        token = turn_token(state) or winner_token(state)
+        for views in self._screens:
+            self._screen_view(views, token).draw_board(board, state)
+
+    def _show_winner(self, state: GameState) -> None:
+        """
+        Show the winner of a won game once per screen.
+        """
+        winner = winner_token(state)
+        if winner is None:
+            return
+        for views in self._screens:
+            self._screen_view(views, winner).display_winner(winner)
+            for view in views:
+                view.forget_board() # the winner covers what the others drew
+
+    def run(self, game: GameLogicBase) -> GameState:
+        """
+        Play the game until it is won or drawn.
+
+        Args:
+            game (GameLogicBase): The game, local or remote
+
+        Returns:
+            GameState: The final state of the game
+        """
+        for participant in self._participants.values():
+            participant.new_game()
+        try:
+            board, state = game.get_snapshot()
+            self._draw(board, state)
+            while state not in FINISHED:
+                participant = self._participants.get(turn_token(state))
+                if participant is None or participant.remote:
+                    if game.wait_for_change() == state:
+                        continue # nothing happened before the long poll timed out
+                elif game.drop_token(participant.token, participant.choose_column(board)) != DropState.DROP_OK:
+                    continue # the board didn't change, ask again
+                board, state = game.get_snapshot()
+                self._draw(board, state)
+        finally:
+            for participant in self._participants.values():
+                participant.end_game()
+        self._show_winner(state)
+        return state
+
+    async def run_async(self, game: GameLogicBase) -> GameState:
+        """
+        Play the game like run(), but on the running event loop (see the module description).
+
+        Args:
+            game (GameLogicBase): The game, local or remote
+
+        Returns:
+            GameState: The final state of the game, or the state when a player pressed ESC
+        """
+        events = self._events
+        for participant in self._participants.values():
+            if isinstance(participant, HumanPlayer):
+                participant.keys = events[participant.view.input.event_source()]
+        for participant in self._participants.values():
+            participant.new_game()
+        try:
+            for keys in events.values():
+                keys.start()
+            board, state = await asyncio.to_thread(game.get_snapshot)
+            self._draw(board, state)
+            while state not in FINISHED:
+                participant = self._participants.get(turn_token(state))
+                if participant is None or participant.remote:
+                    changed = asyncio.ensure_future(
+                        asyncio.to_thread(functools.partial(game.wait_for_change, WAIT_TIMEOUT)))
+                    if not await self._until_escape(changed, events.values()):
+                        return state
+                    if changed.result() == state:
+                        continue # nothing happened before the long poll timed out
+                else:
+                    # the player choosing reads their own keys
+                    watched = [keys for keys in events.values() if keys is not getattr(participant, 'keys', None)]
+                    chosen = asyncio.ensure_future(participant.choose_column_async(board))
+                    if not await self._until_escape(chosen, watched) or chosen.result() is None:
+                        return state
+                    if await asyncio.to_thread(game.drop_token, participant.token, chosen.result()) != DropState.DROP_OK:
+                        continue # the board didn't change, ask again
+                board, state = await asyncio.to_thread(game.get_snapshot)
+                self._draw(board, state)
+        finally:
+            for keys in events.values():
+                keys.stop()
+            for participant in self._participants.values():
+                participant.end_game()
+                if isinstance(participant, HumanPlayer):
+                    participant.keys = None
+        self._show_winner(state)
+        return state
+
+    async def _until_escape(self, task: asyncio.Future, watched) -> bool:
+        """
+        Wait for the task while taking the keys of the watched queues; other keys than ESC are dropped.
+
+        Returns:
+            bool: True if the task is done, False if ESC was pressed (the task is cancelled then)
+        """
+        while not task.done():
+            getters = [asyncio.ensure_future(keys.get()) for keys in watched]
+            await asyncio.wait([task, *getters], return_when=asyncio.FIRST_COMPLETED)
+            for getter in getters:
+                getter.cancel()
+            if any(getter.done() and not getter.cancelled() and getter.result() == Keys.ESC for getter in getters):
+                task.cancel()
+                return False
+        return True
+
+    def wait_for_next_game(self, game: GameLogicBase) -> None:
+        """
+        Wait until a finished remote game was reset by the server.
+        """
+        while game.wait_for_change() in FINISHED:
+            pass
+
+
+# start a game
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Connect Four")
+    parser.add_argument('--host', default=None,
+                        help=f"play against a remote opponent on this game server, e.g. {HOST}")
+    parser.add_argument('--color', default=COLOR, choices=['red', 'yellow'], help="color of the local player")
+    parser.add_argument('--bot', action='store_true', help="let the search bot play the local seat")
+    parser.add_argument('--display', default='auto', choices=['auto', 'console', 'sensehat'])
+    args = parser.parse_args()
+
+    if args.host is None:
+        from game_logic import GameLogic
+        coordinator = GameCoordinator([HumanPlayer(create_player(GameToken.RED, args.display)),
+                                       HumanPlayer(create_player(GameToken.YELLOW, args.display))])
+        asyncio.run(coordinator.run_async(GameLogic()))
+    else:
+        from game_logic_client import GameLogicClient
+        token = GameToken.RED if args.color == 'red' else GameToken.YELLOW
+        opponent = GameToken.YELLOW if token == GameToken.RED else GameToken.RED
+        if args.bot:
+            from player_bot import SearchBot
+            local = SearchBot(token, view=create_player(token, args.display))
+        else:
+            local = HumanPlayer(create_player(token, args.display))
+        game = GameLogicClient(host=args.host)
+        coordinator = GameCoordinator([local, RemotePlayer(opponent)])
+
+        async def play():
+            # ESC ends the game and the program
+            while await coordinator.run_async(game) in FINISHED:
+                await asyncio.to_thread(coordinator.wait_for_next_game, game)
+
+        asyncio.run(play())
@@ -1,6 +1,6 @@
 from game_logic_base import GameLogicBase
 from game_token import GameToken
-from game_state import GameState, check_win
+from game_state import GameState, check_win_at
 from drop_state import DropState
 import random
 
@@ -17,21 +17,35 @@ class GameLogic(GameLogicBase):
 
     Attributes:
         _board (List[List[GameToken]]): 6x7 game board grid
-        __starter_state (GameState): Randomly chosen initial player's turn
+        _last_move (tuple | None): (row, column) of the last dropped token
+        _result (GameState | None): Cached terminal state (WON_RED, WON_YELLOW or DRAW)
+        _moves (int): Number of tokens dropped so far
+        _move_log (List[tuple]): Append-only list of (player, column) of every successful drop
+        _turn_state (GameState): Whose turn it is (TURN_RED or TURN_YELLOW),
+            initially chosen at random
     """
-    def __init__(self):
+    def __init__(self, starter: GameToken = None):
         """
         Initialize a new game board and randomly select starting player.
 
         The board is created as a 6x7 grid of empty tokens, and the starting
         player (RED or YELLOW) is chosen randomly.
+
+        Args:
+            starter (GameToken): The player to move first, chosen randomly if None
         """
         super().__init__()
         self._board = [[GameToken.EMPTY for _ in range(7)] for _ in range(6)]
-        if random.getrandbits(1):
-            self.__starter_state = GameState.TURN_RED
+        self._last_move = None
+        self._result = None
+        self._moves = 0
+        self._move_log = []
+        if starter is not None:
+            self._turn_state = GameState.TURN_RED if starter == GameToken.RED else GameState.TURN_YELLOW
+        elif random.getrandbits(1):
+            self._turn_state = GameState.TURN_RED
         else:
-            self.__starter_state = GameState.TURN_YELLOW
+            self._turn_state = GameState.TURN_YELLOW
 
     def drop_token(self, player: GameToken, column: int) -> DropState:
         """
@@ -44,9 +58,15 @@ class GameLogic(GameLogicBase):
         Returns:
             DropState: Status of the drop attempt:
                 - DROP_OK: Token was successfully placed
-                - COLUMN_INVALID: Column index is out of bounds
-                - COLUMN_FULL: Selected column has no empty spaces
+                - COLUMN_INVALID: Column index is out of bounds or the column is full
+                - WRONG_PLAYER: It is not this player's turn or the game is over
         """
+        # check if it is the player's turn => reject before touching the board
+        if self._result is not None:
+            return DropState.WRONG_PLAYER
+        if player != (GameToken.RED if self._turn_state == GameState.TURN_RED else GameToken.YELLOW):
+            return DropState.WRONG_PLAYER
+
         # check if the column is valid (0..6) => return the appropriate DropState
         if(column<=-1 or column>=len(self._board[0])):
             return DropState.COLUMN_INVALID
@@ -59,10 +79,35 @@ class GameLogic(GameLogicBase):
         for row in range(len(self._board)-1,-1,-1):
             if(self._board[row][column] == GameToken.EMPTY):
                 self._board[row][column] = player
+                self._last_move = (row, column)
                 break
-    
+
+        # only the lines through the new token can have changed the result
+        self._moves += 1
+        self._move_log.append((GameToken(player), column))
+        game_result = check_win_at(self._board, *self._last_move)
+        if game_result in [GameState.WON_RED, GameState.WON_YELLOW]:
+            self._result = game_result
+        elif self._moves == len(self._board) * len(self._board[0]):
+            self._result = GameState.DRAW
+
+        # hand the turn over to the other player
+        if self._turn_state == GameState.TURN_RED:
+            self._turn_state = GameState.TURN_YELLOW
+        else:
+            self._turn_state = GameState.TURN_RED
+
         return DropState.DROP_OK
 
+    def get_moves(self, since: int = 0) -> list:
+        """
+        Returns the moves made after the first `since` moves.
+
+        Returns:
+            List[tuple]: (player, column) of every move, oldest first
+        """
+        return self._move_log[since:]
+
     def get_state(self) -> GameState:
         """
         Determine the current state of the game.
@@ -75,29 +120,8 @@ class GameLogic(GameLogicBase):
                 - TURN_RED: Red player's turn
                 - TURN_YELLOW: Yellow player's turn
         """
-        
-        game_result = check_win(self._board)
-        
-        # check if game is over and if so, return the results
-        if game_result in [GameState.WON_RED, GameState.WON_YELLOW, GameState.DRAW]:
-            
-            return game_result
-
-        # else, return the current state
-        temp_RedCount = 0
-        temp_YellowCount = 0
-        # Iterate over the board to count RED tokens
-        for row in self._board:
-            for col in row:
-                if col == GameToken.RED:
-                    temp_RedCount += 1
-                if col == GameToken.YELLOW:
-                    temp_YellowCount += 1
-        if temp_YellowCount == temp_RedCount:
-            return self.__starter_state
-        else:
-            if self.__starter_state == GameState.TURN_RED:
-                return GameState.TURN_YELLOW
-            else:
-                return GameState.TURN_RED
-    
+        # result and turn are both kept up to date by drop_token
+        if self._result is not None:
+            return self._result
+
+        return self._turn_state
@@ -22,6 +22,37 @@ class GameLogicBase:
     def get_state(self) -> GameState:
         raise NotImplementedError("")
 
+    def get_snapshot(self) -> tuple:
+        """
+        Returns board and state together. Remote games read both with a single
+        request, so callers needing both should prefer this over get_board() and get_state().
+
+        Returns:
+        tuple: (board, state)
+        """
+        return self.get_board(), self.get_state()
+
+    def get_moves(self, since: int = 0) -> list:
+        """
+        Returns the moves of the game in the order they were made, starting with move number `since`.
+        Each move is a tuple (player, column), so replaying them on an empty board yields the board.
+
+        Parameters:
+        - since: Number of moves the caller already knows.
+        """
+        raise NotImplementedError("You need to subclass GameLogicBase to use get_moves().")
+
+    def wait_for_change(self, timeout: float = None) -> GameState:
+        """
+        Wait until another party changed the game, then return the new state.
+        Remote games block until the opponent moved; a local game can only be
+        changed by the caller itself, so the current state is returned right away.
+
+        Parameters:
+        - timeout: Longest time to wait in seconds.
+        """
+        return self.get_state()
+
     def drop_token(self, player: GameToken, column: int) -> DropState:
         """
         The current player (identified by either 'X' or 'Y') makes their move by dropping their token into the specified column. 
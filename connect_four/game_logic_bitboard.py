@@ -0,0 +1,219 @@
+from game_logic_base import GameLogicBase
+from game_token import GameToken
+from game_state import GameState
+from drop_state import DropState
+import random
+
+"""
+Bitboard Game Logic Implementation for Connect Four
+
+Each player is stored as an integer bitboard. Bit ``col * HEIGHT + row`` is set
+if the player owns the cell in column ``col`` and row ``row`` (row 0 = bottom).
+Every column has one extra sentinel bit on top, so shifting a bitboard never
+wraps a line from one column into the next.
+
+    6 13 20 27 34 41 48   <- sentinel row (always 0)
+    5 12 19 26 33 40 47
+    4 11 18 25 32 39 46
+    3 10 17 24 31 38 45
+    2  9 16 23 30 37 44
+    1  8 15 22 29 36 43
+    0  7 14 21 28 35 42
+
+GameLogicBitboard answers every call like GameLogic, including the DropState
+of rejected drops, so the game server can run either (see game_registry.GAME_LOGICS).
+
+Classes:
+    GameLogicBitboard: Drop-in GameLogicBase implementation using bitboards
+"""
+
+ROWS = 6
+COLS = 7
+HEIGHT = ROWS + 1  # rows per column including the sentinel bit
+
+# shift distances for vertical, horizontal and both diagonal directions
+DIRECTIONS = (1, HEIGHT, HEIGHT - 1, HEIGHT + 1)
+
+
+def has_four(bitboard: int) -> bool:
+    """
+    Check if a bitboard contains four connected tokens in any direction.
+
+    Args:
+        bitboard (int): The bitboard of a single player
+
+    Returns:
+        bool: True if the bitboard contains a line of four
+    """
+    for shift in DIRECTIONS:
+        pairs = bitboard & (bitboard >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def board_to_bitboards(board: list) -> tuple:
+    """
+    Convert a 6x7 list-of-lists board into bitboards.
+
+    Args:
+        board (List[List[GameToken]]): Board as returned by GameLogicBase.get_board()
+
+    Returns:
+        tuple: (red bitboard, yellow bitboard, column heights)
+    """
+    red = 0
+    yellow = 0
+    heights = [0] * COLS
+    for y_index, row in enumerate(board):
+        bit_row = ROWS - 1 - y_index
+        for col, token in enumerate(row):
+            if token == GameToken.RED:
+                red |= 1 << (col * HEIGHT + bit_row)
+            elif token == GameToken.YELLOW:
+                yellow |= 1 << (col * HEIGHT + bit_row)
+            else:
+                continue
+            heights[col] = max(heights[col], bit_row + 1)
+    return red, yellow, heights
+
+
+class GameLogicBitboard(GameLogicBase):
+    """
+    Implementation of Connect Four game logic based on bitboards.
+
+    Attributes:
+        _bitboards (dict): Bitboard per player token (RED, YELLOW)
+        _heights (List[int]): Number of tokens in each column
+        _moves (int): Number of tokens on the board
+        _move_log (List[tuple]): Append-only list of (player, column) of every successful drop
+        _winner (GameState | None): Cached WON_RED / WON_YELLOW result
+        _turn_state (GameState): Whose turn it is (TURN_RED or TURN_YELLOW),
+            initially chosen at random
+    """
+    def __init__(self, starter: GameToken = None):
+        """
+        Initialize an empty board and randomly select the starting player.
+
+        Args:
+            starter (GameToken): The player to move first, chosen randomly if None
+        """
+        super().__init__()
+        self._board = None  # list-of-lists view, built on demand
+        self._bitboards = {GameToken.RED: 0, GameToken.YELLOW: 0}
+        self._heights = [0] * COLS
+        self._moves = 0
+        self._move_log = []
+        self._winner = None
+        if starter is not None:
+            self._turn_state = GameState.TURN_RED if starter == GameToken.RED else GameState.TURN_YELLOW
+        elif random.getrandbits(1):
+            self._turn_state = GameState.TURN_RED
+        else:
+            self._turn_state = GameState.TURN_YELLOW
+
+    def get_board(self) -> list:
+        """
+        Build the 6x7 list-of-lists view of the board.
+
+        The view is cached until the next successful drop, so repeated calls
+        between moves do not rebuild it.
+
+        Returns:
+            List[List[GameToken]]: The board, row 0 being the top row
+        """
+        if self._board is None:
+            red = self._bitboards[GameToken.RED]
+            yellow = self._bitboards[GameToken.YELLOW]
+            board = []
+            for bit_row in range(ROWS - 1, -1, -1):
+                row = []
+                for col in range(COLS):
+                    bit = 1 << (col * HEIGHT + bit_row)
+                    if red & bit:
+                        row.append(GameToken.RED)
+                    elif yellow & bit:
+                        row.append(GameToken.YELLOW)
+                    else:
+                        row.append(GameToken.EMPTY)
+                board.append(row)
+            self._board = board
+        return self._board
+
+    def drop_token(self, player: GameToken, column: int) -> DropState:
+        """
+        Attempt to drop a player's token in the specified column.
+
+        Args:
+            player (GameToken): The player's token (RED or YELLOW)
+            column (int): The column index where the token should be dropped (0-6)
+
+        Returns:
+            DropState: Status of the drop attempt:
+                - DROP_OK: Token was successfully placed
+                - COLUMN_INVALID: Column index is out of bounds or the column is full
+                  (like GameLogic, clients treat both the same)
+                - WRONG_PLAYER: It is not this player's turn or the game is over
+        """
+        if self._winner is not None or self._moves == ROWS * COLS:
+            return DropState.WRONG_PLAYER
+        if player != (GameToken.RED if self._turn_state == GameState.TURN_RED else GameToken.YELLOW):
+            return DropState.WRONG_PLAYER
+        if column < 0 or column >= COLS:
+            return DropState.COLUMN_INVALID
+        if self._heights[column] >= ROWS:
+            return DropState.COLUMN_INVALID
+
+        player = GameToken(player)
+        self._bitboards[player] |= 1 << (column * HEIGHT + self._heights[column])
+        self._heights[column] += 1
+        self._moves += 1
+        self._move_log.append((player, column))
+        self._board = None
+
+        # only the player who just moved can have completed a line
+        if has_four(self._bitboards[player]):
+            self._winner = GameState.WON_RED if player == GameToken.RED else GameState.WON_YELLOW
+
+        if self._turn_state == GameState.TURN_RED:
+            self._turn_state = GameState.TURN_YELLOW
+        else:
+            self._turn_state = GameState.TURN_RED
+        return DropState.DROP_OK
+
+    def get_moves(self, since: int = 0) -> list:
+        """
+        Returns the moves made after the first `since` moves.
+
+        Returns:
+            List[tuple]: (player, column) of every move, oldest first
+        """
+        return self._move_log[since:]
+
+    def get_state(self) -> GameState:
+        """
+        Determine the current state of the game.
+
+        Returns:
+            GameState: Current game state:
+                - WON_RED: Red player has won
+                - WON_YELLOW: Yellow player has won
+                - DRAW: Game is a draw
+                - TURN_RED: Red player's turn
+                - TURN_YELLOW: Yellow player's turn
+        """
+        if self._winner is not None:
+            return self._winner
+        if self._moves == ROWS * COLS:
+            return GameState.DRAW
+        return self._turn_state
+
+
+if __name__ == '__main__':
+    game = GameLogicBitboard()
+    for column in [0, 1, 0, 1, 0, 1, 0]:
+        token = GameToken.RED if game.get_state() == GameState.TURN_RED else GameToken.YELLOW
+        print(f"{token} -> {column}: {game.drop_token(token, column)}")
+    for row in game.get_board():
+        print('|'.join(row))
+    print(f"GameState: {game.get_state()}")
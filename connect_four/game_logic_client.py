@@ -2,7 +2,21 @@ from game_logic_base import GameLogicBase
 from game_state import GameState
 from drop_state import DropState
 from game_token import GameToken
+from board_codec import BINARY_MEDIA_TYPE, decode_board, decode_snapshot
+from collections import deque
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import requests
+import statistics
+import time
+
+LONG_POLL_TIMEOUT = 30.0 #Seconds the server may hold a state request
+POLL_DELAY = 0.5 #Seconds between polls if the server doesn't support long polling
+POOL_SIZE = 4 #Connections kept open to the server
+REQUEST_TIMEOUT = (3.05, 10.0) #Seconds to connect and to wait for a response
+RETRIES = 3 #Retries of failed requests; drops are only retried if they never reached the server
+BACKOFF = 0.2 #Retry delays grow as BACKOFF * 2^(retry - 1) seconds
+LATENCY_WINDOW = 1000 #Latencies kept per endpoint for the statistics
 
 class GameLogicClient(GameLogicBase):
     """
@@ -10,18 +24,181 @@ class GameLogicClient(GameLogicBase):
 
     Attributes:
         _url (str): The base URL for the remote API endpoints
+        _version (int | None): Version of the game at the last state request,
+            None if the server does not report versions
+        _snapshot (tuple | None): (board, state) of the last snapshot
+        _etag (str | None): ETag of the last snapshot, sent back as If-None-Match
+        _snapshots (bool): False once the server turned out not to offer /snapshot
+        _accept (str): Accept header of board and snapshot requests
+        _deltas (bool): get_snapshot/get_board/get_state sync the mirror board through /moves,
+            False once the server turned out not to offer /moves
+        _mirror (list): Local copy of the board, built from the moves
+        _mirror_log (list): (player, column) of all moves applied to the mirror
+        _mirror_game (str | None): The game the mirror belongs to, as reported by the server
+        _session (requests.Session): Keeps connections to the server open between requests
+        _timeout (tuple): Connect and read timeout in seconds
+        _latencies (dict): Endpoint -> deque of the latest round-trip times in seconds
     """
-    def __init__(self, host):
+    def __init__(self, host, pool_size: int = POOL_SIZE, timeout: tuple = REQUEST_TIMEOUT,
+                 retries: int = RETRIES, backoff: float = BACKOFF, binary: bool = True,
+                 deltas: bool = True):
         """
         Initialize the GameLogicClient with a host address.
 
         Args:
             host (str): The host address of the remote server (with or without http/https protocol)
+            pool_size (int): Number of connections kept open to the server
+            timeout (tuple): Connect and read timeout in seconds
+            retries (int): Number of retries of a failed request
+            backoff (float): Base delay between retries in seconds
+            binary (bool): Ask for the compact binary board encoding; servers without it answer with JSON
+            deltas (bool): Keep a mirror of the board that only downloads new moves (see sync());
+                servers without /moves are read through snapshots
         """
         super().__init__()
         host = host.replace('http://', '').replace('https://', '')
         print(f"GameLogicClient initialized with host {host}")
         self._url = f'http://{host}/api'
+        # only GETs are retried after they reached the server: a repeated drop could be applied twice
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=[502, 503, 504],
+                      allowed_methods=frozenset(["GET"]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self._session = requests.Session()
+        self._session.mount('http://', adapter)
+        self._timeout = timeout
+        self._latencies = {}
+        self._version = None
+        self._snapshot = None
+        self._etag = None
+        self._snapshots = True
+        self._accept = f"{BINARY_MEDIA_TYPE}, application/json;q=0.5" if binary else "application/json"
+        self._deltas = deltas
+        self._mirror = None
+        self._mirror_log = []
+        self._mirror_game = None
+
+    def _request(self, method: str, endpoint: str, name: str = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session and record its round-trip time.
+
+        Args:
+            method (str): HTTP method
+            endpoint (str): Path below the API base URL
+            name (str): Name the latency is recorded under, endpoint if None
+            **kwargs: Passed on to requests.Session.request
+        """
+        kwargs.setdefault("timeout", self._timeout)
+        start = time.perf_counter()
+        response = self._session.request(method, f"{self._url}/{endpoint}", **kwargs)
+        latencies = self._latencies.setdefault(name or endpoint, deque(maxlen=LATENCY_WINDOW))
+        latencies.append(time.perf_counter() - start)
+        return response
+
+    def latency_stats(self) -> dict:
+        """
+        Round-trip times of the latest requests per endpoint.
+
+        Returns:
+            dict: Endpoint -> {"count", "mean_ms", "p50_ms", "p95_ms", "max_ms"}
+        """
+        stats = {}
+        for name, latencies in self._latencies.items():
+            ordered = sorted(latencies)
+            stats[name] = {
+                "count": len(ordered),
+                "mean_ms": statistics.fmean(ordered) * 1000,
+                "p50_ms": statistics.median(ordered) * 1000,
+                "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return stats
+
+    def close(self) -> None:
+        """
+        Close the connections to the server.
+        """
+        self._session.close()
+
+    def sync(self) -> tuple:
+        """
+        Bring the mirror board up to date with the moves made since the last sync.
+
+        Only the new moves are downloaded and dropped onto the mirror. After a reset
+        of the game the server sends all moves of the new game and the mirror starts over
+        with an empty board of the size reported by the server.
+
+        Returns:
+            tuple: (board, state) with a copy of the mirror board and the GameState
+        """
+        params = {"since": len(self._mirror_log)}
+        if self._mirror_game is not None:
+            params["game"] = self._mirror_game
+        response = self._request("GET", "moves", params=params)
+        if response.status_code == 404 and self._mirror is None: # server without move log
+            self._deltas = False
+            return self.get_snapshot()
+        result = response.json()
+        since = result.get("since")
+        if self._mirror is None or since < len(self._mirror_log):
+            # servers before the board size was reported only have 6x7 boards
+            rows, cols = result.get("rows", 6), result.get("cols", 7)
+            self._mirror = [[GameToken.EMPTY for _ in range(cols)] for _ in range(rows)]
+            self._mirror_log = []
+        for move in result.get("moves"):
+            player, column = GameToken(move["player_id"]), move["column"]
+            for row in range(len(self._mirror) - 1, -1, -1):
+                if self._mirror[row][column] == GameToken.EMPTY:
+                    self._mirror[row][column] = player
+                    break
+            self._mirror_log.append((player, column))
+        self._mirror_game = result.get("game")
+        self._version = result.get("version")
+        return [row[:] for row in self._mirror], GameState(result.get("game_state"))
+
+    def get_moves(self, since: int = 0) -> list:
+        """
+        Sync the mirror board and return the moves after the first `since` moves.
+
+        Returns:
+            List[tuple]: (player, column) of every move, oldest first
+        """
+        self.sync()
+        return self._mirror_log[since:]
+
+    def get_snapshot(self) -> tuple:
+        """
+        Retrieve board and state from the server in a single request.
+
+        With deltas (the default) the request only downloads the moves made since the
+        last call (see sync()). Otherwise it is a conditional snapshot request: while
+        the game didn't change, the server answers with a body-less 304 and the cached
+        snapshot is returned.
+
+        Returns:
+            tuple: (board, state) with the board as 2D list and the GameState
+        """
+        if self._deltas:
+            return self.sync()
+        if not self._snapshots:
+            return self._get_board(), self._get_state()
+        headers = {"Accept": self._accept}
+        if self._etag is not None:
+            headers["If-None-Match"] = self._etag
+        response = self._request("GET", "snapshot", headers=headers)
+        if response.status_code == 304: # status code: 304 Not Modified
+            return self._snapshot
+        if response.status_code == 404: # server without snapshots
+            self._snapshots = False
+            return self.get_snapshot()
+        if response.headers.get("Content-Type") == BINARY_MEDIA_TYPE:
+            board, state, self._version = decode_snapshot(response.content)
+        else:
+            snapshot = response.json()
+            board, state = snapshot.get("board"), GameState(snapshot.get("game_state"))
+            self._version = snapshot.get("version")
+        self._etag = response.headers.get("ETag")
+        self._snapshot = (board, state)
+        return self._snapshot
 
     def get_board(self) -> list:
         """
@@ -30,10 +207,7 @@ class GameLogicClient(GameLogicBase):
         Returns:
             list: A 2D list representing the current game board
         """
-        # call remote API
-        response = requests.get(f"{self._url}/board")
-        # return result to local caller
-        return response.json().get("board")
+        return self.get_snapshot()[0]
 
     def get_state(self) -> GameState:
         """
@@ -42,9 +216,45 @@ class GameLogicClient(GameLogicBase):
         Returns:
             GameState: The current state of the game (e.g., TURN_RED, TURN_YELLOW, etc.)
         """
-        response = requests.get(f"{self._url}/state")
+        return self.get_snapshot()[1]
+
+    def _get_board(self) -> list:
+        # call remote API
+        response = self._request("GET", "board", headers={"Accept": self._accept})
+        if response.headers.get("Content-Type") == BINARY_MEDIA_TYPE:
+            return decode_board(response.content)
+        # return result to local caller
+        return response.json().get("board")
+
+    def _get_state(self) -> GameState:
+        response = self._request("GET", "state")
+        self._version = response.json().get("version")
+        return GameState(response.json().get("game_state"))
+
+    def wait_for_change(self, timeout: float = LONG_POLL_TIMEOUT) -> GameState:
+        """
+        Wait until the game changed since the last state request, then return the new state.
+
+        Uses the server's long poll (`/state?after=<version>`), so no requests are sent
+        while nothing happens. Falls back to a single delayed poll if the server does not
+        report versions.
+
+        Args:
+            timeout (float): Longest time to wait in seconds
+
+        Returns:
+            GameState: The current state of the game (unchanged if the timeout expired)
+        """
+        if self._version is None:
+            time.sleep(POLL_DELAY)
+            return self.get_state()
+        # recorded separately, the time is mostly spent waiting for the opponent
+        response = self._request("GET", "state", name="state (long poll)",
+                                 params={"after": self._version, "timeout": timeout},
+                                 timeout=(self._timeout[0], timeout + 5))
+        self._version = response.json().get("version")
         return GameState(response.json().get("game_state"))
-            
+
     def drop_token(self, player, column) -> DropState:
         """
         Attempt to drop a token in the specified column for the given player.
@@ -57,7 +267,7 @@ class GameLogicClient(GameLogicBase):
             DropState: The result of the drop attempt (DROP_OK, COLUMN_FULL, etc.)
         """
         token = dict(player_id=player, column=column)
-        response = requests.post(f"{self._url}/drop", json=token)
+        response = self._request("POST", "drop", json=token)
         return DropState(response.json().get("drop_state"))
 
 if __name__ == '__main__':
@@ -84,8 +294,7 @@ if __name__ == '__main__':
 
     client = GameLogicClient("127.0.0.1")
     while( True ):
-        game_state = client.get_state()
-        board = client.get_board()
+        board, game_state = client.get_snapshot()
 
         draw_board( board, game_state )
 
@@ -97,3 +306,6 @@ if __name__ == '__main__':
         else: break # bail out if its neither RED's nor YELLOW's turn, i.e. WON or DRAW
     
     print("Game Over")
+    for endpoint, stats in client.latency_stats().items():
+        print(f"{endpoint}: {stats['count']} requests, p50 {stats['p50_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms")
+    client.close()
@@ -0,0 +1,186 @@
+from game_state import GameState
+from drop_state import DropState
+from game_token import GameToken
+from game_logic_client import LONG_POLL_TIMEOUT, POOL_SIZE, REQUEST_TIMEOUT
+from board_codec import BINARY_MEDIA_TYPE, decode_snapshot
+import aiohttp
+import asyncio
+
+"""
+asyncio client of the game server
+
+The coroutine counterpart of GameLogicClient: the same requests, conditional
+snapshots and long polls, but every call is awaited, so one event loop can
+talk to hundreds of games at the same time. Clients can share one
+aiohttp.ClientSession and with it one connection pool.
+
+Classes:
+    AsyncGameLogicClient: Async access to one game on the server
+"""
+
+
+class AsyncGameLogicClient:
+    """
+    Async client of a single game on the game server.
+
+    Attributes:
+        _base_url (str): The base URL of the server's API
+        _url (str): The base URL of the game's API endpoints
+        _session (aiohttp.ClientSession | None): The HTTP session, created on first use if not given
+        _own_session (bool): True if close() has to close the session
+        _timeout (aiohttp.ClientTimeout): Timeout of normal requests
+        _version (int | None): Version of the game at the last snapshot or state request
+        _snapshot (tuple | None): (board, state) of the last snapshot
+        _etag (str | None): ETag of the last snapshot, sent back as If-None-Match
+        _accept (str): Accept header of snapshot requests
+    """
+    def __init__(self, host: str, game_id: str = None, session: aiohttp.ClientSession = None,
+                 timeout: tuple = REQUEST_TIMEOUT, binary: bool = True):
+        """
+        Args:
+            host (str): The host address of the server (with or without http/https protocol)
+            game_id (str): The game to play, the server's default game if None
+            session (aiohttp.ClientSession): Session shared with other clients, a new one if None
+            timeout (tuple): Connect and read timeout in seconds
+            binary (bool): Ask for the compact binary board encoding; servers without it answer with JSON
+        """
+        host = host.replace('http://', '').replace('https://', '')
+        self._base_url = f'http://{host}/api'
+        self._url = self._base_url if game_id is None else f'{self._base_url}/games/{game_id}'
+        self._session = session
+        self._own_session = session is None
+        self._timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        self._version = None
+        self._snapshot = None
+        self._etag = None
+        self._accept = f"{BINARY_MEDIA_TYPE}, application/json;q=0.5" if binary else "application/json"
+
+    @staticmethod
+    def create_session(pool_size: int = POOL_SIZE) -> aiohttp.ClientSession:
+        """
+        Create a session with a connection pool, to be shared by many clients.
+
+        Args:
+            pool_size (int): Maximum number of open connections
+        """
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=pool_size))
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = self.create_session()
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Close the session if the client created it.
+        """
+        if self._own_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> 'AsyncGameLogicClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def create_game(self) -> str:
+        """
+        Create a new game on the server and play it from now on.
+
+        Returns:
+            str: The id of the new game
+        """
+        async with self._get_session().post(f"{self._base_url}/games", timeout=self._timeout) as response:
+            game_id = (await response.json()).get("game_id")
+        self._url = f'{self._base_url}/games/{game_id}'
+        self._version = self._snapshot = self._etag = None
+        return game_id
+
+    async def get_snapshot(self) -> tuple:
+        """
+        Retrieve board and state in a single conditional request.
+
+        Returns:
+            tuple: (board, state) with the board as 2D list and the GameState
+        """
+        headers = {"Accept": self._accept}
+        if self._etag is not None:
+            headers["If-None-Match"] = self._etag
+        async with self._get_session().get(f"{self._url}/snapshot", headers=headers,
+                                           timeout=self._timeout) as response:
+            if response.status == 304: # status code: 304 Not Modified
+                return self._snapshot
+            if response.content_type == BINARY_MEDIA_TYPE:
+                board, state, self._version = decode_snapshot(await response.read())
+            else:
+                snapshot = await response.json()
+                board, state = snapshot.get("board"), GameState(snapshot.get("game_state"))
+                self._version = snapshot.get("version")
+            self._etag = response.headers.get("ETag")
+        self._snapshot = (board, state)
+        return self._snapshot
+
+    async def get_board(self) -> list:
+        """
+        Retrieve the current game board from the server.
+
+        Returns:
+            list: A 2D list representing the current game board
+        """
+        return (await self.get_snapshot())[0]
+
+    async def get_state(self) -> GameState:
+        """
+        Retrieve the current game state from the server.
+
+        Returns:
+            GameState: The current state of the game
+        """
+        return (await self.get_snapshot())[1]
+
+    async def wait_for_change(self, timeout: float = LONG_POLL_TIMEOUT) -> GameState:
+        """
+        Wait until the game changed since the last snapshot or state request.
+
+        Args:
+            timeout (float): Longest time to wait in seconds
+
+        Returns:
+            GameState: The current state of the game (unchanged if the timeout expired)
+        """
+        if self._version is None:
+            return await self.get_state()
+        wait_timeout = aiohttp.ClientTimeout(sock_connect=self._timeout.sock_connect, sock_read=timeout + 5)
+        async with self._get_session().get(f"{self._url}/state", params={"after": self._version, "timeout": timeout},
+                                           timeout=wait_timeout) as response:
+            result = await response.json()
+        self._version = result.get("version")
+        return GameState(result.get("game_state"))
+
+    async def drop_token(self, player: GameToken, column: int) -> DropState:
+        """
+        Attempt to drop a token in the specified column for the given player.
+
+        Args:
+            player (GameToken): The player making the move (RED or YELLOW)
+            column (int): The column number where the token should be dropped (0-6)
+
+        Returns:
+            DropState: The result of the drop attempt
+        """
+        token = dict(player_id=player, column=column)
+        async with self._get_session().post(f"{self._url}/drop", json=token, timeout=self._timeout) as response:
+            return DropState((await response.json()).get("drop_state"))
+
+
+if __name__ == '__main__':
+    async def main():
+        async with AsyncGameLogicClient("127.0.0.1:5000") as client:
+            board, state = await client.get_snapshot()
+            print("0|1|2|3|4|5|6")
+            for row in board:
+                print('|'.join(row))
+            print(f"GameState: {state}")
+
+    asyncio.run(main())
@@ -1,23 +1,55 @@
-from game_logic import GameLogic
 from game_state import GameState
 from drop_state import DropState
-from flask import Flask, request, jsonify
+from game_registry import GameRegistry, DEFAULT_GAME_ID, LONG_POLL_TIMEOUT, GAME_LOGICS
+from game_store import SqliteGameStore
+from board_codec import BINARY_MEDIA_TYPE, encode_board, encode_snapshot
+from server_metrics import Metrics, SamplingProfiler, LOCK_WAIT_BUCKETS
+from flask import Flask, Response, g, request, jsonify
+import argparse
+import json
+import time
 from flasgger import Swagger
-import threading
 
 """
 Connect Four Game Server Implementation
 
 The server exposes the following API endpoints:
 - GET /api/board: Returns the current state of the game board
-- GET /api/state: Returns the current game state (whose turn, win state, etc.)
+- GET /api/state: Returns the current game state (whose turn, win state, etc.).
+  With `?after=<version>` the request waits until the game changed (long poll)
+- GET /api/snapshot: Returns board, state and version in one response; supports
+  `If-None-Match` so an unchanged game costs a body-less 304
+- GET /api/moves?since=<n>: Returns only the moves after the first n moves, so a
+  client mirroring the board downloads just the new tokens
+- GET /api/stream: Server-Sent Events stream pushing board and state after every change
 - POST /api/drop: Handles player moves by dropping tokens in specified columns
+- POST /api/games: Creates a new game and returns its id
+- GET /metrics: Request counters, latency histograms, lock wait times and game
+  counts in the Prometheus text format
+- GET /metrics/profiler: Stacks sampled by the profiler (folded stacks format)
+- POST /metrics/profiler: Switches the sampling profiler on or off
+- GET /api/games/<game_id>/board, GET /api/games/<game_id>/state,
+  GET /api/games/<game_id>/snapshot, GET /api/games/<game_id>/moves,
+  GET /api/games/<game_id>/stream, POST /api/games/<game_id>/drop:
+  The same as above for a specific game
+
+Board and snapshot are also available in a compact binary encoding (see
+board_codec) for clients sending `Accept: application/vnd.connect-four+binary`.
+
+The routes without a game id operate on the default game, so one server can
+host many games while old clients keep working.
 
 Key Components:
 - Flask application for handling HTTP requests
 - Swagger integration for API documentation
-- Threading for handling automatic game resets
-- GameLogic class integration for game state management
+- GameRegistry holding all games, with per-game locks and a sweeper thread
+  that resets finished games and removes idle ones
+- SqliteGameStore logging every move to games.db, so a restarted server
+  continues all running games
+- Metrics and SamplingProfiler (see server_metrics) instrumenting the server;
+  the profiler is off until it is switched on through /metrics/profiler
+- GameLogic class integration for game state management; `--logic bitboard`
+  runs the games on GameLogicBitboard instead
 
 Usage:
     To start the server on a webserver:
@@ -26,31 +58,150 @@ Usage:
     3. conda activate myenv
     4. cd PYTHON_PROJECT/connect_four/
     5. nohup python3 game_logic_server.py > output.log 2>&1 &
+       (add `--logic bitboard` for the bitboard game logic)
 
 Dependencies:
     - Flask
     - flasgger
-    - threading
-    - GameLogic, GameState, and DropState from local modules
+    - GameLogic, GameState, DropState, GameRegistry, SqliteGameStore, Metrics and
+      SamplingProfiler from local modules
 """
 
 if __name__ == "__main__":
-    game = GameLogic()
+    parser = argparse.ArgumentParser(description="Connect Four game server")
+    parser.add_argument('--logic', default='list', choices=sorted(GAME_LOGICS), help="game logic implementation")
+    args = parser.parse_args()
+
+    metrics = Metrics()
+    profiler = SamplingProfiler()
+    metrics.counter("requests_total", "Handled requests", ("route", "method", "status"))
+    metrics.histogram("request_duration_seconds", "Time to handle a request", ("route",))
+    metrics.histogram("lock_wait_seconds", "Time spent waiting for locks held by another thread",
+                      ("lock",), LOCK_WAIT_BUCKETS)
+    # the registry's locks record their wait times in lock_wait_seconds
+    registry = GameRegistry(GAME_LOGICS[args.logic], store=SqliteGameStore(), # games are restored from games.db
+                            lock_factory=metrics.timed_lock)
+    registry.start() # finished games are reset after 10s, idle games removed
+    metrics.gauge("games", "Games held by the registry", lambda: len(registry))
+    metrics.gauge("games_finished", "Finished games waiting for their reset", registry.count_finished)
+    metrics.gauge("profiler_enabled", "1 while the sampling profiler runs", lambda: int(profiler.enabled))
     app = Flask(__name__)
     swagger = Swagger(app)
 
-    Reset_timer = threading.Timer(10.0, None)
-    Reset_timer_lock = threading.Lock()  # Create a lock for Reset_timer
+    @app.before_request
+    def start_timer():
+        g.start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        # the route pattern keeps the number of label values small, unknown urls share one label
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        metrics.observe("request_duration_seconds", time.perf_counter() - g.start, route)
+        metrics.inc("requests_total", route, request.method, str(response.status_code))
+        return response
+
+    def wants_binary():
+        """True if the client prefers the binary encoding over JSON."""
+        return request.accept_mimetypes.best_match(["application/json", BINARY_MEDIA_TYPE]) == BINARY_MEDIA_TYPE
+
+    def board_response(game_id):
+        """Returns the board of a game as JSON or binary response."""
+        session = registry.get(game_id)
+        if session is None:
+            return jsonify({"Error": f"Game '{game_id}' not found."}), 404
+        if wants_binary():
+            response = Response(encode_board(session.get_board()), mimetype=BINARY_MEDIA_TYPE)
+        else:
+            # return board to the caller via JSON response
+            response = jsonify( {"board": session.get_board()} )
+        response.vary.add("Accept")
+        return response, 200 # status code: 200 Ok
+
+    def state_response(game_id):
+        """
+        Returns the state of a game as JSON response. If the query contains
+        `after=<version>`, wait until the game's version differs from it.
+        """
+        session = registry.get(game_id)
+        if session is None:
+            return jsonify({"Error": f"Game '{game_id}' not found."}), 404
+        after = request.args.get("after", type=int)
+        if after is None:
+            version, state = session.get_versioned_state()
+        else:
+            timeout = min(request.args.get("timeout", LONG_POLL_TIMEOUT, type=float), LONG_POLL_TIMEOUT)
+            version, state, _ = session.wait_for_change(after, timeout)
+        return jsonify({"game_state": state.value, "version": version}), 200  # status code: 200 Ok
+
+    def snapshot_response(game_id):
+        """
+        Returns board, state and version of a game as JSON response, tagged with an ETag.
+        A request whose If-None-Match matches the current version gets a 304 without body.
+        """
+        session = registry.get(game_id)
+        if session is None:
+            return jsonify({"Error": f"Game '{game_id}' not found."}), 404
+        version, state, board = session.get_snapshot()
+        binary = wants_binary()
+        # both encodings of a version are different representations with their own tag
+        etag = f"{session.epoch}-{version}" + ("-b" if binary else "")
+        if request.if_none_match.contains(etag):
+            response = Response(status=304) # status code: 304 Not Modified
+        elif binary:
+            response = Response(encode_snapshot(board, state, version), mimetype=BINARY_MEDIA_TYPE)
+        else:
+            response = jsonify({"board": board, "game_state": state.value, "version": version})
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        response.vary.add("Accept")
+        return response
 
-    def reset_board(): 
+    def moves_response(game_id):
         """
-        Resets the game board by creating a new GameLogic instance.
-        This function is called automatically after a game ends.
+        Returns the moves of a game after the first `since` moves as JSON response.
+        If `game` doesn't name the current game (it was reset), all moves are returned.
         """
-        global game
-        print("Reset Game")
-        game = GameLogic() #reset board
-    
+        session = registry.get(game_id)
+        if session is None:
+            return jsonify({"Error": f"Game '{game_id}' not found."}), 404
+        game, since, moves, version, state = session.get_moves(request.args.get("since", 0, type=int),
+                                                              request.args.get("game"))
+        return jsonify({"game": game, "since": since, "game_state": state.value, "version": version,
+                        "rows": session.size[0], "cols": session.size[1],
+                        "moves": [{"player_id": player, "column": column} for player, column in moves]}), 200
+
+    def stream_response(game_id):
+        """Streams board and state of a game as Server-Sent Events after every change."""
+        session = registry.get(game_id)
+        if session is None:
+            return jsonify({"Error": f"Game '{game_id}' not found."}), 404
+
+        def events():
+            version = None
+            while True:
+                new_version, state, board = session.wait_for_change(version, LONG_POLL_TIMEOUT)
+                if new_version == version:
+                    yield ": keep-alive\n\n" # nothing changed, keeps proxies from closing the stream
+                    continue
+                version = new_version
+                data = json.dumps({"version": version, "game_state": state.value, "board": board})
+                yield f"id: {version}\nevent: state\ndata: {data}\n\n"
+
+        return Response(events(), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache"})
+
+    def drop_response(game_id):
+        """Drops a token into a game and returns the drop state as JSON response."""
+        session = registry.get(game_id)
+        if session is None:
+            return jsonify({"Error": f"Game '{game_id}' not found."}), 404
+        request_dict = request.json
+        if ("player_id" in request_dict and "column" in request_dict):
+            drop_state = session.drop_token(request_dict["player_id"],request_dict["column"])
+            return jsonify({"drop_state": drop_state.value}), 200 # status code: 200 Ok
+        else:
+            return jsonify({"Error": "Fields 'player_id' and/or 'column' missing in request body."}), 400
+
     @app.route('/api/board', methods=['GET'])
     def get_board():
         """
@@ -85,6 +236,10 @@ if __name__ == "__main__":
                 ]
             }
             ```
+
+            **Binary encoding**: with `Accept: application/vnd.connect-four+binary` the board
+            is sent as 17 bytes: the bitboards of red and yellow (2 x uint64) and the number
+            of tokens (uint8), little-endian. See board_codec.py.
         responses:
             200:
                 description: The current game board
@@ -101,13 +256,7 @@ if __name__ == "__main__":
                                     type: string
                                     description: A token in the game, represented by one of 'X', 'O', ' '
         """
-        # print(f"GET /api/board received from {request.remote_addr}")
-        # working implementation for GET /api/board
-        # get the board from the local GameLogic object
-        board = game.get_board()
-
-        # return board to the caller via JSON response
-        return jsonify( {"board": board} ), 200 # status code: 200 Ok
+        return board_response(DEFAULT_GAME_ID)
 
     @app.route('/api/state', methods=['GET'])
     def get_state():
@@ -117,40 +266,198 @@ if __name__ == "__main__":
         tags:
            - Getting information about the current game 
         description: |
-            The response is a dictionary with a single entry:
-            - `state`: An integer number indicating the current state of the game. Possible values are:
+            The response is a dictionary with two entries:
+            - `game_state`: An integer number indicating the current state of the game. Possible values are:
                 - `0` (TURN_RED):    It's Red's turn to play.
                 - `1` (TURN_YELLOW): It's Yellow's turn to play.
                 - `2` (WON_RED):     Red has won the game.
                 - `3` (WON_YELLOW):  Yellow has won the game.
                 - `4` (DRAW):        The game ends in a draw.
+            - `version`: A number that changes with every drop and every reset of the game.
+
+            **Long poll**: pass the last known version as `after` and the request only
+            returns when the version differs, or after `timeout` seconds (at most 30).
 
             *Example*:
             ```json
-            { "state": 1 }
+            { "game_state": 1, "version": 7 }
             ```
+        parameters:
+            - in: query
+              name: after
+              type: integer
+              required: false
+              description: Wait until the game's version differs from this one.
+            - in: query
+              name: timeout
+              type: number
+              required: false
+              description: Longest time to wait in seconds (default and maximum 30).
         responses:
             200:
                 description: The current game state
                 schema:
                     type: object
                     properties:
-                        state:
+                        game_state:
                             type: integer
                             description: The current state of the game, represented as integer number [0..4]
                             example: 1
+                        version:
+                            type: integer
+                            description: Version of the game, changes with every drop and reset
+                            example: 7
         """
-        global Reset_timer #not really reentrent but it works
-        state = game.get_state()
-        #if GameState is a finished condition then start a timer to reset the game
-        with Reset_timer_lock: # Due to multithreadting and if multiple requests happen exactly make a threading lock so it does not start 2 timers.
-        # print(f"GET /api/state received from {request.remote_addr}")
-            if (state in [GameState.WON_YELLOW, GameState.WON_RED, GameState.DRAW]) and (Reset_timer.is_alive()==False):
-                # Start the timer
-                # Set the timer to call reset_board after 10 seconds.
-                Reset_timer = threading.Timer(10.0, reset_board)
-                Reset_timer.start()
-        return jsonify({"game_state": state.value}), 200  # status code: 200 Ok
+        return state_response(DEFAULT_GAME_ID)
+
+    @app.route('/api/snapshot', methods=['GET'])
+    def get_snapshot():
+        """
+        Get board, state and version of the game in one request.
+        ---
+        tags:
+           - Getting information about the current game 
+        description: |
+            The response combines `GET /api/board` and `GET /api/state`:
+            - `board`: The 6x7 game board, see `GET /api/board`.
+            - `game_state`: The state of the game [0..4], see `GET /api/state`.
+            - `version`: A number that increases with every drop and every reset of the game.
+
+            With `Accept: application/vnd.connect-four+binary` the snapshot is sent as 22 bytes:
+            the board in its binary encoding (see `GET /api/board`), the state (uint8) and
+            the version (uint32).
+
+            The response carries an `ETag` header. Send it back as `If-None-Match` and the
+            server answers `304 Not Modified` without a body as long as the game didn't change.
+
+            *Example*:
+            ```json
+            { "board": [[" ", ...], ...], "game_state": 1, "version": 7 }
+            ```
+        parameters:
+            - in: header
+              name: If-None-Match
+              type: string
+              required: false
+              description: The ETag of the last snapshot the client has.
+        responses:
+            200:
+                description: The current board, state and version
+                schema:
+                    type: object
+                    properties:
+                        board:
+                            type: array
+                            description: The game board, represented as a list of 6 rows.
+                            items:
+                                type: array
+                                items:
+                                    type: string
+                        game_state:
+                            type: integer
+                            description: The current state of the game, represented as integer number [0..4]
+                            example: 1
+                        version:
+                            type: integer
+                            description: Version of the game, changes with every drop and reset
+                            example: 7
+            304:
+                description: The game did not change since the snapshot with the given ETag.
+        """
+        return snapshot_response(DEFAULT_GAME_ID)
+
+    @app.route('/api/moves', methods=['GET'])
+    def get_moves():
+        """
+        Get the moves made since the client's last sync.
+        ---
+        tags:
+           - Getting information about the current game 
+        description: |
+            Every drop of the current game is kept in an append-only list. The response
+            contains only the moves after the first `since` moves:
+            - `game`: Identifies the current game. Send it back as `game`; when the game
+              was reset in between, it changes and all moves of the new game are returned.
+            - `since`: The number of moves left out (0 if the game changed).
+            - `moves`: The new moves, oldest first. Dropping them onto the board after the
+              first `since` moves yields the current board.
+            - `game_state`, `version`: See `GET /api/state`.
+            - `rows`, `cols`: The size of the board.
+
+            *Example*:
+            ```json
+            { "game": "3f2b9c0d-0", "since": 4, "game_state": 0, "version": 6, "rows": 6, "cols": 7,
+              "moves": [ {"player_id": "X", "column": 3}, {"player_id": "0", "column": 2} ] }
+            ```
+        parameters:
+            - in: query
+              name: since
+              type: integer
+              required: false
+              description: Number of moves the client already has (default 0).
+            - in: query
+              name: game
+              type: string
+              required: false
+              description: The `game` of the client's last sync.
+        responses:
+            200:
+                description: The new moves
+                schema:
+                    type: object
+                    properties:
+                        game:
+                            type: string
+                            description: Identifier of the current game
+                        since:
+                            type: integer
+                            description: Number of moves left out
+                        moves:
+                            type: array
+                            items:
+                                type: object
+                                properties:
+                                    player_id:
+                                        type: string
+                                        example: 'X'
+                                    column:
+                                        type: integer
+                                        example: 3
+                        game_state:
+                            type: integer
+                            example: 1
+                        version:
+                            type: integer
+                            example: 7
+                        rows:
+                            type: integer
+                            example: 6
+                        cols:
+                            type: integer
+                            example: 7
+        """
+        return moves_response(DEFAULT_GAME_ID)
+
+    @app.route('/api/stream', methods=['GET'])
+    def stream():
+        """
+        Stream board and state changes as Server-Sent Events.
+        ---
+        tags:
+           - Getting information about the current game 
+        description: |
+            An endless `text/event-stream` response. The current board and state are sent
+            immediately, then again after every drop and reset:
+            ```
+            id: 7
+            event: state
+            data: {"version": 7, "game_state": 1, "board": [[" ", ...], ...]}
+            ```
+        responses:
+            200:
+                description: The event stream
+        """
+        return stream_response(DEFAULT_GAME_ID)
 
     @app.route('/api/drop', methods=['POST'])
     def drop_token():
@@ -215,22 +522,309 @@ if __name__ == "__main__":
                             description: Textual desription of the error.
                             example: Fields 'player_id' and/or 'column' missing in request body.
         """
-        # IMPLEMENT POST /api/drop HERE!
-        request_dict = request.json
-        print("------------------")
-        print(request_dict)
-        print("------------------")
-        # print(f"GET /api/state received from {request.remote_addr}")
-        if ("player_id" in request_dict and "column" in request_dict):
-            DropState = game.drop_token(request_dict["player_id"],request_dict["column"])
-            return jsonify({"drop_state": DropState.value}), 200 # status code: 200 Ok
-        else:
-            return jsonify(), 400 #Fields 'player_id' and/or 'column' missing in request body.
+        return drop_response(DEFAULT_GAME_ID)
+
+    @app.route('/api/games', methods=['POST'])
+    def create_game():
+        """
+        Create a new game.
+        ---
+        tags:
+           - Managing games
+        description: |
+            Creates a new game next to the default game. Use the returned id with the
+            `/api/games/<game_id>/...` routes. A finished game is reset after 10 seconds,
+            a game without requests for 10 minutes is removed.
+
+            *Example*:
+            ```json
+            { "game_id": "3f2b9c0d5e8a4f1b9c7d6e5a4b3c2d1e" }
+            ```
+        responses:
+            201:
+                description: The id of the new game
+                schema:
+                    type: object
+                    properties:
+                        game_id:
+                            type: string
+                            description: Identifier of the new game
+        """
+        session = registry.create()
+        return jsonify({"game_id": session.game_id}), 201 # status code: 201 Created
 
-    
+    @app.route('/api/games/<game_id>/board', methods=['GET'])
+    def get_game_board(game_id):
+        """
+        Get the board of a specific game. Same response as `GET /api/board`.
+        ---
+        tags:
+           - Managing games
+        parameters:
+            - in: path
+              name: game_id
+              type: string
+              required: true
+        responses:
+            200:
+                description: The current game board
+            404:
+                description: There is no game with this id.
+        """
+        return board_response(game_id)
+
+    @app.route('/api/games/<game_id>/state', methods=['GET'])
+    def get_game_state(game_id):
+        """
+        Get the state of a specific game. Same response and long poll as `GET /api/state`.
+        ---
+        tags:
+           - Managing games
+        parameters:
+            - in: path
+              name: game_id
+              type: string
+              required: true
+            - in: query
+              name: after
+              type: integer
+              required: false
+            - in: query
+              name: timeout
+              type: number
+              required: false
+        responses:
+            200:
+                description: The current game state
+            404:
+                description: There is no game with this id.
+        """
+        return state_response(game_id)
+
+    @app.route('/api/games/<game_id>/snapshot', methods=['GET'])
+    def get_game_snapshot(game_id):
+        """
+        Get board, state and version of a specific game. Same response as `GET /api/snapshot`.
+        ---
+        tags:
+           - Managing games
+        parameters:
+            - in: path
+              name: game_id
+              type: string
+              required: true
+            - in: header
+              name: If-None-Match
+              type: string
+              required: false
+        responses:
+            200:
+                description: The current board, state and version
+            304:
+                description: The game did not change since the snapshot with the given ETag.
+            404:
+                description: There is no game with this id.
+        """
+        return snapshot_response(game_id)
+
+    @app.route('/api/games/<game_id>/moves', methods=['GET'])
+    def get_game_moves(game_id):
+        """
+        Get the new moves of a specific game. Same response as `GET /api/moves`.
+        ---
+        tags:
+           - Managing games
+        parameters:
+            - in: path
+              name: game_id
+              type: string
+              required: true
+            - in: query
+              name: since
+              type: integer
+              required: false
+            - in: query
+              name: game
+              type: string
+              required: false
+        responses:
+            200:
+                description: The new moves
+            404:
+                description: There is no game with this id.
+        """
+        return moves_response(game_id)
+
+    @app.route('/api/games/<game_id>/stream', methods=['GET'])
+    def stream_game(game_id):
+        """
+        Stream board and state changes of a specific game. Same events as `GET /api/stream`.
+        ---
+        tags:
+           - Managing games
+        parameters:
+            - in: path
+              name: game_id
+              type: string
+              required: true
+        responses:
+            200:
+                description: The event stream
+            404:
+                description: There is no game with this id.
+        """
+        return stream_response(game_id)
+
+    @app.route('/api/games/<game_id>/drop', methods=['POST'])
+    def drop_game_token(game_id):
+        """
+        Drop a token into a specific game. Same request and response as `POST /api/drop`.
+        ---
+        tags:
+           - Managing games
+        parameters:
+            - in: path
+              name: game_id
+              type: string
+              required: true
+            - in: body
+              name: body
+              required: true
+              schema:
+                type: object
+                properties:
+                    player_id:
+                        type: string
+                        example: 'X'
+                    column:
+                        type: integer
+                        example: 3
+        responses:
+            200:
+                description: The drop state
+            400:
+                description: Fields 'player_id' and/or 'column' missing in request body.
+            404:
+                description: There is no game with this id.
+        """
+        return drop_response(game_id)
+
+    @app.route('/metrics', methods=['GET'])
+    def get_metrics():
+        """
+        Get the metrics of the server.
+        ---
+        tags:
+           - Monitoring
+        description: |
+            Returns the metrics in the Prometheus text exposition format:
+
+            - `requests_total{route,method,status}`: Handled requests
+            - `request_duration_seconds{route}`: Histogram of the time to handle a request
+              (long polls include their waiting time)
+            - `lock_wait_seconds{lock}`: Histogram of the time spent waiting for the
+              registry lock and the locks of the games, counting only acquisitions that
+              found the lock held
+            - `games`, `games_finished`: Number of games, finished games waiting for their reset
+            - `profiler_enabled`: 1 while the sampling profiler runs
+        produces:
+            - text/plain
+        responses:
+            200:
+                description: The metrics
+        """
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    @app.route('/metrics/profiler', methods=['GET'])
+    def get_profile():
+        """
+        Get the stacks sampled by the profiler.
+        ---
+        tags:
+           - Monitoring
+        description: |
+            Returns the sampled stacks of all server threads in the folded stacks format,
+            one `frame;frame;frame count` line per stack, most frequent first. Flame graph
+            tools read this format directly.
+        parameters:
+            - in: query
+              name: limit
+              type: integer
+              required: false
+              description: Number of stacks returned, all if missing
+        produces:
+            - text/plain
+        responses:
+            200:
+                description: The folded stacks
+        """
+        limit = request.args.get("limit", type=int)
+        return Response(profiler.folded(limit), mimetype="text/plain",
+                        headers={"X-Profiler-Samples": str(profiler.samples)})
+
+    @app.route('/metrics/profiler', methods=['POST'])
+    def toggle_profiler():
+        """
+        Switch the sampling profiler on or off.
+        ---
+        tags:
+           - Monitoring
+        description: |
+            The profiler is off when the server starts. While it runs it samples the stacks
+            of all threads, which costs a few percent of CPU.
+
+            *Example*:
+            ```json
+            { "enabled": true, "interval": 0.005, "reset": true }
+            ```
+        parameters:
+            - in: body
+              name: body
+              required: true
+              schema:
+                type: object
+                properties:
+                    enabled:
+                        type: boolean
+                        description: Start or stop the profiler
+                    interval:
+                        type: number
+                        description: Seconds between two samples
+                    reset:
+                        type: boolean
+                        description: Drop the samples taken so far
+        responses:
+            200:
+                description: The state of the profiler
+                schema:
+                    type: object
+                    properties:
+                        enabled:
+                            type: boolean
+                        samples:
+                            type: integer
+            400:
+                description: Field 'enabled' is not a boolean or 'interval' is not a positive number.
+        """
+        data = request.get_json(silent=True) or {}
+        enabled = data.get("enabled", profiler.enabled)
+        interval = data.get("interval")
+        if not isinstance(enabled, bool) or (interval is not None and (
+                isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval <= 0)):
+            return jsonify({"Error": "Field 'enabled' is not a boolean or 'interval' is not a positive number."}), 400
+        if data.get("reset"):
+            profiler.reset()
+        if enabled:
+            profiler.start(interval)
+        else:
+            profiler.stop()
+        return jsonify({"enabled": profiler.enabled, "samples": profiler.samples})
 
 
     # starting the server on all interfaces
     print("Game server start")
-    app.run(host="0.0.0.0", debug=True)
+    # no reloader: its second process would open the game store a second time
+    app.run(host="0.0.0.0", debug=True, use_reloader=False)
+    profiler.stop()
+    registry.stop()
     print("Game server exit")
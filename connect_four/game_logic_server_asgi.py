@@ -0,0 +1,327 @@
+from game_logic import GameLogic
+from game_registry import DEFAULT_GAME_ID, LONG_POLL_TIMEOUT, GAME_LOGICS
+from game_registry_async import AsyncGameRegistry
+from game_store import SqliteGameStore
+from board_codec import BINARY_MEDIA_TYPE, encode_board, encode_snapshot
+from urllib.parse import parse_qs
+import argparse
+import asyncio
+import json
+import os
+
+"""
+Connect Four Game Server, asyncio (ASGI) implementation
+
+Serves the same API as game_logic_server.py:
+- GET /api/board: Returns the current state of the game board
+- GET /api/state: Returns the current game state, `?after=<version>` waits for a change (long poll)
+- GET /api/snapshot: Returns board, state and version, `If-None-Match` gets a 304 while unchanged
+- GET /api/moves?since=<n>: Returns only the moves after the first n moves
+- GET /api/stream: Server-Sent Events stream pushing board and state after every change
+- POST /api/drop: Handles player moves by dropping tokens in specified columns
+- POST /api/games: Creates a new game and returns its id
+- GET /api/games/<game_id>/board|state|snapshot|moves|stream, POST /api/games/<game_id>/drop:
+  The same as above for a specific game
+
+The Flask development server uses one thread per request, so every waiting
+long poll or open event stream holds a thread. Here all requests are
+coroutines on one event loop and a waiting request is only a suspended
+coroutine, so a single process can hold thousands of idle connections.
+The application is a plain ASGI callable without framework. Board and
+snapshot are negotiated between JSON and the binary encoding of board_codec.
+
+Usage:
+    python3 game_logic_server_asgi.py --port 5000 [--logic bitboard]
+    or with any ASGI server: uvicorn game_logic_server_asgi:app --host 0.0.0.0 --port 5000
+    The server has to run the ASGI lifespan protocol, which creates the game
+    registry and opens the store (uvicorn does by default).
+
+    Compare with the Flask server: see benchmark_server.py
+
+Dependencies:
+    - uvicorn (only to run the server from this file)
+    - GameLogic, AsyncGameRegistry and SqliteGameStore from local modules
+"""
+
+# a database of its own, so both servers can run side by side
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'games_asgi.db')
+
+registry = None # created at server startup (lifespan), so importing the module opens no database
+game_logic = GameLogic # the game logic of the registry, see game_registry.GAME_LOGICS
+
+
+async def read_body(receive) -> bytes:
+    """
+    Read the complete request body.
+    """
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+
+async def send_json(send, payload: dict, status: int = 200, headers: list = None) -> None:
+    """
+    Send a complete JSON response.
+    """
+    body = json.dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+                   + (headers or []),
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def header_value(scope, name: bytes) -> str:
+    """
+    Returns a request header, an empty string if it is missing.
+    """
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin-1')
+    return ''
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Returns True if an If-None-Match header contains the (unquoted) etag.
+    """
+    tags = [tag.strip().removeprefix('W/').strip('"') for tag in if_none_match.split(',')]
+    return etag in tags or '*' in tags
+
+
+def wants_binary(scope) -> bool:
+    """
+    True if the Accept header ranks the binary encoding at least as high as JSON.
+    """
+    quality = {}
+    for entry in header_value(scope, b'accept').split(','):
+        media_type, *parameters = [part.strip() for part in entry.split(';')]
+        q = 1.0
+        for parameter in parameters:
+            if parameter.startswith('q='):
+                try:
+                    q = float(parameter[2:])
+                except ValueError:
+                    pass
+        quality[media_type] = q
+    binary = quality.get(BINARY_MEDIA_TYPE, 0.0)
+    json_quality = max(quality.get('application/json', 0.0), quality.get('application/*', 0.0),
+                       quality.get('*/*', 0.0))
+    return binary > 0 and binary >= json_quality
+
+
+async def send_binary(send, body: bytes, headers: list = None) -> None:
+    """
+    Send a complete response in the binary encoding.
+    """
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', BINARY_MEDIA_TYPE.encode()), (b'content-length', str(len(body)).encode()),
+                    (b'vary', b'Accept')] + (headers or []),
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def query_value(query: dict, name: str, convert, default=None):
+    """
+    Returns a converted query parameter, default if it is missing or invalid.
+    """
+    try:
+        return convert(query[name][0])
+    except (KeyError, ValueError):
+        return default
+
+
+async def board_response(session, scope, send) -> None:
+    """Sends the board of a game as JSON or binary."""
+    if wants_binary(scope):
+        await send_binary(send, encode_board(session.get_board()))
+    else:
+        await send_json(send, {"board": session.get_board()}, headers=[(b'vary', b'Accept')])
+
+
+async def state_response(session, query: dict, send) -> None:
+    """
+    Sends the state of a game. If the query contains `after=<version>`,
+    wait until the game's version differs from it.
+    """
+    after = query_value(query, "after", int)
+    if after is None:
+        version, state = session.get_versioned_state()
+    else:
+        timeout = min(query_value(query, "timeout", float, LONG_POLL_TIMEOUT), LONG_POLL_TIMEOUT)
+        version, state, _ = await session.wait_for_change(after, timeout)
+    await send_json(send, {"game_state": state.value, "version": version})
+
+
+async def snapshot_response(session, scope, send) -> None:
+    """
+    Sends board, state and version of a game, tagged with an ETag.
+    A request whose If-None-Match matches the current version gets a 304 without body.
+    """
+    version, state, board = session.get_snapshot()
+    binary = wants_binary(scope)
+    # both encodings of a version are different representations with their own tag
+    etag = f"{session.epoch}-{version}" + ("-b" if binary else "")
+    headers = [(b'etag', f'"{etag}"'.encode()), (b'cache-control', b'no-cache')]
+    if etag_matches(header_value(scope, b'if-none-match'), etag):
+        await send({'type': 'http.response.start', 'status': 304, # status code: 304 Not Modified
+                    'headers': headers + [(b'vary', b'Accept')]})
+        await send({'type': 'http.response.body', 'body': b''})
+    elif binary:
+        await send_binary(send, encode_snapshot(board, state, version), headers=headers)
+    else:
+        await send_json(send, {"board": board, "game_state": state.value, "version": version},
+                        headers=headers + [(b'vary', b'Accept')])
+
+
+async def moves_response(session, query: dict, send) -> None:
+    """
+    Sends the moves of a game after the first `since` moves.
+    If `game` doesn't name the current game (it was reset), all moves are sent.
+    """
+    game, since, moves, version, state = session.get_moves(query_value(query, "since", int, 0),
+                                                          query_value(query, "game", str))
+    await send_json(send, {"game": game, "since": since, "game_state": state.value, "version": version,
+                           "rows": session.size[0], "cols": session.size[1],
+                           "moves": [{"player_id": player, "column": column} for player, column in moves]})
+
+
+async def stream_response(session, receive, send) -> None:
+    """Streams board and state of a game as Server-Sent Events until the client disconnects."""
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache')],
+    })
+
+    async def disconnected():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    disconnect = asyncio.ensure_future(disconnected())
+    version = None
+    try:
+        while True:
+            change = asyncio.ensure_future(session.wait_for_change(version, LONG_POLL_TIMEOUT))
+            await asyncio.wait([change, disconnect], return_when=asyncio.FIRST_COMPLETED)
+            if disconnect.done():
+                change.cancel()
+                return
+            new_version, state, board = change.result()
+            if new_version == version:
+                event = ": keep-alive\n\n" # nothing changed, keeps proxies from closing the stream
+            else:
+                version = new_version
+                data = json.dumps({"version": version, "game_state": state.value, "board": board})
+                event = f"id: {version}\nevent: state\ndata: {data}\n\n"
+            await send({'type': 'http.response.body', 'body': event.encode(), 'more_body': True})
+    finally:
+        disconnect.cancel()
+
+
+async def drop_response(session, receive, send) -> None:
+    """Drops a token into a game and sends the drop state."""
+    try:
+        request_dict = json.loads(await read_body(receive))
+    except ValueError:
+        request_dict = None
+    if isinstance(request_dict, dict) and "player_id" in request_dict and "column" in request_dict:
+        drop_state = await session.drop_token(request_dict["player_id"], request_dict["column"])
+        await send_json(send, {"drop_state": drop_state.value})
+    else:
+        await send_json(send, {"Error": "Fields 'player_id' and/or 'column' missing in request body."}, 400)
+
+
+async def lifespan(receive, send) -> None:
+    """Creates the registry and its store with the server and closes them on shutdown."""
+    global registry
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                # games are restored from STORE_PATH
+                registry = AsyncGameRegistry(game_logic, store=SqliteGameStore(STORE_PATH))
+            except Exception as error:
+                await send({'type': 'lifespan.startup.failed', 'message': str(error)})
+                return
+            registry.start() # finished games are reset after 10s, idle games removed
+            print("Game server start")
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if registry is not None:
+                await registry.stop() # also closes the store
+                registry = None
+            print("Game server exit")
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    """
+    The ASGI application.
+    """
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    method = scope['method']
+    parts = scope['path'].strip('/').split('/')
+    query = parse_qs(scope.get('query_string', b'').decode())
+
+    # /api/<action> or /api/games/<game_id>/<action>
+    if parts == ['api', 'games'] and method == 'POST':
+        session = registry.create()
+        await send_json(send, {"game_id": session.game_id}, 201) # status code: 201 Created
+        return
+    if len(parts) == 2 and parts[0] == 'api':
+        game_id, action = DEFAULT_GAME_ID, parts[1]
+    elif len(parts) == 4 and parts[:2] == ['api', 'games']:
+        game_id, action = parts[2], parts[3]
+    else:
+        await send_json(send, {"Error": "Not found."}, 404)
+        return
+
+    routes = {('GET', 'board'), ('GET', 'state'), ('GET', 'snapshot'), ('GET', 'moves'), ('GET', 'stream'),
+              ('POST', 'drop')}
+    if (method, action) not in routes:
+        status = 405 if action in {route[1] for route in routes} else 404
+        await send_json(send, {"Error": "Not found." if status == 404 else "Method not allowed."}, status)
+        return
+
+    session = registry.get(game_id)
+    if session is None:
+        await send_json(send, {"Error": f"Game '{game_id}' not found."}, 404)
+    elif action == 'board':
+        await board_response(session, scope, send)
+    elif action == 'state':
+        await state_response(session, query, send)
+    elif action == 'snapshot':
+        await snapshot_response(session, scope, send)
+    elif action == 'moves':
+        await moves_response(session, query, send)
+    elif action == 'stream':
+        await stream_response(session, receive, send)
+    else:
+        await drop_response(session, receive, send)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Connect Four game server (asyncio)")
+    parser.add_argument('--host', default="0.0.0.0", help="interface to listen on")
+    parser.add_argument('--port', type=int, default=5000, help="port to listen on")
+    parser.add_argument('--logic', default='list', choices=sorted(GAME_LOGICS), help="game logic implementation")
+    args = parser.parse_args()
+    game_logic = GAME_LOGICS[args.logic]
+
+    # starting the server on all interfaces
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
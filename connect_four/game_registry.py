@@ -0,0 +1,307 @@
+from game_logic import GameLogic
+from game_logic_bitboard import GameLogicBitboard
+from game_state import GameState
+from drop_state import DropState
+from game_token import GameToken
+from game_store import GameStore
+import threading
+import time
+import uuid
+
+"""
+In-memory registry of running games for the game server
+
+Every game lives in a GameSession with its own lock, so requests for
+different games never wait for each other. A single sweeper thread replaces
+the per-game reset timers: it resets games RESET_DELAY seconds after they
+finished and removes games nobody asked about for IDLE_TIMEOUT seconds.
+
+With a GameStore (see game_store) every change is reported to the store and
+the registry is rebuilt from it on startup, so games survive a restart.
+
+The game logic is chosen with the game factory; GAME_LOGICS names the
+implementations the servers can run (their --logic option).
+
+Classes:
+    GameSession: A single game and its bookkeeping
+    GameRegistry: Thread-safe collection of sessions with scheduled expiry
+"""
+
+DEFAULT_GAME_ID = 'default'  # the game behind the legacy single-game routes
+RESET_DELAY = 10.0           # seconds a finished game is kept before it is reset
+LONG_POLL_TIMEOUT = 30.0     # longest time a request may wait for a change
+IDLE_TIMEOUT = 600.0         # seconds without requests before a game is removed
+SWEEP_INTERVAL = 1.0         # seconds between two sweeps
+GAME_LOGICS = {'list': GameLogic, 'bitboard': GameLogicBitboard} # game logics by name, 'list' is the default
+
+
+def starting_player(game) -> GameToken:
+    """
+    Returns the token moving first in a game without moves.
+    """
+    return GameToken.RED if game.get_state() == GameState.TURN_RED else GameToken.YELLOW
+
+
+def restore_game(game_factory, starter: GameToken, moves: list):
+    """
+    Rebuild a game from its starting player and moves.
+
+    Args:
+        game_factory (callable): Creates a new GameLogicBase instance, called with the starter
+        starter (GameToken): The token moving first
+        moves (list): (player, column) of every move
+    """
+    game = game_factory(starter)
+    for player, column in moves:
+        game.drop_token(player, column)
+    return game
+
+
+def is_finished(game) -> bool:
+    return game.get_state() in [GameState.WON_RED, GameState.WON_YELLOW, GameState.DRAW]
+
+
+class GameSession:
+    """
+    A single game with its own lock.
+
+    Attributes:
+        game_id (str): Identifier of the game
+        game (GameLogic): The game logic instance
+        lock (threading.Lock): Serializes all access to game
+        changed (threading.Condition): Notified whenever version changes
+        version (int): Incremented by every successful drop and every reset
+        epoch (str): Random id of this session, so versions of different server runs never match
+        round (int): Number of resets, identifies the current game together with epoch
+        last_access (float): time.monotonic() of the last request
+        finished_at (float | None): time.monotonic() when the game was won or drawn
+        size (tuple): (rows, columns) of the board
+    """
+    def __init__(self, game_id: str, game_factory, store: GameStore = None, restore: tuple = None,
+                 lock_factory=None):
+        """
+        Args:
+            game_id (str): Identifier of the game
+            game_factory (callable): Creates a new GameLogicBase instance
+            store (GameStore): Receives every change of the game
+            restore (tuple): (starter, moves) of a stored game to continue, None for a new game
+            lock_factory (callable): lock_factory(name) creates the lock, threading.Lock if None
+        """
+        self.game_id = game_id
+        self._game_factory = game_factory
+        self._store = store if store is not None else GameStore()
+        if restore is None:
+            self.game = game_factory()
+            self._store.append(('create', game_id, starting_player(self.game), None))
+        else:
+            self.game = restore_game(game_factory, *restore)
+        self.lock = lock_factory("session") if lock_factory is not None else threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.version = 0
+        self.epoch = uuid.uuid4().hex[:8]
+        self.round = 0
+        self.last_access = time.monotonic()
+        self.finished_at = time.monotonic() if is_finished(self.game) else None
+        board = self.game.get_board()
+        self.size = (len(board), len(board[0]))
+
+    def get_board(self) -> list:
+        """
+        Returns the board of the game.
+        """
+        with self.lock:
+            self.last_access = time.monotonic()
+            return self.game.get_board()
+
+    def get_state(self) -> GameState:
+        """
+        Returns the state of the game.
+        """
+        with self.lock:
+            self.last_access = time.monotonic()
+            return self.game.get_state()
+
+    def drop_token(self, player: GameToken, column: int) -> DropState:
+        """
+        Drop a token and remember when the game is over.
+        """
+        with self.lock:
+            self.last_access = time.monotonic()
+            drop_state = self.game.drop_token(player, column)
+            if drop_state == DropState.DROP_OK:
+                self._store.append(('drop', self.game_id, player, column))
+                if self.finished_at is None and is_finished(self.game):
+                    self.finished_at = time.monotonic()
+                self.version += 1
+                self.changed.notify_all()
+            return drop_state
+
+    def get_versioned_state(self) -> tuple:
+        """
+        Returns (version, state) of the game, read atomically.
+        """
+        with self.lock:
+            self.last_access = time.monotonic()
+            return self.version, self.game.get_state()
+
+    def get_snapshot(self) -> tuple:
+        """
+        Returns (version, state, board) of the game, read atomically.
+        """
+        with self.lock:
+            self.last_access = time.monotonic()
+            return self.version, self.game.get_state(), self.game.get_board()
+
+    def get_moves(self, since: int, game: str = None) -> tuple:
+        """
+        Returns the moves after the first `since` moves of the current game.
+
+        Args:
+            since (int): Number of moves the caller already knows
+            game (str): The game the caller's moves belong to; if it is not the current
+                game (reset, server restart), all moves are returned
+
+        Returns:
+            tuple: (game, since, moves, version, state) with game identifying the current game
+                and since the number of moves left out
+        """
+        with self.lock:
+            self.last_access = time.monotonic()
+            current = f"{self.epoch}-{self.round}"
+            if game != current:
+                since = 0
+            since = max(0, since)
+            return current, since, self.game.get_moves(since), self.version, self.game.get_state()
+
+    def wait_for_change(self, after: int, timeout: float = LONG_POLL_TIMEOUT) -> tuple:
+        """
+        Block until the version differs from after or the timeout expires.
+
+        Args:
+            after (int): The version the caller already knows
+            timeout (float): Longest time to wait in seconds
+
+        Returns:
+            tuple: (version, state, board) after the wait
+        """
+        with self.lock:
+            self.changed.wait_for(lambda: self.version != after, timeout)
+            self.last_access = time.monotonic()
+            return self.version, self.game.get_state(), self.game.get_board()
+
+    def reset(self) -> None:
+        """
+        Start a new game in this session.
+        """
+        with self.lock:
+            self.game = self._game_factory()
+            self._store.append(('reset', self.game_id, starting_player(self.game), None))
+            self.finished_at = None
+            self.round += 1
+            self.version += 1
+            self.changed.notify_all()
+
+
+class GameRegistry:
+    """
+    Thread-safe registry of game sessions.
+
+    Attributes:
+        _sessions (dict): Game id -> GameSession
+        _store (GameStore): Persists the games
+        _lock (threading.Lock): Protects _sessions
+        _stop (threading.Event): Set to end the sweeper thread
+        _sweeper (threading.Thread | None): The thread running sweep() periodically
+    """
+    def __init__(self, game_factory=GameLogic, reset_delay: float = RESET_DELAY,
+                 idle_timeout: float = IDLE_TIMEOUT, store: GameStore = None, lock_factory=None):
+        """
+        Args:
+            game_factory (callable): Creates a new GameLogicBase instance; called with the
+                starting player's token when a stored game is restored
+            reset_delay (float): Seconds before a finished game is reset
+            idle_timeout (float): Seconds without requests before a game is removed
+            store (GameStore): Persists the games; the registry starts with the stored games
+            lock_factory (callable): lock_factory(name) creates the locks of the registry ('registry')
+                and of the sessions ('session'), e.g. to measure lock contention; threading.Lock if None
+        """
+        self._game_factory = game_factory
+        self._reset_delay = reset_delay
+        self._idle_timeout = idle_timeout
+        self._store = store if store is not None else GameStore()
+        self._lock_factory = lock_factory
+        self._sessions = {game_id: GameSession(game_id, game_factory, self._store, restore, lock_factory)
+                          for game_id, restore in self._store.load().items()}
+        if DEFAULT_GAME_ID not in self._sessions:
+            self._sessions[DEFAULT_GAME_ID] = GameSession(DEFAULT_GAME_ID, game_factory, self._store,
+                                                          lock_factory=lock_factory)
+        self._lock = lock_factory("registry") if lock_factory is not None else threading.Lock()
+        self._stop = threading.Event()
+        self._sweeper = None
+
+    def create(self) -> GameSession:
+        """
+        Create a new game.
+
+        Returns:
+            GameSession: The session of the new game
+        """
+        session = GameSession(uuid.uuid4().hex, self._game_factory, self._store,
+                              lock_factory=self._lock_factory)
+        with self._lock:
+            self._sessions[session.game_id] = session
+        return session
+
+    def get(self, game_id: str):
+        """
+        Returns the session of a game, None if there is no such game.
+        """
+        with self._lock:
+            return self._sessions.get(game_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def count_finished(self) -> int:
+        """
+        Returns the number of games that are won or drawn and wait for their reset.
+        """
+        with self._lock:
+            return sum(1 for session in self._sessions.values() if session.finished_at is not None)
+
+    def sweep(self) -> None:
+        """
+        Reset games that finished RESET_DELAY ago and remove idle games.
+        The default game is reset but never removed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            if session.game_id != DEFAULT_GAME_ID and now - session.last_access > self._idle_timeout:
+                with self._lock:
+                    self._sessions.pop(session.game_id, None)
+                self._store.append(('remove', session.game_id, None, None))
+            elif session.finished_at is not None and now - session.finished_at > self._reset_delay:
+                print(f"Reset Game {session.game_id}")
+                session.reset()
+
+    def start(self, interval: float = SWEEP_INTERVAL) -> None:
+        """
+        Start the sweeper thread.
+        """
+        def run():
+            while not self._stop.wait(interval):
+                self.sweep()
+        self._sweeper = threading.Thread(target=run, name="GameRegistrySweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop(self) -> None:
+        """
+        Stop the sweeper thread and close the store.
+        """
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+        self._store.close()
@@ -0,0 +1,242 @@
+from game_logic import GameLogic
+from drop_state import DropState
+from game_token import GameToken
+from game_registry import DEFAULT_GAME_ID, RESET_DELAY, LONG_POLL_TIMEOUT, IDLE_TIMEOUT, SWEEP_INTERVAL
+from game_registry import starting_player, restore_game, is_finished
+from game_store import GameStore
+import asyncio
+import time
+import uuid
+
+"""
+asyncio registry of running games for the ASGI game server
+
+The counterpart of game_registry for an event loop. All methods run on the
+loop's thread, so the games need no locks; waiting for a change is an
+asyncio.Condition wait, which costs a suspended coroutine instead of a
+blocked thread. One process can therefore hold thousands of idle long polls
+and event streams. The sweeper is a task on the same loop. Games are
+persisted through a GameStore exactly like in game_registry; appending to
+the store never blocks the loop.
+
+Classes:
+    AsyncGameSession: A single game and its bookkeeping
+    AsyncGameRegistry: Collection of sessions with scheduled expiry
+"""
+
+
+class AsyncGameSession:
+    """
+    A single game, used from one event loop.
+
+    Attributes:
+        game_id (str): Identifier of the game
+        game (GameLogic): The game logic instance
+        changed (asyncio.Condition): Notified whenever version changes
+        version (int): Incremented by every successful drop and every reset
+        epoch (str): Random id of this session, so versions of different server runs never match
+        round (int): Number of resets, identifies the current game together with epoch
+        last_access (float): time.monotonic() of the last request
+        finished_at (float | None): time.monotonic() when the game was won or drawn
+        size (tuple): (rows, columns) of the board
+    """
+    def __init__(self, game_id: str, game_factory, store: GameStore = None, restore: tuple = None):
+        """
+        Args:
+            game_id (str): Identifier of the game
+            game_factory (callable): Creates a new GameLogicBase instance
+            store (GameStore): Receives every change of the game
+            restore (tuple): (starter, moves) of a stored game to continue, None for a new game
+        """
+        self.game_id = game_id
+        self._game_factory = game_factory
+        self._store = store if store is not None else GameStore()
+        if restore is None:
+            self.game = game_factory()
+            self._store.append(('create', game_id, starting_player(self.game), None))
+        else:
+            self.game = restore_game(game_factory, *restore)
+        self.changed = asyncio.Condition()
+        self.version = 0
+        self.epoch = uuid.uuid4().hex[:8]
+        self.round = 0
+        self.last_access = time.monotonic()
+        self.finished_at = time.monotonic() if is_finished(self.game) else None
+        board = self.game.get_board()
+        self.size = (len(board), len(board[0]))
+
+    def get_board(self) -> list:
+        """
+        Returns the board of the game.
+        """
+        self.last_access = time.monotonic()
+        return self.game.get_board()
+
+    def get_versioned_state(self) -> tuple:
+        """
+        Returns (version, state) of the game.
+        """
+        self.last_access = time.monotonic()
+        return self.version, self.game.get_state()
+
+    def get_snapshot(self) -> tuple:
+        """
+        Returns (version, state, board) of the game.
+        """
+        self.last_access = time.monotonic()
+        return self.version, self.game.get_state(), self.game.get_board()
+
+    def get_moves(self, since: int, game: str = None) -> tuple:
+        """
+        Returns the moves after the first `since` moves of the current game.
+
+        Args:
+            since (int): Number of moves the caller already knows
+            game (str): The game the caller's moves belong to; if it is not the current
+                game (reset, server restart), all moves are returned
+
+        Returns:
+            tuple: (game, since, moves, version, state) with game identifying the current game
+                and since the number of moves left out
+        """
+        self.last_access = time.monotonic()
+        current = f"{self.epoch}-{self.round}"
+        if game != current:
+            since = 0
+        since = max(0, since)
+        return current, since, self.game.get_moves(since), self.version, self.game.get_state()
+
+    async def drop_token(self, player: GameToken, column: int) -> DropState:
+        """
+        Drop a token, remember when the game is over and wake up the waiters.
+        """
+        self.last_access = time.monotonic()
+        drop_state = self.game.drop_token(player, column)
+        if drop_state == DropState.DROP_OK:
+            self._store.append(('drop', self.game_id, player, column))
+            if self.finished_at is None and is_finished(self.game):
+                self.finished_at = time.monotonic()
+            await self._notify()
+        return drop_state
+
+    async def wait_for_change(self, after: int, timeout: float = LONG_POLL_TIMEOUT) -> tuple:
+        """
+        Wait until the version differs from after or the timeout expires.
+
+        Args:
+            after (int): The version the caller already knows
+            timeout (float): Longest time to wait in seconds
+
+        Returns:
+            tuple: (version, state, board) after the wait
+        """
+        if self.version == after:
+            async with self.changed:
+                try:
+                    await asyncio.wait_for(self.changed.wait_for(lambda: self.version != after), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        self.last_access = time.monotonic()
+        return self.version, self.game.get_state(), self.game.get_board()
+
+    async def reset(self) -> None:
+        """
+        Start a new game in this session.
+        """
+        self.game = self._game_factory()
+        self._store.append(('reset', self.game_id, starting_player(self.game), None))
+        self.finished_at = None
+        self.round += 1
+        await self._notify()
+
+    async def _notify(self) -> None:
+        self.version += 1
+        async with self.changed:
+            self.changed.notify_all()
+
+
+class AsyncGameRegistry:
+    """
+    Registry of game sessions for one event loop.
+
+    Attributes:
+        _sessions (dict): Game id -> AsyncGameSession
+        _store (GameStore): Persists the games
+        _sweeper (asyncio.Task | None): The task running sweep() periodically
+    """
+    def __init__(self, game_factory=GameLogic, reset_delay: float = RESET_DELAY,
+                 idle_timeout: float = IDLE_TIMEOUT, store: GameStore = None):
+        """
+        Args:
+            game_factory (callable): Creates a new GameLogicBase instance; called with the
+                starting player's token when a stored game is restored
+            reset_delay (float): Seconds before a finished game is reset
+            idle_timeout (float): Seconds without requests before a game is removed
+            store (GameStore): Persists the games; the registry starts with the stored games
+        """
+        self._game_factory = game_factory
+        self._reset_delay = reset_delay
+        self._idle_timeout = idle_timeout
+        self._store = store if store is not None else GameStore()
+        self._sessions = {game_id: AsyncGameSession(game_id, game_factory, self._store, restore)
+                          for game_id, restore in self._store.load().items()}
+        if DEFAULT_GAME_ID not in self._sessions:
+            self._sessions[DEFAULT_GAME_ID] = AsyncGameSession(DEFAULT_GAME_ID, game_factory, self._store)
+        self._sweeper = None
+
+    def create(self) -> AsyncGameSession:
+        """
+        Create a new game.
+
+        Returns:
+            AsyncGameSession: The session of the new game
+        """
+        session = AsyncGameSession(uuid.uuid4().hex, self._game_factory, self._store)
+        self._sessions[session.game_id] = session
+        return session
+
+    def get(self, game_id: str):
+        """
+        Returns the session of a game, None if there is no such game.
+        """
+        return self._sessions.get(game_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def sweep(self) -> None:
+        """
+        Reset games that finished RESET_DELAY ago and remove idle games.
+        The default game is reset but never removed.
+        """
+        now = time.monotonic()
+        for session in list(self._sessions.values()):
+            if session.game_id != DEFAULT_GAME_ID and now - session.last_access > self._idle_timeout:
+                self._sessions.pop(session.game_id, None)
+                self._store.append(('remove', session.game_id, None, None))
+            elif session.finished_at is not None and now - session.finished_at > self._reset_delay:
+                print(f"Reset Game {session.game_id}")
+                await session.reset()
+
+    def start(self, interval: float = SWEEP_INTERVAL) -> None:
+        """
+        Start the sweeper task on the running event loop.
+        """
+        async def run():
+            while True:
+                await asyncio.sleep(interval)
+                await self.sweep()
+        self._sweeper = asyncio.get_running_loop().create_task(run())
+
+    async def stop(self) -> None:
+        """
+        Stop the sweeper task and close the store.
+        """
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        await asyncio.to_thread(self._store.close)
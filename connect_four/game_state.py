@@ -73,6 +73,44 @@ def check_win(board: list) -> GameState:
     # Game is still ongoing
     return GameState.TURN_RED #default open as red
 
+def check_win_at(board: list, row: int, col: int) -> GameState:
+    """
+    Checks only the four lines running through a single cell of the board.
+
+    Use this after a drop instead of check_win: a new line of four must contain
+    the token that was just dropped, so scanning the rest of the board is not
+    necessary.
+
+    Args:
+        board: A 2D list representing the game board where each cell contains a GameToken
+        row (int): Row index of the last dropped token
+        col (int): Column index of the last dropped token
+
+    Returns:
+        GameState: WON_RED or WON_YELLOW if the token completes a line of four,
+                   otherwise GameState.TURN_RED (default state)
+    """
+    token = board[row][col]
+    if token == GameToken.EMPTY:
+        return GameState.TURN_RED
+
+    rows = len(board)
+    cols = len(board[0])
+    # Horizontal, vertical, diagonal (negative slope), diagonal (positive slope)
+    for d_row, d_col in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+        count = 1
+        for sign in (1, -1):
+            r = row + sign * d_row
+            c = col + sign * d_col
+            while 0 <= r < rows and 0 <= c < cols and board[r][c] == token:
+                count += 1
+                r += sign * d_row
+                c += sign * d_col
+        if count >= 4:
+            return GameState.WON_RED if token == GameToken.RED else GameState.WON_YELLOW
+
+    return GameState.TURN_RED
+
 if __name__ == '__main__':
     s = GameState.TURN_RED
     print(f"GameState {s}, Type: {type(s)}, Value: {s.value}")
@@ -0,0 +1,279 @@
+from game_token import GameToken
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+"""
+Persistent storage of the games held by the game registry
+
+The registry reports every change of a game as an event. A store appends the
+events to a write-ahead log and replays them on startup, so a restarted
+server continues all games where they were. Events are tuples:
+
+    ('create', game_id, starter, None)   a new game, starter is the token moving first
+    ('drop', game_id, player, column)    a successful drop
+    ('reset', game_id, starter, None)    the game was restarted
+    ('remove', game_id, None, None)      the game was removed
+
+SqliteGameStore writes the log into an SQLite database from a background
+thread. append() only puts the event into a queue; the writer commits all
+events that arrive within COMMIT_INTERVAL in one transaction (group commit),
+so drops never wait for the disk. Every SNAPSHOT_EVERY events the current
+move lists of all games are written as a snapshot and the log before it is
+deleted, which keeps the replay short.
+
+A batch that can't be written (locked database, full disk, bad path) is
+retried WRITE_ATTEMPTS times. If it still fails, the store is marked as
+failed and the error is logged. After that, append() drops the events and
+the games only live in memory, and flush() raises GameStoreError.
+
+Classes:
+    GameStore: Interface of a store, keeps nothing
+    SqliteGameStore: Write-ahead log and snapshots in an SQLite database
+    GameStoreError: Raised by flush() of a failed store
+"""
+
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'games.db')
+COMMIT_INTERVAL = 0.05  # seconds the writer collects events before it commits them
+SNAPSHOT_EVERY = 1000   # logged events between two snapshots
+WRITE_ATTEMPTS = 3      # attempts to write a batch before the store fails
+RETRY_DELAY = 0.5       # seconds between two attempts
+
+logger = logging.getLogger(__name__)
+
+
+class GameStoreError(Exception):
+    """
+    Raised when the events of a failed store can't be made durable.
+    """
+
+
+def apply_event(games: dict, event: tuple) -> None:
+    """
+    Apply an event to a dict of games.
+
+    Args:
+        games (dict): Game id -> (starter, list of (player, column)), changed in place
+        event (tuple): (kind, game_id, player, column), see module description
+    """
+    kind, game_id, player, column = event
+    if kind in ('create', 'reset'):
+        games[game_id] = (GameToken(player), [])
+    elif kind == 'drop':
+        if game_id in games:
+            games[game_id][1].append((GameToken(player), column))
+    elif kind == 'remove':
+        games.pop(game_id, None)
+
+
+class GameStore:
+    """
+    Interface of a game store. This base class keeps nothing, so the registry
+    runs purely in memory with it.
+    """
+    def load(self) -> dict:
+        """
+        Replay the stored games.
+
+        Returns:
+            dict: Game id -> (starter, list of (player, column))
+        """
+        return {}
+
+    def append(self, event: tuple) -> None:
+        """
+        Record an event, see module description. Must not block.
+        """
+
+    def flush(self) -> None:
+        """
+        Wait until all appended events are durable.
+        """
+
+    def close(self) -> None:
+        """
+        Flush and release the store.
+        """
+
+
+class SqliteGameStore(GameStore):
+    """
+    Write-ahead log of game events in an SQLite database.
+
+    Attributes:
+        _path (str): Path of the database file
+        _commit_interval (float): Seconds the writer collects events for one commit
+        _snapshot_every (int): Logged events between two snapshots
+        _games (dict): The games as of the last written event, owned by the writer thread
+        _queue (queue.Queue): Events waiting to be written, None stops the writer
+        _writer (threading.Thread | None): The thread writing the events
+        _error (sqlite3.Error | None): The error that made the store fail, None while it works
+    """
+    def __init__(self, path: str = STORE_PATH, commit_interval: float = COMMIT_INTERVAL,
+                 snapshot_every: int = SNAPSHOT_EVERY):
+        """
+        Args:
+            path (str): Path of the database file, created if it doesn't exist
+            commit_interval (float): Seconds the writer collects events for one commit
+            snapshot_every (int): Logged events between two snapshots
+        """
+        self._path = path
+        self._commit_interval = commit_interval
+        self._snapshot_every = snapshot_every
+        self._games = {}
+        self._queue = queue.Queue()
+        self._writer = None
+        self._error = None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("CREATE TABLE IF NOT EXISTS log "
+                           "(seq INTEGER PRIMARY KEY, kind TEXT, game_id TEXT, player TEXT, col INTEGER)")
+        connection.execute("CREATE TABLE IF NOT EXISTS snapshot (game_id TEXT PRIMARY KEY, starter TEXT, moves TEXT)")
+        return connection
+
+    def load(self) -> dict:
+        """
+        Replay snapshot and log, then start the writer thread.
+
+        Returns:
+            dict: Game id -> (starter, list of (player, column))
+        """
+        connection = self._connect()
+        try:
+            games = {}
+            for game_id, starter, moves in connection.execute("SELECT game_id, starter, moves FROM snapshot"):
+                games[game_id] = (GameToken(starter), [(GameToken(player), column)
+                                                        for player, column in json.loads(moves)])
+            for event in connection.execute("SELECT kind, game_id, player, col FROM log ORDER BY seq"):
+                apply_event(games, event)
+        finally:
+            connection.close()
+        self._games = games
+        self._writer = threading.Thread(target=self._run, name="GameStoreWriter", daemon=True)
+        self._writer.start()
+        return {game_id: (starter, list(moves)) for game_id, (starter, moves) in games.items()}
+
+    def append(self, event: tuple) -> None:
+        if self._error is None:
+            self._queue.put(event)
+
+    def flush(self) -> None:
+        """
+        Wait until all appended events are durable.
+
+        Raises:
+            GameStoreError: If the store failed, the events since are lost
+        """
+        self._queue.join()
+        if self._error is not None:
+            raise GameStoreError(f"writing {self._path} failed: {self._error}") from self._error
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _run(self) -> None:
+        """
+        Writer thread: group commit of the queued events and periodic snapshots.
+        A failed store keeps taking the events from the queue without writing them.
+        """
+        connection = None
+        logged = 0
+        try:
+            connection = self._connect()
+            logged = connection.execute("SELECT COUNT(*) FROM log").fetchone()[0]
+        except sqlite3.Error as error:
+            self._fail(error)
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            # collect what arrives within the commit interval
+            deadline = time.monotonic() + self._commit_interval
+            while batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                running = False
+            events = [event for event in batch if event is not None]
+            if self._error is None and self._write(connection, events):
+                for event in events:
+                    apply_event(self._games, event)
+                logged += len(events)
+                if logged >= self._snapshot_every or not running:
+                    try:
+                        self._snapshot(connection)
+                        logged = 0
+                    except sqlite3.Error:
+                        # the log is still complete, the next batch tries again
+                        logger.exception("Snapshot of %s failed", self._path)
+            for _ in batch:
+                self._queue.task_done()
+        if connection is not None:
+            connection.close()
+
+    def _write(self, connection: sqlite3.Connection, events: list) -> bool:
+        """
+        Append the events to the log in one transaction, with retries.
+
+        Returns:
+            bool: True if the events were written, False if the store failed
+        """
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                with connection:
+                    connection.executemany("INSERT INTO log (kind, game_id, player, col) VALUES (?, ?, ?, ?)",
+                                           [(kind, game_id, None if player is None else str(player), column)
+                                            for kind, game_id, player, column in events])
+                return True
+            except sqlite3.Error as error:
+                if attempt == WRITE_ATTEMPTS:
+                    self._fail(error)
+                    return False
+                logger.warning("Writing %s failed (attempt %d of %d): %s", self._path, attempt, WRITE_ATTEMPTS, error)
+                time.sleep(RETRY_DELAY)
+
+    def _fail(self, error: sqlite3.Error) -> None:
+        """
+        Mark the store as failed; the games are not stored any more.
+        """
+        self._error = error
+        logger.error("Game store %s failed, games are no longer saved: %s", self._path, error)
+
+    def _snapshot(self, connection: sqlite3.Connection) -> None:
+        """
+        Replace the snapshot by the current games and clear the log, in one transaction.
+        """
+        with connection:
+            connection.execute("DELETE FROM snapshot")
+            connection.executemany("INSERT INTO snapshot (game_id, starter, moves) VALUES (?, ?, ?)",
+                                   [(game_id, str(starter), json.dumps(moves))
+                                    for game_id, (starter, moves) in self._games.items()])
+            connection.execute("DELETE FROM log")
+
+
+if __name__ == '__main__':
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), 'games.db')
+    store = SqliteGameStore(path)
+    store.load()
+    start = time.monotonic()
+    store.append(('create', 'demo', GameToken.RED, None))
+    for index in range(10):
+        store.append(('drop', 'demo', GameToken.RED if index % 2 == 0 else GameToken.YELLOW, index % 7))
+    append_time = time.monotonic() - start
+    store.close()
+    print(f"11 events appended in {append_time * 1000:.2f}ms")
+    store = SqliteGameStore(path)
+    print(f"Replayed: {store.load()}")
+    store.close()
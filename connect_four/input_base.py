@@ -1,5 +1,7 @@
 from enum import Enum
 
+ESCAPE_TIMEOUT = 0.05 # seconds to wait for the rest of a key sequence before taking its start as keys
+
 
 class Keys(Enum):
     """
@@ -20,6 +22,12 @@ class InputBase:
 
     This class defines the interface for reading key inputs.
     Subclasses must implement the `read_key` method.
+
+    Inputs that can be watched with selectors (or an asyncio event loop)
+    also implement `fileno` and `read_keys`, so keys can be read as events
+    without blocking (see input_events.KeyEvents). `open` and `close`
+    bracket a session of reads, e.g. to keep a terminal in raw mode; an
+    input is also a context manager doing the same.
     """
 
     def read_key(self) -> Keys:
@@ -30,3 +38,60 @@ class InputBase:
             NotImplementedError: This method must be implemented by subclasses.
         """
         raise NotImplementedError()
+
+    def fileno(self):
+        """
+        File descriptor that becomes readable when a key is available.
+
+        Returns:
+            int | None: The file descriptor, None if the input can't be watched with selectors
+        """
+        return None
+
+    def read_keys(self) -> list:
+        """
+        Read the keys that are available without blocking.
+        Only inputs with a fileno() have to implement it.
+
+        Returns:
+            list[Keys]: The keys in the order they were pressed, empty if there are none
+
+        Raises:
+            NotImplementedError: If the input can't be read without blocking.
+        """
+        raise NotImplementedError()
+
+    def flush_keys(self) -> list:
+        """
+        Returns the keys held back while waiting for the rest of a key sequence
+        (e.g. an escape sequence split between two reads), called once no more
+        input arrived within ESCAPE_TIMEOUT.
+
+        Returns:
+            list[Keys]: The held back keys, empty if there are none
+        """
+        return []
+
+    def event_source(self):
+        """
+        Identifies the device the keys come from; inputs reading the same device
+        share one event queue (see input_events.KeyEvents).
+        """
+        return self
+
+    def open(self) -> None:
+        """
+        Start a session of reads.
+        """
+
+    def close(self) -> None:
+        """
+        End the session started by open().
+        """
+
+    def __enter__(self) -> 'InputBase':
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,5 +1,6 @@
 from input_base import InputBase
 from input_base import Keys
+from input_base import ESCAPE_TIMEOUT
 from enum import Enum
 import os
 from time import sleep
@@ -7,16 +8,126 @@ from time import sleep
 if os.name == 'nt':  # Windows
     import msvcrt
 else:  # Posix (Linux, OS X)
+    import codecs
     import sys
     import tty
     import termios
     from select import select
 
+# key codes following an escape character
+ESCAPE_SEQUENCES = {"[A": Keys.UP, "[B": Keys.DOWN, "[C": Keys.RIGHT, "[D": Keys.LEFT}
+
 
 class InputConsole(InputBase):
     """
     Input handler for console applications using keyboard input.
+
+    On Posix systems open() switches the terminal to cbreak mode (keys are
+    delivered without Enter and not echoed) until close(), so the mode isn't
+    switched for every key. Without an open session read_key() switches it
+    for the one key, as before. The console can be watched with selectors
+    through fileno(); read_keys() then returns the pressed keys without
+    blocking.
+
+    Attributes:
+        _saved_settings (list | None): Terminal settings to restore on close(), None without session
+        _keys (list): Keys read from the terminal but not returned yet
+        _pending (str): Start of an escape sequence whose rest wasn't read yet
     """
+    def __init__(self):
+        super().__init__()
+        self._saved_settings = None
+        self._keys = []
+        self._pending = ''
+        if os.name != 'nt':
+            self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def open(self) -> None:
+        """
+        Keep the terminal in cbreak mode until close().
+        """
+        if os.name != 'nt' and self._saved_settings is None:
+            fd = sys.stdin.fileno()
+            self._saved_settings = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+
+    def close(self) -> None:
+        """
+        Restore the terminal settings saved by open().
+        """
+        if self._saved_settings is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._saved_settings)
+            self._saved_settings = None
+
+    def fileno(self):
+        """
+        Returns:
+            int | None: The file descriptor of stdin, None on Windows
+        """
+        return None if os.name == 'nt' else sys.stdin.fileno()
+
+    def read_keys(self) -> list:
+        """
+        Read the keys that were pressed without blocking.
+
+        Returns:
+            list[Keys]: The keys in the order they were pressed, empty if there are none
+        """
+        if os.name == 'nt':
+            keys = []
+            while msvcrt.kbhit():
+                keys.append(self.read_key())
+            return keys
+        keys, self._keys = self._keys, []
+        if select([sys.stdin], [], [], 0)[0]:
+            keys += self._parse(self._decoder.decode(os.read(sys.stdin.fileno(), 1024)))
+        return keys
+
+    def flush_keys(self) -> list:
+        """
+        Returns the start of an incomplete escape sequence as keys: the escape and the rest as unknown keys.
+        """
+        pending, self._pending = self._pending, ''
+        return [Keys.ESC] + [Keys.UNKNOWN] * (len(pending) - 1) if pending else []
+
+    def event_source(self):
+        """
+        All console inputs read the same terminal.
+        """
+        return 'console'
+
+    def _parse(self, chars: str) -> list:
+        """
+        Convert characters read from the terminal to keys.
+
+        Raises:
+            KeyboardInterrupt: If Ctrl+C was read
+        """
+        chars, self._pending = self._pending + chars, ''
+        keys = []
+        index = 0
+        while index < len(chars):
+            ch = chars[index]
+            index += 1
+            if ch == "\x1b":
+                sequence = chars[index:index + 2]
+                if sequence == '' or sequence[0] == "\x1b":
+                    # a terminal sends a sequence at once, an escape on its own is the key
+                    keys.append(Keys.ESC)
+                    index += len(sequence[:1])
+                elif len(sequence) < 2:
+                    self._pending = chars[index - 1:]
+                    break
+                else:
+                    keys.append(ESCAPE_SEQUENCES.get(sequence, Keys.UNKNOWN))
+                    index += 2
+            elif ch in "\r\n":
+                keys.append(Keys.ENTER)
+            elif ch == "\x03":
+                raise KeyboardInterrupt()
+            else:
+                keys.append(Keys.UNKNOWN)
+        return keys
 
     def key_pressed(self) -> bool:
         """
@@ -29,7 +140,7 @@ class InputConsole(InputBase):
             return msvcrt.kbhit()
         else:
             dr, dw, de = select([sys.stdin], [], [], 0)
-            return dr != []
+            return bool(self._keys) or bool(self._pending) or dr != []
             # return keyboard.read_event().event_type == keyboard.KEY_DOWN
 
     def read_key(self) -> Enum:
@@ -62,33 +173,20 @@ class InputConsole(InputBase):
             return Keys.UNKNOWN
 
         else: # if running on Unix (Linux, Raspberry PI)
-            fd = sys.stdin.fileno()
-            old_settings = termios.tcgetattr(fd)
-            try:
-                tty.setraw(sys.stdin.fileno())
-                ch = sys.stdin.read(1)
-                if ch == "\x1b":
-                    ch = sys.stdin.read(1)
-                    if ch == "\x1b":
-                        return Keys.ESC
-                    ch += sys.stdin.read(1)
-                    if ch == "[A":
-                        return Keys.UP
-                    elif ch == "[B":
-                        return Keys.DOWN
-                    elif ch == "[C":
-                        return Keys.RIGHT
-                    elif ch == "[D":
-                        return Keys.LEFT
-                elif ch == "\r":
-                    return Keys.ENTER
-                elif ch == "\n":
-                    return Keys.ENTER
-                elif ch == "\x03":
-                    raise KeyboardInterrupt()
-                return Keys.UNKNOWN
-            finally:
-                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+            if self._saved_settings is None:
+                # no session: cbreak mode for this key only
+                self.open()
+                try:
+                    return self.read_key()
+                finally:
+                    self.close()
+            while not self._keys:
+                # an incomplete escape sequence is taken as keys if its rest doesn't follow
+                if select([sys.stdin], [], [], ESCAPE_TIMEOUT if self._pending else None)[0]:
+                    self._keys = self.read_keys()
+                else:
+                    self._keys = self.flush_keys()
+            return self._keys.pop(0)
 
 
 if __name__ == '__main__':
@@ -102,15 +200,16 @@ if __name__ == '__main__':
             print("Enter")
         if (key == Keys.ESC):  # Abort with ESC
             break
-    print("read from console only if key_pressed, not working on linux")
-    # Non-blocking input checking
-    while True:
-        if c.key_pressed():
-            key = c.read_key()
-            print(f"Taste: {key}, Type: {type(key)}")
-            if key == Keys.ENTER:
-                print("Enter")
-            if (key == Keys.ESC):  # Abort with ESC
-                break
-        else:
-            sleep(20/1000)
+    print("read from console only if key_pressed")
+    # Non-blocking input checking, the terminal stays in cbreak mode for the session
+    with c:
+        while True:
+            if c.key_pressed():
+                key = c.read_key()
+                print(f"Taste: {key}, Type: {type(key)}")
+                if key == Keys.ENTER:
+                    print("Enter")
+                if (key == Keys.ESC):  # Abort with ESC
+                    break
+            else:
+                sleep(20/1000)
@@ -0,0 +1,170 @@
+from input_base import InputBase, Keys, ESCAPE_TIMEOUT
+import asyncio
+import threading
+
+"""
+Event-driven input
+
+KeyEvents delivers the keys of an input through an asyncio.Queue, so a
+coroutine can wait for the player's next key while other tasks on the same
+event loop wait for moves of a remote game or redraw the board.
+
+Inputs with a fileno() (the console on Posix systems) are watched by the
+event loop itself with loop.add_reader(), which uses selectors; no thread
+is involved. All other inputs (the Sense HAT joystick, the console on
+Windows) are read by a daemon thread handing the keys over to the loop.
+A blocked read can't be interrupted, so the thread is started once and
+lives as long as the KeyEvents; stop() only stops the delivery, the keys
+read until the next start() are dropped. Reuse one KeyEvents per input,
+e.g. for all games of a session, so no second thread competes for the keys.
+The input session, e.g. the cbreak mode of the terminal, stays open from
+start() until stop() instead of being switched for every key.
+
+Usage:
+    async with KeyEvents(InputConsole()) as keys:
+        key = await keys.get()
+
+Classes:
+    KeyEvents: Queue of the keys pressed on an input
+"""
+
+
+class KeyEvents:
+    """
+    Queue of the keys pressed on an input, filled by the event loop.
+
+    Attributes:
+        _input (InputBase): The input read
+        _queue (asyncio.Queue): Keys pressed since start() and not taken yet
+        _loop (asyncio.AbstractEventLoop | None): The loop delivering the keys, None while stopped
+        _fd (int | None): File descriptor watched by the loop, None if a thread reads the input
+        _thread (threading.Thread | None): The reading thread, started by the first start()
+        _lock (threading.Lock): Guards _loop and _queue against the reading thread
+        _flush (asyncio.TimerHandle | None): Takes held back keys (see InputBase.flush_keys) after a pause
+    """
+    def __init__(self, p_input: InputBase):
+        """
+        Args:
+            p_input (InputBase): The input to read
+        """
+        self._input = p_input
+        self._queue = asyncio.Queue()
+        self._loop = None
+        self._fd = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._flush = None
+
+    def start(self) -> None:
+        """
+        Open the input session and start delivering keys; must be called from a coroutine.
+        Keys pressed before, e.g. between two games, are dropped.
+        """
+        if self._loop is not None:
+            return
+        self._input.open()
+        self._fd = self._input.fileno()
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue()
+        if self._fd is not None:
+            self._loop.add_reader(self._fd, self._on_readable)
+        elif self._thread is None:
+            self._thread = threading.Thread(target=self._read, name="KeyEvents", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop delivering keys and close the input session.
+        """
+        if self._loop is None:
+            return
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+        with self._lock:
+            self._loop = None
+        self._input.close()
+
+    async def __aenter__(self) -> 'KeyEvents':
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _on_readable(self) -> None:
+        for key in self._input.read_keys():
+            self._queue.put_nowait(key)
+        # the input may hold back the start of a key sequence until the rest arrives
+        if self._flush is not None:
+            self._flush.cancel()
+        self._flush = self._loop.call_later(ESCAPE_TIMEOUT, self._flush_keys)
+
+    def _flush_keys(self) -> None:
+        self._flush = None
+        for key in self._input.flush_keys():
+            self._queue.put_nowait(key)
+
+    def _read(self) -> None:
+        """
+        Reading thread for inputs without file descriptor, runs as long as the process.
+        """
+        while True:
+            key = self._input.read_key()
+            with self._lock:
+                loop, queue = self._loop, self._queue
+            if loop is None:
+                continue # stopped, nobody waits for the key
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, key)
+            except RuntimeError: # the loop was closed
+                pass
+
+    async def get(self) -> Keys:
+        """
+        Wait for the next key.
+
+        Returns:
+            Keys: The key
+        """
+        return await self._queue.get()
+
+    def get_nowait(self):
+        """
+        Returns:
+            Keys | None: The next key, None if no key was pressed
+        """
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    def clear(self) -> None:
+        """
+        Drop the keys pressed so far, e.g. during the opponent's turn.
+        """
+        while self.get_nowait() is not None:
+            pass
+
+
+if __name__ == '__main__':
+    from input_console import InputConsole
+
+    async def ticker():
+        # keeps running while the player thinks
+        for second in range(1, 1000):
+            await asyncio.sleep(1)
+            print(f"{second}s")
+
+    async def main():
+        print("press any key, ESC to exit")
+        async with KeyEvents(InputConsole()) as keys:
+            task = asyncio.create_task(ticker())
+            while (key := await keys.get()) != Keys.ESC:
+                print(f"Taste: {key}")
+            task.cancel()
+
+    asyncio.run(main())
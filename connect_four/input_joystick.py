@@ -12,6 +12,12 @@ class InputJoystick(InputBase):
         super().__init__()
         self.sense = p_sense
 
+    def event_source(self):
+        """
+        Joystick inputs of the same Sense HAT read the same joystick.
+        """
+        return self.sense
+
     def read_key(self) -> Enum:
         """
         Reads all joystick events and process the last one, if no event occured since the last call, will wait for one.
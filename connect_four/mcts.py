@@ -0,0 +1,307 @@
+from game_token import GameToken
+from game_logic_bitboard import ROWS, COLS, HEIGHT, has_four, board_to_bitboards
+from board_evaluation import window_table
+from concurrent.futures import ProcessPoolExecutor
+import math
+import time
+import numpy as np
+
+"""
+Monte Carlo Tree Search (UCT) bot for Connect Four
+
+The tree is built on bitboards (see game_logic_bitboard). Every iteration
+selects a leaf with the UCT formula, expands one move and evaluates the new
+node with a batch of random games that are played out all at once on NumPy
+arrays. The more iterations (or time) the search gets, the better it plays.
+
+best_drop_position has the same signature as the minimax bot in
+player_bot.py plus the search budget, an optional tree to reuse between
+moves, and a worker count for root-parallel search in several processes.
+
+Classes:
+    MctsNode: Node of the search tree
+    MctsTree: Search tree kept between the moves of a game
+"""
+
+ITERATIONS = 400        # default budget if neither iterations nor time are given
+ROLLOUT_BATCH = 16      # random games played per evaluated node
+EXPLORATION = 1.4       # UCT exploration constant
+
+BOTTOM_MASK = sum(1 << (col * HEIGHT) for col in range(COLS))
+
+# windows through every cell, padded with a window of the always empty cell ROWS * COLS
+_WINDOWS = window_table(ROWS, COLS)
+_CELL_WINDOWS = [[window for window in _WINDOWS.tolist() if cell in window] for cell in range(ROWS * COLS)]
+_PAD = max(len(windows) for windows in _CELL_WINDOWS)
+CELL_WINDOWS = np.array([windows + [[ROWS * COLS] * 4] * (_PAD - len(windows)) for windows in _CELL_WINDOWS],
+                        dtype=np.intp)
+
+
+class MctsNode:
+    """
+    Node of the search tree.
+
+    Attributes:
+        position (int): Bitboard of the side to move
+        mask (int): Bitboard of all tokens
+        move (int | None): Column played to reach this node
+        terminal (float | None): 1.0 if the move into this node won, 0.0 for a draw, None otherwise
+        children (dict): Column -> MctsNode
+        untried (list): Columns not expanded yet
+        visits (int): Number of iterations through this node
+        value (float): Sum of the mean results of the iterations' rollout batches (-1..1 each),
+            from the view of the player who made move
+    """
+    __slots__ = ('position', 'mask', 'move', 'terminal', 'children', 'untried', 'visits', 'value')
+
+    def __init__(self, position: int, mask: int, move: int = None, terminal: float = None):
+        self.position = position
+        self.mask = mask
+        self.move = move
+        self.terminal = terminal
+        self.children = {}
+        self.untried = [] if terminal is not None else \
+            [col for col in range(COLS) if not mask & (1 << (col * HEIGHT + ROWS - 1))]
+        self.visits = 0
+        self.value = 0.0
+
+    @property
+    def key(self) -> int:
+        return self.position + self.mask
+
+    def play(self, col: int) -> 'MctsNode':
+        """
+        Create the child node reached by dropping into col.
+        """
+        move = (self.mask + (1 << (col * HEIGHT))) & (((1 << ROWS) - 1) << (col * HEIGHT))
+        mover = self.position | move
+        mask = self.mask | move
+        if has_four(mover):
+            terminal = 1.0
+        elif mask == BOTTOM_MASK * ((1 << ROWS) - 1):
+            terminal = 0.0
+        else:
+            terminal = None
+        return MctsNode(mover ^ mask, mask, col, terminal)
+
+    def select_child(self) -> 'MctsNode':
+        """
+        Returns the child with the highest UCT score.
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children.values(),
+                   key=lambda child: child.value / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits))
+
+
+def _cells(position: int, mask: int) -> np.ndarray:
+    """
+    Flat row-major cell array (plus one always empty cell) with +1 for the side to move.
+    """
+    cells = np.zeros(ROWS * COLS + 1, dtype=np.int8)
+    for col in range(COLS):
+        for row in range(ROWS):
+            bit = 1 << (col * HEIGHT + row)
+            if mask & bit:
+                cells[(ROWS - 1 - row) * COLS + col] = 1 if position & bit else -1
+    return cells
+
+
+def rollout(position: int, mask: int, games: int, rng: np.random.Generator) -> float:
+    """
+    Play random games from a position, all games at once.
+
+    Args:
+        position (int): Bitboard of the side to move
+        mask (int): Bitboard of all tokens
+        games (int): Number of random games
+        rng (np.random.Generator): Random number generator
+
+    Returns:
+        float: Sum of the results from the view of the side to move (+1 win, 0 draw, -1 loss)
+    """
+    cells = np.repeat(_cells(position, mask)[np.newaxis, :], games, axis=0)
+    heights = np.array([[((mask >> (col * HEIGHT)) & ((1 << HEIGHT) - 1)).bit_length() for col in range(COLS)]],
+                       dtype=np.intp).repeat(games, axis=0)
+    results = np.zeros(games, dtype=np.int8)
+    active = np.ones(games, dtype=bool)
+    active &= heights.sum(axis=1) < ROWS * COLS
+    turn = 1
+    games_index = np.arange(games)
+    while active.any():
+        # random legal column for every game
+        choice = rng.random((games, COLS))
+        choice[heights >= ROWS] = -1.0
+        cols = choice.argmax(axis=1)
+        index = games_index[active]
+        cols = cols[active]
+        cell = (ROWS - 1 - heights[index, cols]) * COLS + cols
+        cells[index, cell] = turn
+        heights[index, cols] += 1
+
+        # only windows through the new token can be complete
+        window_sums = cells[index[:, np.newaxis, np.newaxis], CELL_WINDOWS[cell]].sum(axis=2, dtype=np.int8)
+        won = (window_sums == 4 * turn).any(axis=1)
+        results[index[won]] = turn
+        active[index[won]] = False
+        active[index[heights[index].sum(axis=1) == ROWS * COLS]] = False
+        turn = -turn
+    return float(results.sum())
+
+
+class MctsTree:
+    """
+    Search tree kept between the moves of a game.
+
+    Attributes:
+        root (MctsNode | None): Node of the last searched position
+        rng (np.random.Generator): Random number generator of the rollouts
+    """
+    def __init__(self, seed: int = None):
+        self.root = None
+        self.rng = np.random.default_rng(seed)
+
+    def find_root(self, position: int, mask: int) -> MctsNode:
+        """
+        Returns the node of a position, reusing the subtree from the last search if possible.
+
+        The position is looked for among the last root and its descendants up to two
+        plies deep (our move and the opponent's answer).
+        """
+        key = position + mask
+        if self.root is not None:
+            candidates = [self.root]
+            for _ in range(2):
+                if any(node.key == key for node in candidates):
+                    break
+                candidates = [child for node in candidates for child in node.children.values()]
+            for node in candidates:
+                if node.key == key:
+                    node.move = None
+                    self.root = node
+                    return node
+        self.root = MctsNode(position, mask)
+        return self.root
+
+    def search(self, root: MctsNode, iterations: int = None, deadline: float = None) -> None:
+        """
+        Run MCTS iterations from root until the iteration count or deadline is reached.
+        """
+        done = 0
+        while (iterations is None or done < iterations) and (deadline is None or time.monotonic() < deadline):
+            node = root
+            path = [node]
+            # selection
+            while not node.untried and node.children:
+                node = node.select_child()
+                path.append(node)
+            # expansion
+            if node.untried and node.terminal is None:
+                col = node.untried.pop(self.rng.integers(len(node.untried)))
+                child = node.play(col)
+                node.children[col] = child
+                node = child
+                path.append(node)
+            # evaluation, from the view of the player who moved into node; a batch of
+            # rollouts counts as one visit with its mean result, so the UCT exploration
+            # term sees one visit per iteration as the constant assumes
+            if node.terminal is not None:
+                result = node.terminal
+            else:
+                result = -rollout(node.position, node.mask, ROLLOUT_BATCH, self.rng) / ROLLOUT_BATCH
+            # backpropagation
+            for visited in reversed(path):
+                visited.visits += 1
+                visited.value += result
+                result = -result
+            done += 1
+
+    def visit_counts(self, root: MctsNode) -> dict:
+        """
+        Returns column -> number of visits for the children of root.
+        """
+        return {col: child.visits for col, child in root.children.items()}
+
+
+def _search_worker(position: int, mask: int, iterations: int, deadline: float, seed: int) -> dict:
+    """
+    Run an independent search in a worker process and return the root visit counts.
+    """
+    tree = MctsTree(seed)
+    root = tree.find_root(position, mask)
+    tree.search(root, iterations, deadline)
+    return tree.visit_counts(root)
+
+
+def best_drop_position(board, player_token, iterations: int = None, time_budget_ms: int = None,
+                       tree: MctsTree = None, workers: int = 1, executor: ProcessPoolExecutor = None):
+    """
+    Determines the best column to drop a token for the current player using Monte Carlo Tree Search.
+
+    Args:
+        board (list[list[GameToken]]): The game board as a 2D list.
+        player_token (GameToken): The token of the current player (RED or YELLOW).
+        iterations (int): Number of iterations. Defaults to ITERATIONS without a time budget.
+        time_budget_ms (int): Thinking time in milliseconds, None for no limit.
+        tree (MctsTree): Tree to reuse between the moves of a game, a fresh tree if None.
+        workers (int): Number of processes searching independent trees (root parallelization).
+            The tree is only reused with a single worker.
+        executor (ProcessPoolExecutor): Worker processes kept between moves, None to start
+            them (and stop them) within this call if workers > 1.
+
+    Returns:
+        int: The index of the best column to drop the token, -1 if the board is full.
+    """
+    red, yellow, _ = board_to_bitboards(board)
+    position = red if player_token == GameToken.RED else yellow
+    mask = red | yellow
+    if iterations is None and time_budget_ms is None:
+        iterations = ITERATIONS
+    deadline = None if time_budget_ms is None else time.monotonic() + time_budget_ms / 1000
+
+    if tree is None:
+        tree = MctsTree()
+    root = tree.find_root(position, mask)
+    if not root.untried and not root.children:
+        return -1
+
+    # a winning drop needs no search
+    playable = sorted(set(root.untried) | set(root.children))
+    for col in playable:
+        if root.play(col).terminal == 1.0:
+            return col
+
+    if workers > 1:
+        worker_iterations = None if iterations is None else -(-iterations // workers)
+        counts = {}
+        own_executor = None
+        if executor is None:
+            executor = own_executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            seeds = tree.rng.integers(2 ** 32, size=workers).tolist()
+            futures = [executor.submit(_search_worker, position, mask, worker_iterations, deadline, seed)
+                       for seed in seeds]
+            for future in futures:
+                for col, visits in future.result().items():
+                    counts[col] = counts.get(col, 0) + visits
+        finally:
+            if own_executor is not None:
+                own_executor.shutdown()
+    else:
+        tree.search(root, iterations, deadline)
+        counts = tree.visit_counts(root)
+
+    if not counts:
+        return playable[0]
+    return max(counts, key=counts.get)
+
+
+if __name__ == '__main__':
+    board = [[GameToken.EMPTY for _ in range(7)] for _ in range(6)]
+    board[5][3] = GameToken.RED
+    board[4][3] = GameToken.RED
+    board[3][3] = GameToken.RED
+    board[5][4] = GameToken.YELLOW
+    board[5][5] = GameToken.YELLOW
+    start = time.monotonic()
+    print(f"Block at column: {best_drop_position(board, GameToken.YELLOW, iterations=300)}"
+          f" ({time.monotonic() - start:.2f}s)")
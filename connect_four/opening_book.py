@@ -0,0 +1,207 @@
+from game_token import GameToken
+from game_logic_bitboard import ROWS, COLS, HEIGHT, has_four, board_to_bitboards
+import argparse
+import mmap
+import os
+import struct
+import time
+
+"""
+Opening Book for the Connect Four bot
+
+The book is a binary file of sorted 64-bit little-endian entries
+``key << 3 | column``. The key identifies a position with its side to move
+(bitboard of the side to move + bitboard of all tokens, see solver), the
+column is the precomputed best move. Lookups are a binary search directly on
+the memory-mapped file, so loading the book costs nothing up front.
+
+Usage (generate a book offline):
+    python3 opening_book.py --plies 6 --depth 8
+
+Classes:
+    OpeningBook: Read-only, memory-mapped opening book
+"""
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+ENTRY = struct.Struct('<Q')
+COLUMN_BITS = 3
+
+
+def position_key(position: int, mask: int) -> int:
+    """
+    Unique key of a position: bitboard of the side to move plus all tokens.
+    """
+    return position + mask
+
+
+def mirror(bitboard: int) -> int:
+    """
+    Mirror a bitboard horizontally (column c becomes column COLS-1-c).
+    """
+    column_bits = (1 << HEIGHT) - 1
+    result = 0
+    for col in range(COLS):
+        result |= ((bitboard >> (col * HEIGHT)) & column_bits) << ((COLS - 1 - col) * HEIGHT)
+    return result
+
+
+class OpeningBook:
+    """
+    Read-only opening book backed by a memory-mapped file.
+
+    Attributes:
+        _file: The open book file, None if the book is empty
+        _mmap (mmap.mmap): Memory map of the file
+        _entries (memoryview): The map viewed as 64-bit unsigned integers
+    """
+    def __init__(self, path: str = BOOK_PATH):
+        """
+        Open a book file.
+
+        Args:
+            path (str): Path of the book file
+        """
+        self._file = None
+        self._mmap = None
+        self._entries = []
+        if os.path.getsize(path) > 0:
+            self._file = open(path, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._entries = memoryview(self._mmap).cast('Q')
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup_key(self, key: int):
+        """
+        Look up a position key.
+
+        Returns:
+            int | None: The stored best column, None if the position is not in the book
+        """
+        entries = self._entries
+        low = 0
+        high = len(entries)
+        while low < high:
+            middle = (low + high) // 2
+            entry_key = entries[middle] >> COLUMN_BITS
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return entries[middle] & ((1 << COLUMN_BITS) - 1)
+        return None
+
+    def lookup(self, board: list, player_token: GameToken):
+        """
+        Look up the best column for a board.
+
+        Args:
+            board (List[List[GameToken]]): The game board as a 2D list
+            player_token (GameToken): The player to move
+
+        Returns:
+            int | None: The stored best column, None if the position is not in the book
+        """
+        if len(board) != ROWS or len(board[0]) != COLS:
+            return None
+        red, yellow, _ = board_to_bitboards(board)
+        position = red if player_token == GameToken.RED else yellow
+        return self.lookup_key(position_key(position, red | yellow))
+
+    def close(self) -> None:
+        """
+        Close the book file.
+        """
+        if self._file is not None:
+            self._entries.release()
+            self._mmap.close()
+            self._file.close()
+            self._file = None
+            self._entries = []
+
+
+def generate(plies: int, best_move) -> dict:
+    """
+    Compute the best move of every position reachable within the given number of plies.
+
+    Both players may start, so every position is generated with either side to move.
+    Positions that are already won are skipped.
+
+    Args:
+        plies (int): Maximum number of tokens on the board
+        best_move (callable): best_move(board, player_token) -> column
+
+    Returns:
+        dict: Position key -> best column
+    """
+    book = {}
+    board = [[GameToken.EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+    heights = [0] * COLS
+
+    def visit(position, mask, token, depth):
+        key = position_key(position, mask)
+        if key in book:
+            return
+        # the mirrored position has the mirrored best move
+        mirrored_key = position_key(mirror(position), mirror(mask))
+        if mirrored_key in book:
+            book[key] = COLS - 1 - book[mirrored_key]
+        else:
+            book[key] = best_move(board, token)
+        if depth == plies:
+            return
+
+        opponent = GameToken.RED if token == GameToken.YELLOW else GameToken.YELLOW
+        for col in range(COLS):
+            if heights[col] >= ROWS:
+                continue
+            move = 1 << (col * HEIGHT + heights[col])
+            if has_four(position | move):
+                continue
+            row = ROWS - 1 - heights[col]
+            board[row][col] = token
+            heights[col] += 1
+            # the opponent moves next: its bitboard is the other tokens
+            visit((position | move) ^ (mask | move), mask | move, opponent, depth + 1)
+            heights[col] -= 1
+            board[row][col] = GameToken.EMPTY
+
+    for starter in (GameToken.RED, GameToken.YELLOW):
+        visit(0, 0, starter, 0)
+    return book
+
+
+def write_book(path: str, book: dict) -> None:
+    """
+    Write a book as sorted binary entries.
+
+    Args:
+        path (str): Path of the book file
+        book (dict): Position key -> best column
+    """
+    with open(path, 'wb') as file:
+        for key in sorted(book):
+            file.write(ENTRY.pack(key << COLUMN_BITS | book[key]))
+
+
+if __name__ == '__main__':
+    # imported here: the bot imports this module for the lookups
+    from player_bot import best_drop_position
+
+    parser = argparse.ArgumentParser(description="Generate the opening book of the bot")
+    parser.add_argument('--plies', type=int, default=6, help="positions with up to this many tokens")
+    parser.add_argument('--depth', type=int, default=8, help="search depth per position")
+    parser.add_argument('--output', default=BOOK_PATH, help="path of the book file")
+    args = parser.parse_args()
+
+    start = time.monotonic()
+    book = generate(args.plies, lambda board, token: best_drop_position(board, token, max_depth=args.depth))
+    write_book(args.output, book)
+    print(f"{len(book)} positions written to {args.output} in {time.monotonic() - start:.1f}s")
+
+    opening_book = OpeningBook(args.output)
+    empty_board = [[GameToken.EMPTY for _ in range(COLS)] for _ in range(ROWS)]
+    print(f"Opening move: {opening_book.lookup(empty_board, GameToken.RED)}")
+    opening_book.close()
@@ -12,6 +12,14 @@ class PlayerBase:
     This class provides an interface for player actions, including
     making a move and drawing the game board. Subclasses must implement
     the required methods to provide specific player behavior.
+
+    draw_board() only sends the cells that changed since the last call to the
+    display; the grid itself is only drawn again when its size changes or
+    after the winner was displayed.
+
+    Attributes:
+        _last_board (list | None): Copy of the board on the display, None forces a full redraw
+        _last_state (GameState | None): The state passed with the last board
     """
 
     def __init__(self, player: GameToken):
@@ -24,6 +32,9 @@ class PlayerBase:
         self._player = player
         self._input = InputBase()
         self._display = DisplayBase()
+        self._last_board = None
+        self._last_state = None
+
     def play_turn(self) -> int:
         """
         Asks the player to play their turn.
@@ -37,21 +48,64 @@ class PlayerBase:
         temp_position = 0
         self._display.draw_token(temp_position,-1,self.player_id)
         while True:
-            key = self._input.read_key()
-            if key == Keys.ENTER:
+            temp_position, done = self._handle_key(temp_position, self._input.read_key())
+            if done:
+                return temp_position
+
+    async def play_turn_async(self, keys) -> int:
+        """
+        Asks the player to play their turn like play_turn(), but takes the keys
+        from an event queue, so other tasks keep running while the player thinks.
+        ESC gives up the turn.
+
+        Args:
+            keys (KeyEvents): The keys of the player's input
+
+        Returns:
+            int | None: The column index where the player drops their token, None after ESC.
+        """
+        keys.clear()
+        temp_position = 0
+        self._display.draw_token(temp_position,-1,self.player_id)
+        while True:
+            key = await keys.get()
+            if key == Keys.ESC:
                 self._display.draw_token(temp_position,-1,GameToken.EMPTY)
-                break
-            if (key == Keys.LEFT): 
-                if(temp_position >= 1):
-                    self._display.draw_token(temp_position,-1,GameToken.EMPTY)
-                    temp_position -= 1
-                    self._display.draw_token(temp_position,-1,self.player_id)
-            if (key == Keys.RIGHT):  
-                if(temp_position <= self._display.get_x_grid()-2):
-                    self._display.draw_token(temp_position,-1,GameToken.EMPTY)
-                    temp_position += 1
-                    self._display.draw_token(temp_position,-1,self.player_id)
-        return temp_position
+                return None
+            temp_position, done = self._handle_key(temp_position, key)
+            if done:
+                return temp_position
+
+    def _handle_key(self, temp_position: int, key: Keys) -> tuple:
+        """
+        Move the selector according to a key.
+
+        Returns:
+            tuple: (position of the selector, True if the player chose the column)
+        """
+        if key == Keys.ENTER:
+            self._display.draw_token(temp_position,-1,GameToken.EMPTY)
+            return temp_position, True
+        if (key == Keys.LEFT): 
+            if(temp_position >= 1):
+                self._move_selector(temp_position, temp_position - 1)
+                temp_position -= 1
+        if (key == Keys.RIGHT):  
+            if(temp_position <= self._display.get_x_grid()-2):
+                self._move_selector(temp_position, temp_position + 1)
+                temp_position += 1
+        return temp_position, False
+
+    def _move_selector(self, old_position: int, new_position: int) -> None:
+        """
+        Move the selector above the grid in one frame.
+        """
+        self._display.begin_frame()
+        try:
+            self._display.draw_token(old_position,-1,GameToken.EMPTY)
+            self._display.draw_token(new_position,-1,self.player_id)
+        finally:
+            self._display.end_frame()
 
     def draw_board(self, board: list, state: GameState) -> None:
         """
@@ -59,14 +113,46 @@ class PlayerBase:
 
         Parameters:
         - board: The current state of the game board.
+        - state: The current state of the game.
+        """
+        if board == self._last_board and state == self._last_state:
+            return
+        previous = self._last_board
+        self._display.begin_frame()
+        try:
+            if (previous is None or len(previous) != len(board) or len(previous[0]) != len(board[0])):
+                # a new grid is empty, so only the tokens have to be drawn
+                self._display.draw_grid(len(board[0]),len(board))
+                previous = [[GameToken.EMPTY] * len(row) for row in board]
+            for y_index, row in enumerate(board):
+                for x_index, token in enumerate(row):
+                    if token != previous[y_index][x_index]:
+                        self._display.draw_token(x_index,y_index,token)
+        finally:
+            self._display.end_frame()
+        self._last_board = [list(row) for row in board]
+        self._last_state = state
 
-        Raises:
-            NotImplementedError: This method must be implemented by subclasses.
+    def forget_board(self) -> None:
+        """
+        Forget what the display shows, so the next draw_board() draws the whole
+        board, e.g. after another player drew on the same screen.
+        """
+        self._last_board = None
+
+    @property
+    def display(self) -> DisplayBase:
+        """
+        Get the player's display.
+        """
+        return self._display
+
+    @property
+    def input(self) -> InputBase:
+        """
+        Get the player's input.
         """
-        self._display.draw_grid(len(board[0]),len(board))
-        for y_index, row in enumerate(board):
-            for x_index, token in enumerate(row):
-                self._display.draw_token(x_index,y_index,token)
+        return self._input
 
     @property
     def player_id(self) -> GameToken:
@@ -86,3 +172,5 @@ class PlayerBase:
         - token: The token of the winner
         """
         self._display.draw_winner(token)
+        # the winner covers the selector row, the next game starts on a fresh grid
+        self.forget_board()
@@ -1,54 +1,94 @@
 import os
-if os.name != 'nt':
-    from player_sensehat import PlayerSenseHat
-from player_console import PlayerConsole
 from game_token import GameToken
 from game_state import *
-from drop_state import DropState
-from game_logic_base import GameLogicBase
 from game_logic import GameLogic
 from game_logic_client import GameLogicClient
+from game_coordinator import BotPlayer, RemotePlayer, GameCoordinator, create_player
+from player_base import PlayerBase
+from transposition_table import TranspositionTable, Bound
+from solver import Solver, SolverTimeout
+from opening_book import OpeningBook, BOOK_PATH
+from board_evaluation import window_table, board_cells, evaluate, evaluate_batch
+import mcts
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import numpy as np
+import sys
 import time
-import random
 
-POLL_DELAY = 0.5 #Seconds
+TABLE_SIZE = 1 << 20 #Entries of the transposition table
+MAX_DEPTH = 4 #Plies searched without a time budget
+TIME_BUDGET_MS = 1000 #Thinking time per move in milliseconds
+WORKERS = 1 #Processes for the parallel root search, 1 = serial (e.g. os.cpu_count())
+EXACT_MODE = False #Play perfectly with the solver where it finishes within the time budget
+SOLVER_SHARE = 0.5 #Part of the time budget the solver may use before falling back to the search
+ENGINE = 'minimax' #Search engine of the bot: 'minimax' or 'mcts'
 
 color = 'red'
 #color = 'yellow'
 host = 'eee-w014-104.simple.eee.intern:5000'
 
 
-def best_drop_position(board, player_token):
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget of a move is used up.
     """
-    Determines the best column to drop a token for the current player using a Minimax algorithm.
 
-    Args:
-        board (list[list[GameToken]]): The game board as a 2D list.
-        player_token (GameToken): The token of the current player (RED or YELLOW).
 
-    Returns:
-        int: The index of the best column to drop the token.
+class MinimaxSearch:
     """
-    ROWS = len(board)
-    COLS = len(board[0])
-    MAX_DEPTH = 4
+    Minimax search with alpha-beta pruning on a private copy of the board.
 
-    def is_valid_move(col):
-        return board[0][col] == GameToken.EMPTY
+    The search always evaluates from the point of view of player_token: the
+    maximizing player is player_token, the minimizing player its opponent.
 
-    def simulate_drop(col, token):
+    Attributes:
+        board (list[list[GameToken]]): Copy of the board, modified during the search
+        player_token (GameToken): The token the search plays for
+        opponent_token (GameToken): The token of the other player
+        table (TranspositionTable): Table of already searched positions
+        position_hash (int): Zobrist hash of board, kept up to date by simulate_drop/undo_drop
+        deadline (float | None): time.monotonic() value at which the search is aborted
+        check_time (bool): Whether the deadline is checked (the first iteration always completes)
+        pv (list[int]): Principal variation of the last completed iteration
+    """
+    def __init__(self, board, player_token, table: TranspositionTable, deadline: float = None):
+        self.board = [row[:] for row in board] # aborted searches leave the copy dirty, not the caller's board
+        self.rows = len(board)
+        self.cols = len(board[0])
+        self.player_token = player_token
+        self.opponent_token = GameToken.RED if player_token == GameToken.YELLOW else GameToken.YELLOW
+        self.table = table
+        self.position_hash = table.hash_board(self.board, player_token)
+        self.cells = board_cells(self.board, player_token) # evaluation mirror of board
+        self.windows = window_table(self.rows, self.cols)
+        self.deadline = deadline
+        self.check_time = False
+        self.pv = []
+
+    def is_valid_move(self, col):
+        return self.board[0][col] == GameToken.EMPTY
+
+    def simulate_drop(self, col, token):
         """Simulate dropping a token in the specified column."""
-        for row in range(ROWS - 1, -1, -1):
+        board = self.board
+        for row in range(self.rows - 1, -1, -1):
             if board[row][col] == GameToken.EMPTY:
                 board[row][col] = token
+                self.position_hash ^= self.table.cell_key(row, col, token)
+                self.cells[row * self.cols + col] = 1 if token == self.player_token else -1
                 return row
 
-    def undo_drop(row, col):
+    def undo_drop(self, row, col):
         """Undo a simulated drop."""
-        board[row][col] = GameToken.EMPTY
+        self.position_hash ^= self.table.cell_key(row, col, self.board[row][col])
+        self.board[row][col] = GameToken.EMPTY
+        self.cells[row * self.cols + col] = 0
 
-    def check_winning_move(row, col, token):
+    def check_winning_move(self, row, col, token):
         """Check if placing a token creates a winning move."""
+        board = self.board
+        ROWS, COLS = self.rows, self.cols
         directions = [
             [(0, 1), (0, -1)],  # Horizontal
             [(1, 0), (-1, 0)],  # Vertical
@@ -68,171 +108,471 @@ def best_drop_position(board, player_token):
                     return True
         return False
 
-    def evaluate_board(token):
-        """Evaluate the board state and return a score for the current player."""
-        score = 0
-        for row in range(ROWS):
-            for col in range(COLS):
-                if board[row][col] == token:
-                    score += evaluate_position(row, col, token)
-                elif board[row][col] != GameToken.EMPTY:
-                    opponent_token = GameToken.RED if token == GameToken.YELLOW else GameToken.YELLOW
-                    score -= evaluate_position(row, col, opponent_token)
-        return score
-
-    def evaluate_position(row, col, token):
-        """Evaluate the strength of a given position."""
-        score = 0
-        directions = [
-            [(0, 1), (0, -1)],  # Horizontal
-            [(1, 0), (-1, 0)],  # Vertical
-            [(1, 1), (-1, -1)],  # Diagonal (bottom-left to top-right)
-            [(1, -1), (-1, 1)],  # Diagonal (top-left to bottom-right)
-        ]
+    def evaluate_board(self, token):
+        """Evaluate the board state and return a score for the given player."""
+        score = evaluate(self.cells, self.windows)
+        return score if token == self.player_token else -score
 
-        for direction in directions:
-            count = 1
-            open_ends = 0
-            for dx, dy in direction:
-                r, c = row, col
-                while 0 <= r + dx < ROWS and 0 <= c + dy < COLS and (board[r + dx][c + dy] == token or board[r + dx][c + dy] == GameToken.EMPTY):
-                    if board[r + dx][c + dy] == token:
-                        count += 1
-                    elif board[r + dx][c + dy] == GameToken.EMPTY:
-                        open_ends += 1
-                    r += dx
-                    c += dy
-                if count >= 4:
-                    return float('inf')  # Immediate win
-            if open_ends > 0:
-                score += count * (open_ends + 1)
-        return score
+    def evaluate_children(self, moves):
+        """
+        Evaluate the boards after each of the given (row, col, token) drops in one batch.
+
+        Returns:
+            list[int]: The scores for player_token, in the order of moves
+        """
+        children = np.repeat(self.cells[np.newaxis, :], len(moves), axis=0)
+        for index, (row, col, token) in enumerate(moves):
+            children[index, row * self.cols + col] = 1 if token == self.player_token else -1
+        return evaluate_batch(children, self.windows).tolist()
+
+    def ordered_moves(self, entry, ply, on_pv):
+        """
+        Returns the valid moves in search order: principal variation move first,
+        then the best move stored in the table, then the remaining columns.
+        """
+        valid_moves = [col for col in range(self.cols) if self.is_valid_move(col)]
+        entry_move = entry[3] if entry is not None else None
+        if entry_move in valid_moves:
+            valid_moves.remove(entry_move)
+            valid_moves.insert(0, entry_move)
+
+        # the previous iteration's principal variation goes first
+        pv_move = self.pv[ply] if on_pv and ply < len(self.pv) else None
+        if pv_move in valid_moves:
+            valid_moves.remove(pv_move)
+            valid_moves.insert(0, pv_move)
+        return valid_moves, pv_move
 
-    def minimax(depth, maximizing_player, alpha, beta):
-        """Minimax algorithm with alpha-beta pruning."""
-        opponent_token = GameToken.RED if player_token == GameToken.YELLOW else GameToken.YELLOW
+    def minimax(self, depth, maximizing_player, alpha, beta, ply=0, on_pv=False):
+        """Minimax algorithm with alpha-beta pruning and a transposition table."""
+        if self.check_time and time.monotonic() > self.deadline:
+            raise SearchTimeout()
+        player_token = self.player_token
+        opponent_token = self.opponent_token
+        table = self.table
 
         # Base cases
         if depth == 0:
-            return evaluate_board(player_token), None
+            return self.evaluate_board(player_token), None
 
-        valid_moves = [col for col in range(COLS) if is_valid_move(col)]
+        # Reuse a stored result if it was searched deep enough, else use its move first
+        key = self.position_hash ^ table.side_key(maximizing_player)
+        entry = table.lookup(key)
+        valid_moves, pv_move = self.ordered_moves(entry, ply, on_pv)
         if not valid_moves:
-            return evaluate_board(player_token), None
+            return self.evaluate_board(player_token), None
+
+        alpha_orig, beta_orig = alpha, beta
+        if entry is not None:
+            entry_depth, entry_value, entry_bound, entry_move = entry
+            if entry_depth >= depth and entry_move is not None:
+                if entry_bound == Bound.EXACT:
+                    return entry_value, entry_move
+                if entry_bound == Bound.LOWER:
+                    alpha = max(alpha, entry_value)
+                elif entry_bound == Bound.UPPER:
+                    beta = min(beta, entry_value)
+                if beta <= alpha:
+                    return entry_value, entry_move
+
+        def store(value, best_col):
+            """Store the search result together with its bound type."""
+            if value <= alpha_orig:
+                bound = Bound.UPPER
+            elif value >= beta_orig:
+                bound = Bound.LOWER
+            else:
+                bound = Bound.EXACT
+            table.store(key, depth, value, bound, best_col)
+            return value, best_col
+
+        # children are leaves: score all of them in one batch
+        if depth == 1:
+            token = player_token if maximizing_player else opponent_token
+            drops = []
+            wins = []
+            for col in valid_moves:
+                row = self.simulate_drop(col, token)
+                wins.append(self.check_winning_move(row, col, token))
+                self.undo_drop(row, col)
+                drops.append((row, col, token))
+            leaf_values = self.evaluate_children(drops)
+        else:
+            leaf_values = None
 
         if maximizing_player:
             max_eval = -float('inf')
             best_col = None
-            for col in valid_moves:
-                row = simulate_drop(col, player_token)
-                if check_winning_move(row, col, player_token):
-                    undo_drop(row, col)
-                    return float('inf'), col
-                eval, _ = minimax(depth - 1, False, alpha, beta)
-                undo_drop(row, col)
+            for index, col in enumerate(valid_moves):
+                if leaf_values is not None:
+                    if wins[index]:
+                        return store(float('inf'), col)
+                    eval = leaf_values[index]
+                    if eval > max_eval:
+                        max_eval = eval
+                        best_col = col
+                    alpha = max(alpha, eval)
+                    if beta <= alpha:
+                        break
+                    continue
+                row = self.simulate_drop(col, player_token)
+                if self.check_winning_move(row, col, player_token):
+                    self.undo_drop(row, col)
+                    return store(float('inf'), col)
+                eval, _ = self.minimax(depth - 1, False, alpha, beta, ply + 1, col == pv_move)
+                self.undo_drop(row, col)
                 if eval > max_eval:
                     max_eval = eval
                     best_col = col
                 alpha = max(alpha, eval)
                 if beta <= alpha:
                     break
-            return max_eval, best_col
+            return store(max_eval, best_col)
         else:
             min_eval = float('inf')
             best_col = None
-            for col in valid_moves:
-                row = simulate_drop(col, opponent_token)
-                if check_winning_move(row, col, opponent_token):
-                    undo_drop(row, col)
-                    return -float('inf'), col
-                eval, _ = minimax(depth - 1, True, alpha, beta)
-                undo_drop(row, col)
+            for index, col in enumerate(valid_moves):
+                if leaf_values is not None:
+                    if wins[index]:
+                        return store(-float('inf'), col)
+                    eval = leaf_values[index]
+                    if eval < min_eval:
+                        min_eval = eval
+                        best_col = col
+                    beta = min(beta, eval)
+                    if beta <= alpha:
+                        break
+                    continue
+                row = self.simulate_drop(col, opponent_token)
+                if self.check_winning_move(row, col, opponent_token):
+                    self.undo_drop(row, col)
+                    return store(-float('inf'), col)
+                eval, _ = self.minimax(depth - 1, True, alpha, beta, ply + 1, col == pv_move)
+                self.undo_drop(row, col)
                 if eval < min_eval:
                     min_eval = eval
                     best_col = col
                 beta = min(beta, eval)
                 if beta <= alpha:
                     break
-            return min_eval, best_col
+            return store(min_eval, best_col)
 
-    # Start the minimax algorithm
-    _, best_column = minimax(MAX_DEPTH, True, -float('inf'), float('inf'))
-    return best_column if best_column is not None else -1
+    def search_root_move(self, col, depth, alpha):
+        """
+        Search a single root move with the window (alpha, inf).
 
+        Returns:
+            float: The value of the move, exact if it is above alpha
+        """
+        row = self.simulate_drop(col, self.player_token)
+        try:
+            if self.check_winning_move(row, col, self.player_token):
+                return float('inf')
+            value, _ = self.minimax(depth - 1, False, alpha, float('inf'), 1,
+                                    bool(self.pv) and col == self.pv[0])
+            return value
+        finally:
+            self.undo_drop(row, col)
+
+    def principal_variation(self, depth):
+        """Follow the best moves stored in the table from the root."""
+        line = []
+        played = []
+        maximizing_player = True
+        while len(line) < depth:
+            entry = self.table.lookup(self.position_hash ^ self.table.side_key(maximizing_player))
+            if entry is None or entry[3] is None or not self.is_valid_move(entry[3]):
+                break
+            col = entry[3]
+            line.append(col)
+            token = self.player_token if maximizing_player else self.opponent_token
+            played.append((self.simulate_drop(col, token), col))
+            maximizing_player = not maximizing_player
+        for row, col in reversed(played):
+            self.undo_drop(row, col)
+        return line
 
 
-class PlayerCoordinator:
+# Per-process state of the parallel root search workers, set by _init_worker
+_worker_table = None
+_shared_alpha = None
+
+
+def _init_worker(shared_alpha):
+    """Initialize a worker process of the parallel root search."""
+    global _worker_table, _shared_alpha
+    _worker_table = TranspositionTable(size=TABLE_SIZE >> 2)
+    _shared_alpha = shared_alpha
+
+
+def _tie_safe_alpha(alpha):
     """
-    Coordinates players actions and game flow in a networked Connect Four game.
-    
-    Attributes:
-        _player (PlayerConsole | PlayerSenseHat): The local player instance
+    Lower the shared alpha just enough that a move of equal value is still
+    searched exactly. Scores are integers (or +-inf), so this keeps ties
+    distinguishable and the parallel search picks the same move as the serial one.
+    """
+    if alpha == float('inf'):
+        return sys.float_info.max
+    if alpha == -float('inf'):
+        return alpha
+    return alpha - 1
+
 
+def _search_root_move_worker(board, player_token, col, depth, deadline, pv):
     """
-    def __init__(self):
+    Search one root move in a worker process, sharing alpha with the other workers.
+
+    Returns:
+        float | None: The value of the move, None if the time budget ran out
+    """
+    _worker_table.new_search()
+    search = MinimaxSearch(board, player_token, _worker_table, deadline)
+    search.check_time = deadline is not None
+    search.pv = pv
+    try:
+        value = search.search_root_move(col, depth, _tie_safe_alpha(_shared_alpha.value))
+    except SearchTimeout:
+        return None
+    with _shared_alpha.get_lock():
+        if value > _shared_alpha.value:
+            _shared_alpha.value = value
+    return value
+
+
+class SearchPool:
+    """
+    Worker processes of the parallel root search, kept for many searches so the
+    process startup isn't paid within the time budget of every move.
+
+    Attributes:
+        executor (ProcessPoolExecutor): The worker processes
+        shared_alpha (multiprocessing.Value): Best value of the current iteration, shared by the workers
+    """
+    def __init__(self, workers: int, tables: bool = True):
         """
-        Initialize the player coordinator with appropriate player type.
+        Args:
+            workers (int): Number of worker processes
+            tables (bool): Give every worker a transposition table for the minimax search;
+                the workers of mcts.best_drop_position need none
         """
-        # initialize players
-        if os.name != 'nt':
-            self._player = PlayerSenseHat(GameToken.RED) if color == 'red' else PlayerSenseHat(GameToken.YELLOW)
+        self.shared_alpha = multiprocessing.Value('d', -float('inf'))
+        if tables:
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                initargs=(self.shared_alpha,))
         else:
-            self._player = PlayerConsole(GameToken.RED) if color == 'red' else PlayerConsole(GameToken.YELLOW)
+            self.executor = ProcessPoolExecutor(max_workers=workers)
 
-    def run(self, game: GameLogicBase):
+    def close(self) -> None:
         """
-        Run the networked game loop, coordinating with remote player.
-        
-        Args:
-            game (GameLogicBase): The game logic instance managing rules and state.
-        
-        """
-        self._player.draw_board(game.get_board(), game.get_state())
-        opponentTurnState =  (GameState.TURN_YELLOW if self._player.player_id == GameToken.RED 
-                            else GameState.TURN_RED)
-        # play game until won or draw
-        while (True):
-            # Get current player based on state
-            game_state = game.get_state()
-
-            #Check if game is over
-            if game_state in [GameState.WON_YELLOW, GameState.WON_RED, GameState.DRAW]:
-                if game_state in [GameState.WON_YELLOW, GameState.WON_RED]:
-                    winner_token = (GameToken.RED if game_state == GameState.WON_RED 
-                                    else GameToken.YELLOW)
-                    self._player.display_winner(winner_token)
-                break
+        Stop the worker processes.
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'SearchPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _parallel_root_search(search: MinimaxSearch, depth, executor, shared_alpha):
+    """
+    Search all root moves at the given depth, Young-Brothers-Wait style: the first
+    (eldest) move is searched locally to establish alpha, the remaining moves are
+    searched in parallel by the executor's workers.
+
+    Returns:
+        tuple: (value, best column), the same result as search.minimax at the root
+    """
+    table = search.table
+    key = search.position_hash ^ table.side_key(True)
+    valid_moves, _ = search.ordered_moves(table.lookup(key), 0, True)
+    if not valid_moves:
+        return search.evaluate_board(search.player_token), None
+
+    eldest = valid_moves[0]
+    values = {eldest: search.search_root_move(eldest, depth, -float('inf'))}
+    shared_alpha.value = values[eldest]
+    if values[eldest] != float('inf'):
+        futures = {col: executor.submit(_search_root_move_worker, search.board, search.player_token,
+                                        col, depth, search.deadline if search.check_time else None,
+                                        search.pv)
+                   for col in valid_moves[1:]}
+        for col, future in futures.items():
+            values[col] = future.result()
+        if None in values.values():
+            raise SearchTimeout()
 
-            #Wait aslong as its not your turn
-            while(game_state == opponentTurnState):
-                time.sleep(POLL_DELAY)
-                game_state = game.get_state()
-
-            self._player.draw_board(game.get_board(), game_state)
-            #Check again if game is over
-            if game_state in [GameState.WON_YELLOW, GameState.WON_RED, GameState.DRAW]:
-                if game_state in [GameState.WON_YELLOW, GameState.WON_RED]:
-                    winner_token = (GameToken.RED if game_state == GameState.WON_RED 
-                                    else GameToken.YELLOW)
-                    self._player.display_winner(winner_token)
+    # first move in search order with the highest value, like the serial search
+    best_col = None
+    best_value = -float('inf')
+    for col in valid_moves:
+        if col in values and values[col] > best_value:
+            best_value = values[col]
+            best_col = col
+    table.store(key, depth, best_value, Bound.EXACT, best_col)
+    return best_value, best_col
+
+
+def best_drop_position(board, player_token, table: TranspositionTable = None,
+                       max_depth: int = None, time_budget_ms: int = None, workers: int = 1,
+                       pool: SearchPool = None):
+    """
+    Determines the best column to drop a token for the current player using a Minimax algorithm.
+
+    The search is run as iterative deepening: depth 1, 2, ... up to max_depth. Each
+    iteration tries the principal variation of the previous one first, which makes
+    alpha-beta cut off early. With a time budget, the iteration running when the
+    time is up is aborted and the move of the deepest completed iteration is returned.
+
+    With more than one worker, the root moves of every iteration after the first are
+    searched in parallel processes. The chosen move is the same as with the serial
+    search at the same depth. Pass a SearchPool to reuse its processes; otherwise
+    they are started (and stopped) within this call.
+
+    Args:
+        board (list[list[GameToken]]): The game board as a 2D list.
+        player_token (GameToken): The token of the current player (RED or YELLOW).
+        table (TranspositionTable): Table of already searched positions. Pass the same
+            table for every move of a game to reuse results between calls.
+            A fresh table is used if None.
+        max_depth (int): Maximum number of plies to search. Defaults to MAX_DEPTH
+            without a time budget and to the number of empty cells with one.
+        time_budget_ms (int): Thinking time in milliseconds, None for no limit.
+        workers (int): Number of worker processes, 1 for a serial search. Ignored with a pool.
+        pool (SearchPool): Worker processes to search with, None to start them if workers > 1.
+
+    Returns:
+        int: The index of the best column to drop the token.
+    """
+    empty_cells = sum(1 for row in board for token in row if token == GameToken.EMPTY)
+    if max_depth is None:
+        max_depth = MAX_DEPTH if time_budget_ms is None else empty_cells
+    max_depth = min(max_depth, empty_cells)
+    deadline = None if time_budget_ms is None else time.monotonic() + time_budget_ms / 1000
+
+    if table is None:
+        table = TranspositionTable(size=1 << 16, rows=len(board), cols=len(board[0]))
+    table.new_search()
+    search = MinimaxSearch(board, player_token, table, deadline)
+
+    own_pool = None
+    if pool is None and workers > 1 and max_depth > 1:
+        pool = own_pool = SearchPool(workers)
+    use_pool = pool is not None and max_depth > 1
+
+    # Start the minimax algorithm, one iteration per depth
+    best_column = None
+    try:
+        for depth in range(1, max_depth + 1):
+            try:
+                if use_pool and depth > 1:
+                    value, column = _parallel_root_search(search, depth, pool.executor, pool.shared_alpha)
+                else:
+                    value, column = search.minimax(depth, True, -float('inf'), float('inf'), 0, True)
+            except SearchTimeout:
+                break
+            if column is not None:
+                best_column = column
+            search.pv = search.principal_variation(depth)
+            if search.pv and search.pv[0] != best_column:
+                search.pv = [best_column]
+            search.check_time = deadline is not None
+            if value in (float('inf'), -float('inf')): # forced result found, deeper search won't change it
                 break
+    finally:
+        if own_pool is not None:
+            own_pool.close()
+    return best_column if best_column is not None else -1
+
+
+class SearchBot(BotPlayer):
+    """
+    The search bot as a participant of the game coordinator.
+
+    Attributes:
+        _solver (Solver | None): The perfect-play solver, None if not in exact mode
+        _book (OpeningBook | None): The opening book, None if no book file was generated
+        _engine (str): The search engine, 'minimax' or 'mcts'
+        _table (TranspositionTable): Transposition table of the current game (minimax)
+        _tree (mcts.MctsTree): Search tree of the current game (mcts)
+        _pool (SearchPool | None): Worker processes of the current game, None for a serial search
+
+    """
+    def __init__(self, token: GameToken, view: PlayerBase = None, exact: bool = EXACT_MODE, engine: str = ENGINE):
+        """
+        Initialize the bot and its search state.
+
+        Args:
+            token (GameToken): The token of the bot
+            view (PlayerBase): Player whose display shows the game, None for no display
+            exact (bool): Use the solver (with its persistent position cache) to pick moves.
+                Positions it can't solve within the time budget fall back to the search engine.
+            engine (str): 'minimax' for best_drop_position, 'mcts' for mcts.best_drop_position.
+        """
+        if engine not in ('minimax', 'mcts'):
+            raise ValueError(f"Unknown engine {engine}")
+        super().__init__(token, self._search, view)
+        self._engine = engine
+        self._table = TranspositionTable(size=TABLE_SIZE)
+        self._tree = mcts.MctsTree()
+        self._solver = Solver() if exact else None
+        self._book = OpeningBook(BOOK_PATH) if os.path.exists(BOOK_PATH) else None
+        self._pool = None
+
+    def new_game(self) -> None:
+        """
+        Start the search state of a new game; it is reused for every move of the game.
+        The worker processes are started here, outside the time budget of the moves.
+        """
+        self._table.clear()
+        self._tree = mcts.MctsTree()
+        if WORKERS > 1 and self._pool is None:
+            self._pool = SearchPool(WORKERS, tables=self._engine == 'minimax')
+
+    def end_game(self) -> None:
+        """
+        Stop the worker processes of the game.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _search(self, board: list, token: GameToken) -> int:
+        """
+        Choose the column to drop, within TIME_BUDGET_MS.
 
-            # Player's turn
-            valid = DropState.COLUMN_INVALID
-            while valid != DropState.DROP_OK:
-                column_to_drop = best_drop_position(game.get_board(),self._player.player_id)
-                try:
-                    valid = game.drop_token(self._player.player_id, column_to_drop)
-                except:
-                    while valid != DropState.DROP_OK:
-                        valid = game.drop_token(self._player.player_id, random.randint(0,6))
-                        print("random!!!!!")
+        Args:
+            board (list[list[GameToken]]): The current game board.
+            token (GameToken): The token of the bot.
+
+        Returns:
+            int: The column to drop the token into.
+        """
+        if self._book is not None:
+            column = self._book.lookup(board, token)
+            if column is not None and board[0][column] == GameToken.EMPTY:
+                return column
+        budget_ms = TIME_BUDGET_MS
+        if self._solver is not None:
+            start = time.monotonic()
+            try:
+                return self._solver.best_move(board, token, time_budget_ms=int(budget_ms * SOLVER_SHARE))
+            except SolverTimeout:
+                budget_ms = max(1, budget_ms - int((time.monotonic() - start) * 1000))
+        if self._engine == 'mcts':
+            return mcts.best_drop_position(board, token, time_budget_ms=budget_ms,
+                                           tree=self._tree, workers=WORKERS,
+                                           executor=None if self._pool is None else self._pool.executor)
+        return best_drop_position(board, token, self._table, time_budget_ms=budget_ms,
+                                  workers=WORKERS, pool=self._pool)
 
 # start a remote game
 if __name__ == '__main__':
+    token = GameToken.RED if color == 'red' else GameToken.YELLOW
+    opponent = GameToken.YELLOW if token == GameToken.RED else GameToken.RED
     game = GameLogicClient(host=host)
-    coordinator = PlayerCoordinator()
+    coordinator = GameCoordinator([SearchBot(token, view=create_player(token)), RemotePlayer(opponent)])
     while(True):
         coordinator.run(game)
-        time.sleep(1) #wait for restart
-
+        coordinator.wait_for_next_game(game)
@@ -1,89 +1,52 @@
-import os
-if os.name != 'nt':
-    from player_sensehat import PlayerSenseHat
-from player_console import PlayerConsole
 from game_token import GameToken
-from game_state import *
-from drop_state import DropState
-from game_logic_base import GameLogicBase
-from game_logic import GameLogic
 from game_logic_client import GameLogicClient
-import time
+from game_coordinator import GameCoordinator, HumanPlayer, RemotePlayer, create_player, FINISHED
+import argparse
+import asyncio
 
-POLL_DELAY = 0.5 #Seconds
+"""
+Networked game: the local player against a remote opponent
+
+The game loop is the one of game_coordinator; this script only sets it up.
+The player uses the Sense HAT, on Windows the console. The game runs on an
+event loop (GameCoordinator.run_async), ESC ends it and the script.
+
+Usage:
+    python3 player_coordinator.py --color yellow --host virtualsquash.ch:5000
+"""
 
 color = 'red'
 # color = 'yellow'
 host = 'virtualsquash.ch:5000'
 
-class PlayerCoordinator:
-    """
-    Coordinates players actions and game flow in a networked Connect Four game.
-    
-    Attributes:
-        _player (PlayerConsole | PlayerSenseHat): The local player instance
 
+class PlayerCoordinator(GameCoordinator):
     """
-    def __init__(self):
+    Coordinates the local player and a remote opponent in a networked Connect Four game.
+    """
+    def __init__(self, player_color: str = None):
         """
         Initialize the player coordinator with appropriate player type.
-        """
-        # initialize players
-        if os.name != 'nt':
-            self._player = PlayerSenseHat(GameToken.RED) if color == 'red' else PlayerSenseHat(GameToken.YELLOW)
-        else:
-            self._player = PlayerConsole(GameToken.RED) if color == 'red' else PlayerConsole(GameToken.YELLOW)
 
-    def run(self, game: GameLogicBase):
-        """
-        Run the networked game loop, coordinating with remote player.
-        
         Args:
-            game (GameLogicBase): The game logic instance managing rules and state.
-        
+            player_color (str): 'red' or 'yellow', the module's color if None
         """
-        self._player.draw_board(game.get_board(), game.get_state())
-        opponentTurnState =  (GameState.TURN_YELLOW if self._player.player_id == GameToken.RED 
-                            else GameState.TURN_RED)
-        # play game until won or draw
-        while (True):
-            # Get current player based on state
-            game_state = game.get_state()
-
-            #Check if game is over
-            if game_state in [GameState.WON_YELLOW, GameState.WON_RED, GameState.DRAW]:
-                if game_state in [GameState.WON_YELLOW, GameState.WON_RED]:
-                    winner_token = (GameToken.RED if game_state == GameState.WON_RED 
-                                    else GameToken.YELLOW)
-                    self._player.display_winner(winner_token)
-                break
-
-            #Wait aslong as its not your turn
-            while(game_state == opponentTurnState):
-                time.sleep(POLL_DELAY)
-                game_state = game.get_state()
-
-            self._player.draw_board(game.get_board(), game_state)
-            #Check again if game is over
-            if game_state in [GameState.WON_YELLOW, GameState.WON_RED, GameState.DRAW]:
-                if game_state in [GameState.WON_YELLOW, GameState.WON_RED]:
-                    winner_token = (GameToken.RED if game_state == GameState.WON_RED 
-                                    else GameToken.YELLOW)
-                    self._player.display_winner(winner_token)
-                break
-
-            # Player's turn
-            valid = DropState.COLUMN_INVALID
-            while valid != DropState.DROP_OK:
-                column_to_drop = self._player.play_turn()
-                valid = game.drop_token(self._player.player_id, column_to_drop)
-            self._player.draw_board(game.get_board(), game.get_state())
+        token = GameToken.RED if (player_color or color) == 'red' else GameToken.YELLOW
+        opponent = GameToken.YELLOW if token == GameToken.RED else GameToken.RED
+        super().__init__([HumanPlayer(create_player(token)), RemotePlayer(opponent)])
 
 # start a remote game
 if __name__ == '__main__':
-    game = GameLogicClient(host=host)
-    coordinator = PlayerCoordinator()
-    while(True):
-        coordinator.run(game)
-        time.sleep(1) #wait for restart
+    parser = argparse.ArgumentParser(description="Play against a remote opponent")
+    parser.add_argument('--color', default=color, choices=['red', 'yellow'], help="color of the local player")
+    parser.add_argument('--host', default=host, help="address of the game server")
+    args = parser.parse_args()
+
+    game = GameLogicClient(host=args.host)
+    coordinator = PlayerCoordinator(args.color)
+
+    async def play():
+        while await coordinator.run_async(game) in FINISHED:
+            await asyncio.to_thread(coordinator.wait_for_next_game, game) # the server resets a finished game
 
+    asyncio.run(play())
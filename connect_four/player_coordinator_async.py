@@ -0,0 +1,124 @@
+from game_token import GameToken
+from game_state import GameState
+from game_logic_client_async import AsyncGameLogicClient
+import argparse
+import asyncio
+import random
+import time
+
+"""
+asyncio coordinator for remote bots
+
+Plays a remote game on a single event loop: while the opponent moves, the
+coordinator waits in a long poll, and the bot's move is computed in a worker
+thread so other games on the same loop keep going. Many coordinators on one
+loop make a bot farm or a load test for the game server.
+
+Usage (bot farm: 100 games, two bots per game, all in one process):
+    python3 player_coordinator_async.py --host 127.0.0.1:5000 --games 100
+
+Classes:
+    AsyncPlayerCoordinator: Plays one remote game with a bot
+"""
+
+FINISHED = [GameState.WON_RED, GameState.WON_YELLOW, GameState.DRAW]
+
+
+def random_column(board: list, player_token: GameToken) -> int:
+    """
+    A bot dropping into a random column that is not full.
+    """
+    return random.choice([col for col in range(len(board[0])) if board[0][col] == GameToken.EMPTY])
+
+
+class AsyncPlayerCoordinator:
+    """
+    Plays one remote game for a bot.
+
+    Attributes:
+        _player_id (GameToken): The token of the bot
+        _choose_column (callable): choose_column(board, player_token) -> column, called in a worker thread
+    """
+    def __init__(self, player_id: GameToken, choose_column=random_column):
+        """
+        Args:
+            player_id (GameToken): The token of the bot
+            choose_column (callable): choose_column(board, player_token) -> column
+        """
+        self._player_id = player_id
+        self._choose_column = choose_column
+
+    @property
+    def player_id(self) -> GameToken:
+        return self._player_id
+
+    async def run(self, game: AsyncGameLogicClient) -> GameState:
+        """
+        Play the game until it is won or drawn.
+
+        Args:
+            game (AsyncGameLogicClient): The remote game
+
+        Returns:
+            GameState: The final state of the game
+        """
+        own_turn = GameState.TURN_RED if self._player_id == GameToken.RED else GameState.TURN_YELLOW
+        board, game_state = await game.get_snapshot()
+        while game_state not in FINISHED:
+            if game_state != own_turn:
+                game_state = await game.wait_for_change()
+                if game_state == own_turn:
+                    board, game_state = await game.get_snapshot()
+                continue
+            column = await asyncio.to_thread(self._choose_column, board, self._player_id)
+            await game.drop_token(self._player_id, column)
+            board, game_state = await game.get_snapshot()
+        return game_state
+
+
+async def play_games(host: str, games: int, choose_column=random_column) -> list:
+    """
+    Create games on the server and let two bots play each of them.
+
+    Args:
+        host (str): The host address of the server
+        games (int): Number of games played at the same time
+        choose_column (callable): The bot of both players
+
+    Returns:
+        list[GameState]: The final state of every game
+    """
+    # every game holds a long poll of one bot and a request of the other one
+    session = AsyncGameLogicClient.create_session(pool_size=2 * games)
+    try:
+        async def play():
+            red = AsyncGameLogicClient(host, session=session)
+            game_id = await red.create_game()
+            yellow = AsyncGameLogicClient(host, game_id, session=session)
+            results = await asyncio.gather(AsyncPlayerCoordinator(GameToken.RED, choose_column).run(red),
+                                           AsyncPlayerCoordinator(GameToken.YELLOW, choose_column).run(yellow))
+            return results[0]
+        return await asyncio.gather(*(play() for _ in range(games)))
+    finally:
+        await session.close()
+
+
+# start a bot farm
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Let bots play many remote games at once")
+    parser.add_argument('--host', default='127.0.0.1:5000', help="address of the game server")
+    parser.add_argument('--games', type=int, default=10, help="number of games played at the same time")
+    parser.add_argument('--depth', type=int, default=0, help="minimax depth of the bots, 0 for random bots")
+    args = parser.parse_args()
+
+    choose_column = random_column
+    if args.depth > 0:
+        from player_bot import best_drop_position
+        choose_column = lambda board, token: best_drop_position(board, token, max_depth=args.depth)
+
+    start = time.monotonic()
+    results = asyncio.run(play_games(args.host, args.games, choose_column))
+    duration = time.monotonic() - start
+    print(f"{len(results)} games in {duration:.1f}s: "
+          f"{results.count(GameState.WON_RED)} red, {results.count(GameState.WON_YELLOW)} yellow, "
+          f"{results.count(GameState.DRAW)} draws")
@@ -0,0 +1,287 @@
+import bisect
+import sys
+import threading
+import time
+from collections import Counter
+
+"""
+Instrumentation of the game server
+
+Counters, histograms and gauges rendered in the Prometheus text exposition
+format, lock wrappers measuring how long threads wait to acquire a lock, and
+a sampling profiler that can be switched on and off while the server runs.
+
+The profiler looks at the stacks of all threads every few milliseconds and
+counts how often each stack was seen. The result is in the "folded stacks"
+format (one line `frame;frame;frame count` per stack), which flame graph
+tools read directly.
+
+Classes:
+    Metrics: Collection of all metrics of the server
+    TimedLock: threading.Lock that records its wait times
+    SamplingProfiler: Stack sampling profiler running in a background thread
+"""
+
+# upper bounds of the histogram buckets in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LOCK_WAIT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+PROFILE_INTERVAL = 0.005  # seconds between two samples of the profiler
+PROFILE_DEPTH = 30        # innermost frames kept per stack
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class _Histogram:
+    """
+    Cumulative histogram of one label combination.
+    """
+    def __init__(self, buckets: tuple):
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, buckets: tuple, value: float) -> None:
+        self.counts[bisect.bisect_left(buckets, value)] += 1
+        self.total += value
+
+
+class Metrics:
+    """
+    All metrics of the server, safe to update from any thread.
+
+    Attributes:
+        _lock (threading.Lock): Protects the values
+        _counters (dict): Name -> (help, label names, {label values: count})
+        _histograms (dict): Name -> (help, label names, buckets, {label values: _Histogram})
+        _gauges (dict): Name -> (help, callable returning the current value)
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+
+    def counter(self, name: str, help_text: str, label_names: tuple = ()) -> None:
+        """
+        Declare a counter.
+        """
+        self._counters[name] = (help_text, label_names, {})
+
+    def histogram(self, name: str, help_text: str, label_names: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> None:
+        """
+        Declare a histogram.
+        """
+        self._histograms[name] = (help_text, label_names, buckets, {})
+
+    def gauge(self, name: str, help_text: str, read) -> None:
+        """
+        Declare a gauge whose value is read by calling read() when the metrics are rendered.
+        """
+        self._gauges[name] = (help_text, read)
+
+    def inc(self, name: str, *label_values, amount: float = 1) -> None:
+        """
+        Increment a counter.
+        """
+        values = self._counters[name][2]
+        with self._lock:
+            values[label_values] = values.get(label_values, 0) + amount
+
+    def observe(self, name: str, value: float, *label_values) -> None:
+        """
+        Add a value to a histogram.
+        """
+        _, _, buckets, values = self._histograms[name]
+        with self._lock:
+            if label_values not in values:
+                values[label_values] = _Histogram(buckets)
+            values[label_values].observe(buckets, value)
+
+    def timed_lock(self, name: str) -> 'TimedLock':
+        """
+        Returns a new lock whose contended waits are recorded in lock_wait_seconds{lock=name}.
+        """
+        return TimedLock(self, name)
+
+    def render(self) -> str:
+        """
+        Returns all metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            for name, (help_text, label_names, values) in self._counters.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for label_values, count in sorted(values.items()):
+                    lines.append(f"{name}{_labels(label_names, label_values)} {count}")
+            for name, (help_text, label_names, buckets, values) in self._histograms.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for label_values, histogram in sorted(values.items()):
+                    cumulative = 0
+                    for bound, count in zip(buckets + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        bucket_labels = _labels(label_names + ('le',), label_values + (bound,))
+                        lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(label_names, label_values)} {histogram.total}")
+                    lines.append(f"{name}_count{_labels(label_names, label_values)} {cumulative}")
+        for name, (help_text, read) in self._gauges.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {read()}"]
+        return '\n'.join(lines) + '\n'
+
+
+class TimedLock:
+    """
+    A threading.Lock that records how long acquire() waited when the lock was held.
+
+    An uncontended acquire records nothing, so it doesn't touch the lock of
+    the metrics and locks stay as independent as without measuring.
+
+    Attributes:
+        _lock (threading.Lock): The wrapped lock
+        _metrics (Metrics): Receives the wait times
+        _name (str): Value of the lock label
+    """
+    def __init__(self, metrics: Metrics, name: str):
+        self._lock = threading.Lock()
+        self._metrics = metrics
+        self._name = name
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        # an uncontended lock is taken without measuring
+        if self._lock.acquire(False):
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        acquired = self._lock.acquire(True, timeout)
+        self._metrics.observe("lock_wait_seconds", time.perf_counter() - start, self._name)
+        return acquired
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads in a background thread while enabled.
+
+    Attributes:
+        _interval (float): Seconds between two samples
+        _stacks (collections.Counter): Folded stack -> number of samples
+        _samples (int): Number of samples taken
+        _thread (threading.Thread | None): The sampling thread, None while disabled
+        _stop (threading.Event): Set to end the sampling thread
+        _lock (threading.Lock): Protects the samples and the thread
+    """
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self._interval = interval
+        self._stacks = Counter()
+        self._samples = 0
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None
+
+    def start(self, interval: float = None) -> None:
+        """
+        Start sampling; a running profiler keeps its samples.
+        """
+        with self._lock:
+            if interval is not None:
+                self._interval = interval
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling, the samples are kept until reset().
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def reset(self) -> None:
+        """
+        Drop all samples.
+        """
+        with self._lock:
+            self._stacks.clear()
+            self._samples = 0
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self._interval):
+            frames = sys._current_frames()
+            stacks = []
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < PROFILE_DEPTH:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stacks.append(';'.join(reversed(stack)))
+            with self._lock:
+                self._stacks.update(stacks)
+                self._samples += 1
+
+    def folded(self, limit: int = None) -> str:
+        """
+        Returns the samples in folded stacks format, most frequent stacks first.
+
+        Args:
+            limit (int): Number of stacks returned, all if None
+        """
+        with self._lock:
+            stacks = self._stacks.most_common(limit)
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks)
+
+    @property
+    def samples(self) -> int:
+        return self._samples
+
+
+if __name__ == '__main__':
+    metrics = Metrics()
+    metrics.counter("requests_total", "Handled requests", ("route",))
+    metrics.histogram("lock_wait_seconds", "Time spent waiting for locks held by another thread",
+                      ("lock",), LOCK_WAIT_BUCKETS)
+    lock = metrics.timed_lock("demo")
+    def hold():
+        with lock:
+            time.sleep(0.01)
+    holder = threading.Thread(target=hold)
+    with lock:
+        holder.start()
+        time.sleep(0.005) # the holder waits for the lock
+    holder.join()
+    for _ in range(3):
+        with lock:
+            metrics.inc("requests_total", "/api/board")
+    profiler = SamplingProfiler()
+    profiler.start()
+    sum(i * i for i in range(2_000_000))
+    profiler.stop()
+    print(metrics.render())
+    print(f"{profiler.samples} samples, top stack:\n{profiler.folded(1)}")
@@ -0,0 +1,355 @@
+from game_token import GameToken
+from game_logic_bitboard import ROWS, COLS, HEIGHT, board_to_bitboards
+import mmap
+import os
+import time
+
+"""
+Perfect-play Connect Four Solver
+
+Negamax with alpha-beta pruning on bitboards (see game_logic_bitboard for the
+bit layout). The exact score of a position is found with a series of
+null-window searches that narrow the possible score range. Upper bounds found
+during the search are kept in a memory-mapped file, so the cache survives
+restarts and the solver gets faster the more positions it has seen.
+
+Score of a position (from the view of the side to move):
+    - positive: the side to move wins; the earlier the win, the higher the score
+                (1 if it wins with its very last token)
+    - 0:        draw
+    - negative: the side to move loses
+
+Classes:
+    SolverTimeout: Raised when a solve exceeds its time budget
+    PositionCache: Persistent memory-mapped cache of position bounds
+    Solver: Computes exact scores and best moves
+"""
+
+SIZE = ROWS * COLS
+MIN_SCORE = -SIZE // 2 + 3
+MAX_SCORE = (SIZE + 1) // 2 - 3
+
+BOTTOM_MASK = sum(1 << (col * HEIGHT) for col in range(COLS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+
+# center columns first, they take part in most lines of four
+COLUMN_ORDER = sorted(range(COLS), key=lambda col: abs(COLS // 2 - col))
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'solver_cache.bin')
+CACHE_SLOTS = 4194301  # prime, 8 bytes per slot => 32 MB
+
+
+def top_mask(col: int) -> int:
+    return 1 << (ROWS - 1 + col * HEIGHT)
+
+
+def bottom_mask(col: int) -> int:
+    return 1 << (col * HEIGHT)
+
+
+def column_mask(col: int) -> int:
+    return ((1 << ROWS) - 1) << (col * HEIGHT)
+
+
+def winning_cells(position: int, mask: int) -> int:
+    """
+    Returns the empty cells that would complete a line of four for position.
+
+    Args:
+        position (int): Bitboard of one player
+        mask (int): Bitboard of all occupied cells
+    """
+    # vertical
+    result = (position << 1) & (position << 2) & (position << 3)
+
+    # horizontal and both diagonals
+    for shift in (HEIGHT, HEIGHT - 1, HEIGHT + 1):
+        pair = (position << shift) & (position << (2 * shift))
+        result |= pair & (position << (3 * shift))
+        result |= pair & (position >> shift)
+        pair = (position >> shift) & (position >> (2 * shift))
+        result |= pair & (position << shift)
+        result |= pair & (position >> (3 * shift))
+
+    return result & (BOARD_MASK ^ mask)
+
+
+class SolverTimeout(Exception):
+    """
+    Raised when the solver exceeds its time budget.
+    """
+
+
+class PositionCache:
+    """
+    Fixed-size hash table of position bounds stored in a memory-mapped file.
+
+    Every slot is one 64-bit word: ``key << 8 | value``. The key (current
+    player's bitboard + mask) identifies a position uniquely and fits in 49
+    bits, the value is an encoded upper bound of the position's score (0 = empty
+    slot). A new entry always replaces the old one in its slot.
+
+    Attributes:
+        _slots (int): Number of slots in the file
+        _file: The open cache file
+        _mmap (mmap.mmap): Memory map of the file
+        _table (memoryview): The map viewed as 64-bit unsigned integers
+    """
+    def __init__(self, path: str = CACHE_PATH, slots: int = CACHE_SLOTS):
+        """
+        Open the cache file, creating it if it doesn't exist yet.
+
+        Args:
+            path (str): Path of the cache file
+            slots (int): Number of entries; must match the size of an existing file
+        """
+        size = slots * 8
+        if not os.path.exists(path):
+            with open(path, 'wb') as file:
+                file.truncate(size)
+        elif os.path.getsize(path) != size:
+            raise ValueError(f"Cache file {path} does not hold {slots} slots")
+        self._slots = slots
+        self._file = open(path, 'r+b')
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        self._table = memoryview(self._mmap).cast('Q')
+
+    def get(self, key: int) -> int:
+        """
+        Returns the stored value for key, 0 if the position is not stored.
+        """
+        entry = self._table[key % self._slots]
+        if entry >> 8 == key:
+            return entry & 0xFF
+        return 0
+
+    def put(self, key: int, value: int) -> None:
+        """
+        Store a value (1..255) for key.
+        """
+        self._table[key % self._slots] = key << 8 | value
+
+    def flush(self) -> None:
+        """
+        Write changed pages back to the file.
+        """
+        self._mmap.flush()
+
+    def close(self) -> None:
+        """
+        Flush and close the cache file.
+        """
+        if self._table is not None:
+            self._table.release()
+            self._table = None
+            self._mmap.flush()
+            self._mmap.close()
+            self._file.close()
+
+
+class Solver:
+    """
+    Exact Connect Four solver.
+
+    Attributes:
+        _cache (PositionCache): Persistent cache of upper bounds
+        _nodes (int): Number of searched positions since the last solve
+        _deadline (float | None): time.monotonic() value at which a solve is aborted
+    """
+    def __init__(self, cache: PositionCache = None):
+        """
+        Args:
+            cache (PositionCache): Cache to use; opens the default cache file if None
+        """
+        self._cache = cache if cache is not None else PositionCache()
+        self._nodes = 0
+        self._deadline = None
+
+    @property
+    def nodes(self) -> int:
+        """
+        Number of positions searched by the last call of solve() or best_move().
+        """
+        return self._nodes
+
+    def negamax(self, position: int, mask: int, moves: int, alpha: int, beta: int) -> int:
+        """
+        Negamax with alpha-beta pruning.
+
+        The side to move must not be able to win with its next token.
+
+        Args:
+            position (int): Bitboard of the side to move
+            mask (int): Bitboard of all occupied cells
+            moves (int): Number of tokens on the board
+            alpha (int): Lower bound of the search window
+            beta (int): Upper bound of the search window
+
+        Returns:
+            int: The exact score if it is inside (alpha, beta), otherwise a bound
+        """
+        self._nodes += 1
+        if self._deadline is not None and self._nodes & 0x3FF == 0 and time.monotonic() > self._deadline:
+            raise SolverTimeout()
+
+        # moves that don't hand the opponent an immediate win
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        opponent_win = winning_cells(position ^ mask, mask)
+        forced = possible & opponent_win
+        if forced:
+            if forced & (forced - 1):
+                return -((SIZE - moves) // 2)  # two threats, cannot block both
+            possible = forced
+        possible &= ~(opponent_win >> 1)
+        if not possible:
+            return -((SIZE - moves) // 2)
+
+        if moves >= SIZE - 2:
+            return 0
+
+        # the opponent cannot win with its next token
+        lower = -((SIZE - 2 - moves) // 2)
+        if alpha < lower:
+            alpha = lower
+            if alpha >= beta:
+                return alpha
+
+        # we cannot win with our next token
+        upper = (SIZE - 1 - moves) // 2
+        key = position + mask
+        value = self._cache.get(key)
+        if value:
+            upper = value + MIN_SCORE - 1
+        if beta > upper:
+            beta = upper
+            if alpha >= beta:
+                return beta
+
+        # most promising moves first: those creating the most own threats
+        candidates = []
+        for col in COLUMN_ORDER:
+            move = possible & column_mask(col)
+            if move:
+                threats = winning_cells(position | move, mask).bit_count()
+                candidates.append((-threats, len(candidates), move))
+        candidates.sort()
+
+        for _, _, move in candidates:
+            score = -self.negamax(position ^ mask, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        self._cache.put(key, alpha - MIN_SCORE + 1)
+        return alpha
+
+    def _solve(self, position: int, mask: int, moves: int) -> int:
+        """
+        Exact score of a position through null-window searches.
+        """
+        possible = (mask + BOTTOM_MASK) & BOARD_MASK
+        if winning_cells(position, mask) & possible:
+            return (SIZE + 1 - moves) // 2
+
+        low = -((SIZE - moves) // 2)
+        high = (SIZE + 1 - moves) // 2
+        while low < high:
+            # probe closer to 0 first: most positions are close to a draw
+            middle = low + (high - low) // 2
+            if middle <= 0 and -(-low // 2) < middle:
+                middle = -(-low // 2)
+            elif middle >= 0 and high // 2 > middle:
+                middle = high // 2
+            result = self.negamax(position, mask, moves, middle, middle + 1)
+            if result <= middle:
+                high = result
+            else:
+                low = result
+        return low
+
+    def _from_board(self, board: list, player_token: GameToken) -> tuple:
+        """
+        Returns (position, mask, moves) with player_token as side to move.
+        """
+        red, yellow, _ = board_to_bitboards(board)
+        position = red if player_token == GameToken.RED else yellow
+        mask = red | yellow
+        return position, mask, mask.bit_count()
+
+    def solve(self, board: list, player_token: GameToken, time_budget_ms: int = None) -> int:
+        """
+        Compute the exact score of a board with player_token to move.
+
+        Args:
+            board (List[List[GameToken]]): The game board as a 2D list
+            player_token (GameToken): The player to move
+            time_budget_ms (int): Time limit in milliseconds, None for no limit
+
+        Returns:
+            int: The score of the position (see module description)
+
+        Raises:
+            SolverTimeout: If the time budget ran out
+        """
+        self._nodes = 0
+        self._deadline = None if time_budget_ms is None else time.monotonic() + time_budget_ms / 1000
+        return self._solve(*self._from_board(board, player_token))
+
+    def best_move(self, board: list, player_token: GameToken, time_budget_ms: int = None) -> int:
+        """
+        Compute the best column for player_token.
+
+        Args:
+            board (List[List[GameToken]]): The game board as a 2D list
+            player_token (GameToken): The player to move
+            time_budget_ms (int): Time limit in milliseconds, None for no limit
+
+        Returns:
+            int: The column with the highest score, -1 if the board is full
+
+        Raises:
+            SolverTimeout: If the time budget ran out
+        """
+        self._nodes = 0
+        self._deadline = None if time_budget_ms is None else time.monotonic() + time_budget_ms / 1000
+        position, mask, moves = self._from_board(board, player_token)
+
+        best_col = -1
+        best_score = -SIZE
+        for col in COLUMN_ORDER:
+            if mask & top_mask(col):
+                continue
+            move = (mask + bottom_mask(col)) & column_mask(col)
+            if winning_cells(position, mask) & move:
+                return col
+            score = -self._solve(position ^ mask, mask | move, moves + 1)
+            if score > best_score:
+                best_score = score
+                best_col = col
+        return best_col
+
+    def close(self) -> None:
+        """
+        Close the position cache.
+        """
+        self._cache.close()
+
+
+if __name__ == '__main__':
+    board = [[GameToken.EMPTY for _ in range(7)] for _ in range(6)]
+    token = GameToken.RED
+    for column in [1, 0, 3, 2, 1, 0, 4, 6, 5, 5, 0, 4, 3, 3, 5, 5, 4, 5]:
+        for row in range(5, -1, -1):
+            if board[row][column] == GameToken.EMPTY:
+                board[row][column] = token
+                break
+        token = GameToken.YELLOW if token == GameToken.RED else GameToken.RED
+    solver = Solver()
+    # the second run is answered mostly from the cache file
+    for run in range(2):
+        start = time.monotonic()
+        score = solver.solve(board, token)
+        print(f"Score: {score}, Nodes: {solver.nodes}, Time: {time.monotonic() - start:.2f}s")
+    print(f"Best move: {solver.best_move(board, token)}")
+    solver.close()
@@ -0,0 +1,160 @@
+from enum import Enum
+from game_token import GameToken
+import random
+
+"""
+Transposition Table for the Connect Four bot
+
+Positions are identified by a Zobrist hash: every (row, column, token) triple
+gets a random 64-bit key and the hash of a board is the XOR of the keys of all
+occupied cells. Dropping or removing a token therefore updates the hash with a
+single XOR, which lets the search keep it up to date incrementally.
+
+Classes:
+    Bound: Type of the value stored in a table entry
+    TranspositionTable: Bounded hash table of previously searched positions
+"""
+
+
+class Bound(Enum):
+    """
+    Enum class describing how a stored search value relates to the true value.
+
+    Attributes:
+        EXACT (int): The stored value is the exact minimax value (value: 0)
+        LOWER (int): The true value is at least the stored value (value: 1)
+        UPPER (int): The true value is at most the stored value (value: 2)
+    """
+    EXACT = 0   # value inside the alpha-beta window
+    LOWER = 1   # search failed high (beta cutoff)
+    UPPER = 2   # search failed low (no move raised alpha)
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table indexed by Zobrist hash.
+
+    Each slot holds a single entry ``(key, depth, value, bound, best_move, generation)``.
+    Replacement policy: an existing entry is overwritten if it belongs to an
+    older search (generation), or if the new entry was searched at least as
+    deep. Entries from the current search that are deeper are kept.
+
+    Attributes:
+        _size (int): Number of slots in the table
+        _entries (list): The slots, None if empty
+        _generation (int): Counter of the current search, see new_search()
+        _cell_keys (dict): Zobrist key per (row, column, token)
+        _side_key (int): Key XORed in when the minimizing side is to move
+        _perspective_keys (dict): Key per evaluating player token
+    """
+    def __init__(self, size: int = 1 << 20, rows: int = 6, cols: int = 7, seed: int = 4):
+        """
+        Initialize an empty table and generate the Zobrist keys.
+
+        Args:
+            size (int): Maximum number of entries held by the table
+            rows (int): Number of rows of the board
+            cols (int): Number of columns of the board
+            seed (int): Seed for the Zobrist keys, so hashes are reproducible
+        """
+        if size <= 0:
+            raise ValueError("Table size must be positive")
+        self._size = size
+        self._entries = [None] * size
+        self._generation = 0
+
+        rng = random.Random(seed)
+        self._cell_keys = {}
+        for row in range(rows):
+            for col in range(cols):
+                for token in (GameToken.RED, GameToken.YELLOW):
+                    self._cell_keys[(row, col, token)] = rng.getrandbits(64)
+        self._side_key = rng.getrandbits(64)
+        self._perspective_keys = {GameToken.RED: rng.getrandbits(64),
+                                  GameToken.YELLOW: rng.getrandbits(64)}
+
+    def hash_board(self, board: list, player_token: GameToken) -> int:
+        """
+        Compute the Zobrist hash of a board from scratch.
+
+        Args:
+            board (List[List[GameToken]]): The game board as a 2D list
+            player_token (GameToken): The player the search evaluates for
+
+        Returns:
+            int: The position hash
+        """
+        key = self._perspective_keys[player_token]
+        for row_index, row in enumerate(board):
+            for col_index, token in enumerate(row):
+                if token != GameToken.EMPTY:
+                    key ^= self._cell_keys[(row_index, col_index, token)]
+        return key
+
+    def cell_key(self, row: int, col: int, token: GameToken) -> int:
+        """
+        Returns the key to XOR into the hash when a token is dropped or removed.
+        """
+        return self._cell_keys[(row, col, token)]
+
+    def side_key(self, maximizing_player: bool) -> int:
+        """
+        Returns the key to XOR into the hash for the side to move.
+        """
+        return 0 if maximizing_player else self._side_key
+
+    def new_search(self) -> None:
+        """
+        Mark the start of a new search; older entries become replaceable.
+        """
+        self._generation += 1
+
+    def clear(self) -> None:
+        """
+        Remove all entries, e.g. when a new game starts.
+        """
+        self._entries = [None] * self._size
+        self._generation = 0
+
+    def lookup(self, key: int):
+        """
+        Look up a position.
+
+        Args:
+            key (int): The position hash
+
+        Returns:
+            tuple | None: (depth, value, bound, best_move) or None if not stored
+        """
+        entry = self._entries[key % self._size]
+        if entry is None or entry[0] != key:
+            return None
+        return entry[1:5]
+
+    def store(self, key: int, depth: int, value: float, bound: Bound, best_move) -> None:
+        """
+        Store a search result, following the replacement policy of the table.
+
+        Args:
+            key (int): The position hash
+            depth (int): Remaining search depth the value was computed with
+            value (float): The search value
+            bound (Bound): How the value relates to the true value
+            best_move (int | None): The best column found, used for move ordering
+        """
+        index = key % self._size
+        entry = self._entries[index]
+        if entry is None or entry[5] != self._generation or depth >= entry[1]:
+            self._entries[index] = (key, depth, value, bound, best_move, self._generation)
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._entries if entry is not None)
+
+
+if __name__ == '__main__':
+    table = TranspositionTable(size=1024)
+    board = [[GameToken.EMPTY for _ in range(7)] for _ in range(6)]
+    board[5][3] = GameToken.RED
+    key = table.hash_board(board, GameToken.RED)
+    table.store(key, 4, 12, Bound.EXACT, 3)
+    print(f"Key: {key:016x}, Entry: {table.lookup(key)}, Entries: {len(table)}")